@@ -3,7 +3,72 @@ classifiers.py
 Rules-based classifiers for Content Type (URL/Page level) and Entity Type (Domain level).
 """
 import os
+import re
+from collections import namedtuple
+
 import yaml
+from bs4 import CData, NavigableString
+
+# libyaml-backed loader when available; same semantics as yaml.safe_load.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed override files keyed by path -> (mtime_ns, size, overrides).
+# Entries are re-parsed whenever the file's mtime or size changes.
+_OVERRIDES_CACHE = {}
+
+# Keyword signals are only checked against the start of the page text.
+TEXT_HEAD_CHARS = 5000
+
+SERVICE_SIGNALS = ['book appointment', 'schedule consultation',
+                   'our services', 'pricing', 'contact us']
+NONPROFIT_KEYWORDS = ["registered charity",
+                      "non-profit organization", "donate", "volunteer"]
+ASSOCIATION_KEYWORDS = [
+    "professional association", "regulatory body", "college of",
+    "registered clinical counsellors association", "licensing body",
+]
+LEGAL_KEYWORDS = ["lawyer", "law firm", "family law", "legal advice", "custody", "estate planning"]
+COUNSELLING_KEYWORDS = ["counselling", "counseling", "therapy", "psychotherapy",
+                        "book appointment", "registered clinical counsellor"]
+
+
+def _keyword_pattern(keywords):
+    """Compile keywords into one alternation so a text slice is scanned once."""
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+
+_SERVICE_RE = _keyword_pattern(SERVICE_SIGNALS)
+_NONPROFIT_RE = _keyword_pattern(NONPROFIT_KEYWORDS)
+_ASSOCIATION_RE = _keyword_pattern(ASSOCIATION_KEYWORDS)
+_LEGAL_RE = _keyword_pattern(LEGAL_KEYWORDS)
+_COUNSELLING_RE = _keyword_pattern(COUNSELLING_KEYWORDS)
+
+# Known directory hostnames, matched as substrings so subdomains and regional
+# variants (e.g. psychologytoday.com.au) are included.
+DIRECTORY_DOMAINS = (
+    "yelp.ca",
+    "yellowpages.ca",
+    "psychologytoday.com",
+    "healthgrades.com",
+    "counsellingbc.com",
+    "therapytribe.com",
+    "theravive.com",
+    "firstsession.com",
+    "luminohealth.sunlife.ca",
+    "ratemds.com",
+)
+
+_DIRECTORY_URL_RE = re.compile(r"/directory/|/list/|/find-|/best-|-near-me")
+
+# Article metadata lives in <head>, so only the start of the raw HTML is scanned.
+ARTICLE_META_SCAN_BYTES = 8192
+_ARTICLE_META_RE = re.compile(
+    rb'<meta\s[^>]*property=["\']article:published_time["\']', re.I)
+
+# Title checks. Directory titles are tested before guide titles, so they stay
+# separate patterns. "best " and " in " may appear in either order.
+_TITLE_DIRECTORY_RE = re.compile(r"top 10|^(?=.*best )(?=.* in )", re.S)
+_TITLE_GUIDE_RE = re.compile(r"how to|guide|what is")
 
 ENTITY_TYPES = [
     "counselling",
@@ -28,57 +93,131 @@ ENTITY_TYPE_DESCRIPTIONS = {
 }
 
 
+def _load_overrides(override_file):
+    """Return the parsed override mapping, reusing a cached parse if the file is unchanged."""
+    try:
+        st = os.stat(override_file)
+    except OSError:
+        return {}
+
+    key = os.path.abspath(override_file)
+    cached = _OVERRIDES_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    try:
+        with open(override_file, 'r') as f:
+            overrides = yaml.load(f, Loader=_YAML_LOADER) or {}
+    except Exception as e:
+        print(f"Warning: Could not load domain overrides: {e}")
+        return {}
+
+    _OVERRIDES_CACHE[key] = (st.st_mtime_ns, st.st_size, overrides)
+    return overrides
+
+
+_PageFeatures = namedtuple(
+    "_PageFeatures", ["title", "has_article_meta", "text_head", "word_count"])
+
+# Same default string types BeautifulSoup.get_text() considers (no comments etc.).
+_MAIN_STRING_TYPES = {NavigableString, CData}
+
+
+def _extract_page_features(soup):
+    """Collect everything ContentClassifier needs from *soup* in one tree walk.
+
+    Equivalent to reading soup.title, soup.find("meta", property=...) and
+    soup.get_text(" ", strip=True), but the text is only kept up to
+    TEXT_HEAD_CHARS while words are counted across the whole page.
+    """
+    string_types = getattr(soup, "interesting_string_types", None) or _MAIN_STRING_TYPES
+    title = None
+    has_article_meta = False
+    head_parts = []
+    head_len = 0
+    word_count = 0
+
+    for node in soup.descendants:
+        if isinstance(node, NavigableString):
+            if type(node) not in string_types:
+                continue
+            stripped = node.strip()
+            if not stripped:
+                continue
+            # Per-node split() sums to len(get_text(" ", strip=True).split()):
+            # newlines, tabs and repeated spaces separate words exactly as before.
+            word_count += len(stripped.split())
+            if head_len < TEXT_HEAD_CHARS:
+                head_parts.append(stripped)
+                head_len += len(stripped) + 1
+        elif node.name == "title":
+            if title is None:
+                title = node.string.lower() if node.string else ""
+        elif node.name == "meta" and node.get("property") == "article:published_time":
+            has_article_meta = True
+
+    text_head = " ".join(head_parts)[:TEXT_HEAD_CHARS].lower()
+    return _PageFeatures(title or "", has_article_meta, text_head, word_count)
+
+
 class ContentClassifier:
-    def classify(self, url, soup, headers):
+    def classify(self, url, soup, headers, raw_html=None):
         """
         Classifies content type based on URL, HTML content (BeautifulSoup object), and Headers.
+        raw_html (optional bytes) lets article pages be detected without walking the parsed tree.
         Returns: (content_type, confidence, evidence_list)
         """
         evidence = []
+        url_lower = url.lower()
 
         # 1. PDF Check (High Confidence)
-        if url.lower().endswith('.pdf') or (headers and 'application/pdf' in headers.get('Content-Type', '')):
+        if url_lower.endswith('.pdf') or (headers and 'application/pdf' in headers.get('Content-Type', '')):
             return 'pdf', 1.0, ["url_extension_or_header"]
 
         # 2. Directory / Listing (High Confidence)
         # URL patterns
-        if any(x in url.lower() for x in ['/directory/', '/list/', '/find-', '/best-', '-near-me']):
+        if _DIRECTORY_URL_RE.search(url_lower):
             evidence.append("url_pattern_directory")
             return 'directory', 0.8, evidence
 
         if not soup:
             return 'unknown', 0.0, ["no_content"]
 
-        text = soup.get_text(" ", strip=True).lower()
-        title = soup.title.string.lower() if soup.title and soup.title.string else ""
+        if raw_html and _ARTICLE_META_RE.search(raw_html[:ARTICLE_META_SCAN_BYTES]):
+            # Decided by the title or the article meta; no need for page text.
+            page = None
+            title = soup.title.string.lower() if soup.title and soup.title.string else ""
+            has_article_meta = True
+        else:
+            page = _extract_page_features(soup)
+            title = page.title
+            has_article_meta = page.has_article_meta
 
         # Content patterns for directories
-        if "top 10" in title or ("best " in title and " in " in title):
+        if _TITLE_DIRECTORY_RE.search(title):
             evidence.append("title_list_pattern")
             return 'directory', 0.7, evidence
 
         # 3. News (High Confidence)
-        if soup.find("meta", property="article:published_time"):
+        if has_article_meta:
             evidence.append("meta_article_published")
             return 'news', 0.8, evidence
 
         # 4. Service Page (Medium Confidence)
-        service_signals = ['book appointment', 'schedule consultation',
-                           'our services', 'pricing', 'contact us']
-        # Check top of page
-        service_matches = [s for s in service_signals if s in text[:5000]]
+        # Only the top of the page is inspected for keywords.
+        found = set(_SERVICE_RE.findall(page.text_head))
+        service_matches = [s for s in SERVICE_SIGNALS if s in found]
         if len(service_matches) >= 2:
             evidence.append(f"service_keywords:{','.join(service_matches)}")
             return 'service', 0.7, evidence
 
         # 5. Guide / Resource (Medium Confidence)
-        if "how to" in title or "guide" in title or "what is" in title:
+        if _TITLE_GUIDE_RE.search(title):
             evidence.append("title_informational")
             return 'guide', 0.8, evidence
 
         # Heuristic: Long content often indicates a guide
-        word_count = len(text.split())
-        if word_count > 1500:
+        if page.word_count > 1500:
             evidence.append("high_word_count")
             return 'guide', 0.6, evidence
 
@@ -88,13 +227,7 @@ class ContentClassifier:
 
 class EntityClassifier:
     def __init__(self, override_file="domain_overrides.yml"):
-        self.overrides = {}
-        if os.path.exists(override_file):
-            try:
-                with open(override_file, 'r') as f:
-                    self.overrides = yaml.safe_load(f) or {}
-            except Exception as e:
-                print(f"Warning: Could not load domain overrides: {e}")
+        self.overrides = _load_overrides(override_file)
 
     def classify(self, domain, soup):
         """
@@ -103,7 +236,6 @@ class EntityClassifier:
         """
         evidence = []
         domain_l = (domain or "").lower()
-        text = soup.get_text(" ", strip=True).lower() if soup else ""
 
         # 0. Manual Override
         if domain in self.overrides:
@@ -125,19 +257,7 @@ class EntityClassifier:
             evidence.append("tld_org")  # Weak signal, need more
 
         # 2. Directory Signals (Domain level)
-        directory_domains = [
-            "yelp.ca",
-            "yellowpages.ca",
-            "psychologytoday.com",
-            "healthgrades.com",
-            "counsellingbc.com",
-            "therapytribe.com",
-            "theravive.com",
-            "firstsession.com",
-            "luminohealth.sunlife.ca",
-            "ratemds.com",
-        ]
-        if any(d in domain_l for d in directory_domains):
+        if any(d in domain_l for d in DIRECTORY_DOMAINS):
             return 'directory', 0.9, ["known_directory_domain"]
 
         professional_association_domains = [
@@ -173,24 +293,20 @@ class EntityClassifier:
                 return 'nonprofit', 0.6, evidence
             return 'N/A', 0.0, ["fallback_no_content"]
 
+        text_head = soup.get_text(" ", strip=True)[:TEXT_HEAD_CHARS].lower()
+
         # 2. Nonprofit Signals
-        nonprofit_keywords = ["registered charity",
-                              "non-profit organization", "donate", "volunteer"]
-        if any(k in text[:5000] for k in nonprofit_keywords):
+        if _NONPROFIT_RE.search(text_head):
             evidence.append("nonprofit_keywords")
             return 'nonprofit', 0.8, evidence
 
-        association_keywords = [
-            "professional association", "regulatory body", "college of",
-            "registered clinical counsellors association", "licensing body",
-        ]
-        if any(k in text[:5000] for k in association_keywords):
+        if _ASSOCIATION_RE.search(text_head):
             return 'professional_association', 0.8, ["association_keywords"]
 
-        if any(k in text[:5000] for k in ["lawyer", "law firm", "family law", "legal advice", "custody", "estate planning"]):
+        if _LEGAL_RE.search(text_head):
             return 'legal', 0.75, ["legal_keywords"]
 
-        if any(k in text[:5000] for k in ["counselling", "counseling", "therapy", "psychotherapy", "book appointment", "registered clinical counsellor"]):
+        if _COUNSELLING_RE.search(text_head):
             return 'counselling', 0.7, ["counselling_keywords"]
 
         return 'N/A', 0.0, ["fallback_unknown"]
@@ -2,13 +2,55 @@
 export_history.py
 Exports the SQLite database tables to CSV files for external analysis.
 """
+import csv
 import sqlite3
-import pandas as pd
 import os
-import logging
+from concurrent.futures import ThreadPoolExecutor
 
 DB_PATH = "serp_data.db"
 EXPORT_DIR = "exports"
+CHUNK_SIZE = 10_000
+
+# Connection-local read tuning; journal mode is left to the writers.
+READ_PRAGMAS = ("temp_store=MEMORY", "mmap_size=268435456", "cache_size=-131072")
+
+
+def _write_table_csv(conn, table, csv_path):
+    """Stream a table straight from the cursor to CSV; returns the row count.
+
+    No file is written for an empty table.
+    """
+    cur = conn.execute(f"SELECT * FROM {table}")
+    rows = cur.fetchmany(CHUNK_SIZE)
+    if not rows:
+        return 0
+
+    row_count = 0
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow([col[0] for col in cur.description])
+        while rows:
+            writer.writerows(rows)
+            row_count += len(rows)
+            rows = cur.fetchmany(CHUNK_SIZE)
+    return row_count
+
+
+def _export_one(table, db_path, export_dir):
+    """Export one table on its own connection; returns the status line to print."""
+    conn = sqlite3.connect(db_path)
+    for pragma in READ_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    try:
+        csv_path = os.path.join(export_dir, f"{table}.csv")
+        row_count = _write_table_csv(conn, table, csv_path)
+        if row_count:
+            return f"  - {table}: {row_count} rows -> {csv_path}"
+        return f"  - {table}: [Empty]"
+    except Exception as e:
+        return f"  - {table}: Error exporting ({e})"
+    finally:
+        conn.close()
 
 
 def export_tables():
@@ -17,7 +59,6 @@ def export_tables():
         return
 
     os.makedirs(EXPORT_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
 
     tables = [
         "runs",
@@ -29,19 +70,13 @@ def export_tables():
 
     print(f"Exporting tables to '{EXPORT_DIR}/'...")
 
-    for table in tables:
-        try:
-            df = pd.read_sql(f"SELECT * FROM {table}", conn)
-            if not df.empty:
-                csv_path = os.path.join(EXPORT_DIR, f"{table}.csv")
-                df.to_csv(csv_path, index=False)
-                print(f"  - {table}: {len(df)} rows -> {csv_path}")
-            else:
-                print(f"  - {table}: [Empty]")
-        except Exception as e:
-            print(f"  - {table}: Error exporting ({e})")
-
-    conn.close()
+    # SQLite allows concurrent readers, so each table is exported on its own
+    # thread and connection. Results are printed in table order.
+    with ThreadPoolExecutor(max_workers=min(5, len(tables))) as ex:
+        futures = [ex.submit(_export_one, table, DB_PATH, EXPORT_DIR) for table in tables]
+        for future in futures:
+            print(future.result())
+
     print("Done.")
 
 
@@ -16,9 +16,12 @@ import re
 import sys
 from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urlparse
 import yaml
 
+from json_utils import loads_json
+
 try:
     import anthropic
     ANTHROPIC_AVAILABLE = True
@@ -154,8 +157,8 @@ def load_client_context_from_config(config):
 def load_data(json_path):
     try:
         progress(f"[2/7] Loading analysis JSON from {json_path}...")
-        with open(json_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(json_path, "rb") as f:
+            return loads_json(f.read())
     except Exception as e:
         print(f"Error loading JSON: {e}")
         sys.exit(1)
@@ -277,11 +280,21 @@ def _parse_trigger_words(trigger_text):
     return [part.strip().lower() for part in str(trigger_text or "").split(",") if part.strip()]
 
 
+@lru_cache(maxsize=None)
+def _term_pattern(term):
+    return re.compile(rf"\b{re.escape(term)}\b", flags=re.IGNORECASE)
+
+
+def _join_texts(texts):
+    # Newline keeps word boundaries between texts, so counts match per-text scans.
+    return "\n".join(str(text or "") for text in texts)
+
+
 def _count_terms_in_texts(terms, texts):
     counts = {}
     for term in terms:
         total = 0
-        pattern = re.compile(rf"\b{re.escape(term)}\b", flags=re.IGNORECASE)
+        pattern = _term_pattern(term)
         for text in texts:
             total += len(pattern.findall(str(text or "")))
         if total:
@@ -848,20 +861,21 @@ def extract_analysis_data_from_json(data, client_domain, client_name_patterns=No
 
     tool_recommendations_verified = []
     all_trigger_words = set()
-    organic_titles = [row.get("Title") for row in organic]
-    organic_snippets = [row.get("Snippet") for row in organic]
-    aio_texts = [row.get("AI_Overview") for row in overview]
-    paa_texts = [row.get("Question") for row in paa_rows]
+    # Each evidence source is joined once and scanned as a single text per trigger.
+    evidence_texts = {
+        "in_paa_questions": [_join_texts(row.get("Question") for row in paa_rows)],
+        "in_organic_titles": [_join_texts(row.get("Title") for row in organic)],
+        "in_organic_snippets": [_join_texts(row.get("Snippet") for row in organic)],
+        "in_aio_text": [_join_texts(row.get("AI_Overview") for row in overview)],
+        "in_autocomplete": [_join_texts(autocomplete_texts)],
+        "in_related_searches": [_join_texts(related_texts)],
+    }
     for row in recs:
         triggers = _parse_trigger_words(row.get("Triggers"))
         all_trigger_words.update(triggers)
         found = {
-            "in_paa_questions": _count_terms_in_texts(triggers, paa_texts),
-            "in_organic_titles": _count_terms_in_texts(triggers, organic_titles),
-            "in_organic_snippets": _count_terms_in_texts(triggers, organic_snippets),
-            "in_aio_text": _count_terms_in_texts(triggers, aio_texts),
-            "in_autocomplete": _count_terms_in_texts(triggers, autocomplete_texts),
-            "in_related_searches": _count_terms_in_texts(triggers, related_texts),
+            name: _count_terms_in_texts(triggers, texts)
+            for name, texts in evidence_texts.items()
         }
         source_totals = {
             name: sum(bucket.values())
@@ -891,7 +905,7 @@ def extract_analysis_data_from_json(data, client_domain, client_name_patterns=No
                 row["suggestion"]
                 for rows in autocomplete_by_kw.values()
                 for row in rows
-                if re.search(rf"\b{re.escape(trigger)}\b", str(row["suggestion"]), flags=re.IGNORECASE)
+                if _term_pattern(trigger).search(str(row["suggestion"]))
             })
             for trigger in sorted(all_trigger_words)
         },
@@ -2093,24 +2107,25 @@ def generate_brief(data, rec_index=0):
         rec_index = 0
 
     rec = recs[rec_index]
+    angle = rec.get("Content_Angle")
+    pattern = rec.get("Pattern_Name")
+    status_quo = rec.get("Status_Quo_Message")
+    reframe = rec.get("Bowen_Bridge_Reframe")
+    triggers_str = rec.get("Detected_Triggers")
     paa = data.get("paa_questions", [])
     organic = data.get("organic_results", [])
-    relevant_paa_records = get_relevant_paa(
-        paa, rec.get("Pattern_Name"), max_results=5
-    )
+    relevant_paa_records = get_relevant_paa(paa, pattern, max_results=5)
     relevant_paa = [q.get("Question") for q in relevant_paa_records]
-    top_competitors = get_relevant_competitors(
-        organic, rec.get("Pattern_Name"), max_results=3
-    )
+    top_competitors = get_relevant_competitors(organic, pattern, max_results=3)
     lines = []
-    lines.append(f"# Content Brief: {rec.get('Content_Angle')}")
-    lines.append(f"**Strategy:** {rec.get('Pattern_Name')}")
+    lines.append(f"# Content Brief: {angle}")
+    lines.append(f"**Strategy:** {pattern}")
     lines.append(f"**Date:** {datetime.now().strftime('%Y-%m-%d')}\n")
     lines.append("## 1. The Core Conflict (The Hook)")
-    lines.append(f"**The Status Quo (Bad Advice):** \"{rec.get('Status_Quo_Message')}\"")
-    lines.append(f"**The Bowen Reframe (The Solution):** \"{rec.get('Bowen_Bridge_Reframe')}\"")
+    lines.append(f"**The Status Quo (Bad Advice):** \"{status_quo}\"")
+    lines.append(f"**The Bowen Reframe (The Solution):** \"{reframe}\"")
     lines.append(
-        f"**Target Audience Pain Point:** They are searching for *{rec.get('Detected_Triggers')}* and feeling anxious/stuck."
+        f"**Target Audience Pain Point:** They are searching for *{triggers_str}* and feeling anxious/stuck."
     )
     lines.append("\n## 2. User Intent & Anxiety (PAA)")
     lines.append("Address these specific questions to validate the reader's experience:")
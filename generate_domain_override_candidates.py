@@ -175,6 +175,32 @@ def render_markdown(candidates, json_path, overrides_path, min_rows, min_keyword
     return "\n".join(lines) + "\n"
 
 
+def run(json_path="market_analysis_v2.json", overrides_path="domain_overrides.yml",
+        out_path="domain_override_candidates.md", min_rows=4, min_keywords=2):
+    print(f"[1/4] Loading analysis JSON from {json_path}...", flush=True)
+    data = load_json(json_path)
+    print(f"[2/4] Loading existing overrides from {overrides_path}...", flush=True)
+    overrides = load_overrides(overrides_path)
+    print("[3/4] Building candidate list...", flush=True)
+    classifier = EntityClassifier(override_file=overrides_path)
+    candidates = collect_candidates(
+        data,
+        overrides,
+        classifier,
+        min_rows=min_rows,
+        min_keywords=min_keywords,
+    )
+    print(f"[4/4] Writing review report to {out_path}...", flush=True)
+    report = render_markdown(candidates, json_path, overrides_path, min_rows, min_keywords)
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(report)
+
+    print("")
+    print(f"Domain override candidate report generated: {out_path}")
+    print(f"Candidates found: {len(candidates)}")
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a review list of domains worth considering for domain_overrides.yml."
@@ -186,27 +212,13 @@ def main():
     parser.add_argument("--min-keywords", type=int, default=2)
     args = parser.parse_args()
 
-    print(f"[1/4] Loading analysis JSON from {args.json}...", flush=True)
-    data = load_json(args.json)
-    print(f"[2/4] Loading existing overrides from {args.overrides}...", flush=True)
-    overrides = load_overrides(args.overrides)
-    print("[3/4] Building candidate list...", flush=True)
-    classifier = EntityClassifier(override_file=args.overrides)
-    candidates = collect_candidates(
-        data,
-        overrides,
-        classifier,
+    run(
+        json_path=args.json,
+        overrides_path=args.overrides,
+        out_path=args.out,
         min_rows=args.min_rows,
         min_keywords=args.min_keywords,
     )
-    print(f"[4/4] Writing review report to {args.out}...", flush=True)
-    report = render_markdown(candidates, args.json, args.overrides, args.min_rows, args.min_keywords)
-    with open(args.out, "w", encoding="utf-8") as f:
-        f.write(report)
-
-    print("")
-    print(f"Domain override candidate report generated: {args.out}")
-    print(f"Candidates found: {len(candidates)}")
 
 
 if __name__ == "__main__":
@@ -21,10 +21,11 @@ Usage
     python generate_insight_report.py --json market_analysis_v2.json --out report.md
 """
 import argparse
-import json
 import sys
 from datetime import datetime
 
+from json_utils import loads_json
+
 try:
     import metrics
     METRICS_AVAILABLE = True
@@ -34,8 +35,8 @@ except ImportError:
 
 def load_data(json_path):
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(json_path, 'rb') as f:
+            return loads_json(f.read())
     except Exception as e:
         print(f"Error loading JSON: {e}")
         sys.exit(1)
@@ -80,6 +81,8 @@ def generate_report(data):
     if paa:
         seen_questions = set()
         deduped_paa = []
+        # Group by category if available (bucketed during the dedup pass)
+        buckets = {"Commercial": [], "Distress": [], "Reactivity": []}
         for item in paa:
             question = str(item.get("Question", "")).strip()
             key = question.lower()
@@ -87,14 +90,13 @@ def generate_report(data):
                 continue
             seen_questions.add(key)
             deduped_paa.append(item)
+            bucket = buckets.get(item.get("Category"))
+            if bucket is not None:
+                bucket.append(item["Question"])
 
-        # Group by category if available
-        commercial = [q["Question"]
-                      for q in deduped_paa if q.get("Category") == "Commercial"]
-        distress = [q["Question"]
-                    for q in deduped_paa if q.get("Category") == "Distress"]
-        reactivity = [q["Question"]
-                      for q in deduped_paa if q.get("Category") == "Reactivity"]
+        commercial = buckets["Commercial"]
+        distress = buckets["Distress"]
+        reactivity = buckets["Reactivity"]
 
         if distress:
             report.append("\n### 🚨 High Distress Signals")
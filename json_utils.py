@@ -0,0 +1,27 @@
+"""
+json_utils.py
+JSON parsing shared by the audit and the report generators: orjson when it is
+installed, the standard library otherwise.
+"""
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def loads_json(raw):
+    """Parse JSON bytes with orjson when available.
+
+    Falls back to the stdlib parser for NaN/Infinity literals, which
+    json.dump writes but orjson rejects.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
@@ -2,14 +2,141 @@
 metrics.py
 Calculates SEO metrics (Volatility, Dominance) from the SQLite history.
 """
+import atexit
+import functools
 import sqlite3
-import pandas as pd
+import threading
+from collections import Counter
 import os
 import logging
 
 DB_PATH = "serp_data.db"
 
+# Applied once per connection: memory-mapped reads for the serp_results scans
+# and a 128 MB page cache. These are connection-local; the journal mode is
+# persistent in the database file, so it is left to the writers (as in
+# export_history) and serp_data.db stays readable by tools that expect the
+# default rollback journal.
+CONNECTION_PRAGMAS = (
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-131072",
+)
+
+# Connection shared by all metric queries; reopened if DB_PATH changes.
+# _CONN_LOCK serializes its use, since callers may run on different threads.
+_CONN = None
+_CONN_PATH = None
+_CONN_LOCK = threading.RLock()
+
+
+def _get_conn():
+    """Return the shared connection to DB_PATH, opening it on first use."""
+    global _CONN, _CONN_PATH
+    with _CONN_LOCK:
+        if _CONN is None or _CONN_PATH != DB_PATH:
+            close_conn()
+            _CONN = sqlite3.connect(DB_PATH, check_same_thread=False)
+            for pragma in CONNECTION_PRAGMAS:
+                _CONN.execute(f"PRAGMA {pragma}")
+            _CONN_PATH = DB_PATH
+        return _CONN
+
+
+def close_conn():
+    """Close the shared connection, if open. Also run at interpreter exit."""
+    global _CONN, _CONN_PATH
+    with _CONN_LOCK:
+        if _CONN is not None:
+            _CONN.close()
+        _CONN = _CONN_PATH = None
+
+
+atexit.register(close_conn)
+
+
+def _holds_conn_lock(func):
+    """Run *func* with the shared connection locked for its whole query sequence."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _CONN_LOCK:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# Organic ranks for the same keyword + url in two runs. rank_delta is positive
+# when the URL improved (rank went down numerically). curr_row_id keeps ties in
+# current-run order.
+RANK_DELTA_QUERY = """
+    SELECT
+        c.keyword_text,
+        c.url,
+        c.rank AS rank_curr,
+        p.rank AS rank_prev,
+        p.rank - c.rank AS rank_delta,
+        c.id AS curr_row_id
+    FROM serp_results c
+    JOIN serp_results p
+        ON p.keyword_text = c.keyword_text AND p.url = c.url
+    WHERE c.run_id = ? AND p.run_id = ?
+        AND c.result_type = 'organic' AND p.result_type = 'organic'
+        AND typeof(c.rank) IN ('integer', 'real')
+        AND typeof(p.rank) IN ('integer', 'real')
+"""
+
+
+def _prev_run_id(conn, current_run_id):
+    """Return the run_id immediately preceding *current_run_id* by run_date, or None."""
+    row = conn.execute(
+        """
+        SELECT run_id
+        FROM runs
+        WHERE run_date < (SELECT run_date FROM runs WHERE run_id = ?)
+        ORDER BY run_date DESC
+        LIMIT 1
+        """,
+        (current_run_id,),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _fetch_movers(conn, predicate, direction, params, limit=5):
+    """
+    Return the top rank movers matching *predicate* (a WHERE expression) as dicts,
+    sorted by rank_delta in *direction* ("ASC" or "DESC") with ties in current-run order.
+    """
+    if direction not in ("ASC", "DESC"):
+        raise ValueError(f"direction must be 'ASC' or 'DESC', got {direction!r}")
+    cur = conn.execute(
+        f"""
+        SELECT keyword_text, url, rank_curr, rank_delta
+        FROM ({RANK_DELTA_QUERY})
+        WHERE {predicate}
+        ORDER BY rank_delta {direction}, curr_row_id
+        LIMIT {int(limit)}
+        """,
+        params,
+    )
+    cols = [c[0] for c in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def _ranked_keywords(conn, run_id):
+    """Return the set of keywords with at least one numerically ranked organic result."""
+    rows = conn.execute(
+        """
+        SELECT DISTINCT keyword_text
+        FROM serp_results
+        WHERE run_id = ? AND result_type = 'organic'
+            AND typeof(rank) IN ('integer', 'real')
+            AND keyword_text IS NOT NULL
+        """,
+        (run_id,),
+    )
+    return {row[0] for row in rows}
 
+
+@_holds_conn_lock
 def get_volatility_metrics(current_run_id):
     """
     Compares the current run against the immediate previous run to calculate rank volatility.
@@ -19,59 +146,35 @@ def get_volatility_metrics(current_run_id):
         return None
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-
-        # 1. Get Run History
-        runs_df = pd.read_sql(
-            "SELECT run_id, run_date FROM runs ORDER BY run_date DESC", conn)
-        if len(runs_df) < 2:
-            conn.close()
-            return {"status": "insufficient_history", "msg": "Need at least 2 runs to calculate volatility."}
-
-        # Current is index 0 (if passed run_id matches), Previous is index 1
-        # Verify current_run_id is actually the latest or find it
-
-        # Simple approach: Get data for current_run_id and the one immediately preceding it in time
-        current_run_date_row = runs_df[runs_df['run_id'] == current_run_id]
-        if current_run_date_row.empty:
-            conn.close()
-            return None
-
-        current_date = current_run_date_row.iloc[0]['run_date']
-
-        # Find previous run
-        prev_runs = runs_df[runs_df['run_date'] < current_date]
-        if prev_runs.empty:
-            conn.close()
+        conn = _get_conn()
+
+        # 1. Find the run immediately preceding current_run_id
+        prev_run_id = _prev_run_id(conn, current_run_id)
+        if prev_run_id is None:
+            # Same checks, in the same order, as before the SQL rewrite.
+            if conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] < 2:
+                return {"status": "insufficient_history", "msg": "Need at least 2 runs to calculate volatility."}
+            if conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (current_run_id,)).fetchone() is None:
+                return None
             return {"status": "insufficient_history", "msg": "No prior run found."}
 
-        prev_run_id = prev_runs.iloc[0]['run_id']
-
-        # 2. Get Ranks for Current and Previous
-        query = """
-        SELECT 
-            keyword_text, 
-            url, 
-            rank 
-        FROM serp_results 
-        WHERE run_id = ? AND result_type = 'organic'
-        """
-        curr_df = pd.read_sql(query, conn, params=(current_run_id,))
-        prev_df = pd.read_sql(query, conn, params=(prev_run_id,))
-
-        conn.close()
-
-        if curr_df.empty or prev_df.empty:
+        # 2. Join current and previous organic ranks in SQL.
+        # Non-numeric ranks ("N/A" artifacts) are excluded rather than cast to 0.
+        organic_counts = conn.execute(
+            """
+            SELECT
+                SUM(run_id = ?),
+                SUM(run_id = ?)
+            FROM serp_results
+            WHERE run_id IN (?, ?) AND result_type = 'organic'
+            """,
+            (current_run_id, prev_run_id, current_run_id, prev_run_id),
+        ).fetchone()
+        if not organic_counts[0] or not organic_counts[1]:
             return {"status": "empty_data", "msg": "No organic results found in one of the runs."}
 
-        # Ensure ranks are numeric (handle "N/A" or other artifacts)
-        curr_df['rank'] = pd.to_numeric(curr_df['rank'], errors='coerce')
-        prev_df['rank'] = pd.to_numeric(prev_df['rank'], errors='coerce')
-        curr_df = curr_df.dropna(subset=['rank'])
-        prev_df = prev_df.dropna(subset=['rank'])
-
-        current_keywords = set(curr_df['keyword_text'].dropna().unique())
-        previous_keywords = set(prev_df['keyword_text'].dropna().unique())
+        current_keywords = _ranked_keywords(conn, current_run_id)
+        previous_keywords = _ranked_keywords(conn, prev_run_id)
         comparability_warning = None
         if current_keywords != previous_keywords:
             missing_from_prev = sorted(current_keywords - previous_keywords)
@@ -83,31 +186,28 @@ def get_volatility_metrics(current_run_id):
                 parts.append(f"Only in previous run: {', '.join(missing_from_curr)}.")
             comparability_warning = " ".join(parts)
 
-        # Merge on keyword + url
-        merged = pd.merge(curr_df, prev_df, on=[
-                          'keyword_text', 'url'], suffixes=('_curr', '_prev'))
-
-        # Calculate Delta
-        # Positive means improved (rank went down numerically)
-        merged['rank_delta'] = merged['rank_prev'] - merged['rank_curr']
-
-        # Volatility Score (Average absolute change)
-        volatility_score = merged['rank_delta'].abs().mean()
+        params = (current_run_id, prev_run_id)
+        volatility_score, stable_count, total_compared = conn.execute(
+            f"""
+            SELECT AVG(ABS(rank_delta)), COALESCE(SUM(rank_delta = 0), 0), COUNT(*)
+            FROM ({RANK_DELTA_QUERY})
+            """,
+            params,
+        ).fetchone()
 
         # Winners & Losers
-        winners = merged[merged['rank_delta'] > 0].sort_values(
-            'rank_delta', ascending=False).head(5)
-        losers = merged[merged['rank_delta'] < 0].sort_values(
-            'rank_delta', ascending=True).head(5)
+        winners = _fetch_movers(conn, "rank_delta > 0", "DESC", params)
+        losers = _fetch_movers(conn, "rank_delta < 0", "ASC", params)
 
         return {
             "status": "success",
-            "volatility_score": round(volatility_score, 2),
-            "stable_urls_count": len(merged[merged['rank_delta'] == 0]),
-            "total_compared": len(merged),
+            # Volatility Score (Average absolute change)
+            "volatility_score": round(volatility_score, 2) if volatility_score is not None else float("nan"),
+            "stable_urls_count": stable_count,
+            "total_compared": total_compared,
             "comparability_warning": comparability_warning,
-            "winners": winners[['keyword_text', 'url', 'rank_curr', 'rank_delta']].to_dict('records'),
-            "losers": losers[['keyword_text', 'url', 'rank_curr', 'rank_delta']].to_dict('records')
+            "winners": winners,
+            "losers": losers
         }
 
     except Exception as e:
@@ -115,6 +215,14 @@ def get_volatility_metrics(current_run_id):
         return None
 
 
+def _share_percentages(counts):
+    """Convert counts to percentage shares, ignoring NULL (unclassified) values."""
+    counts.pop(None, None)
+    total = sum(counts.values())
+    return {k: round(v / total * 100, 1) for k, v in counts.most_common()}
+
+
+@_holds_conn_lock
 def get_entity_dominance(run_id):
     """
     Aggregates Entity Type and Content Type dominance for the current run.
@@ -123,33 +231,34 @@ def get_entity_dominance(run_id):
         return {}
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = _get_conn()
 
-        # Join serp_results with domain_features and url_features
+        # Count each (entity_type, content_type) pair in one grouped scan.
         query = """
-        SELECT 
-            s.rank,
+        SELECT
             d.entity_type,
-            u.content_type
+            u.content_type,
+            COUNT(*)
         FROM serp_results s
         LEFT JOIN domain_features d ON s.domain = d.domain
         LEFT JOIN url_features u ON s.url = u.url
         WHERE s.run_id = ? AND s.result_type = 'organic' AND s.rank <= 10
+        GROUP BY d.entity_type, u.content_type
         """
-        df = pd.read_sql(query, conn, params=(run_id,))
-        conn.close()
+        rows = conn.execute(query, (run_id,)).fetchall()
 
-        if df.empty:
+        if not rows:
             return {}
 
-        entity_counts = df['entity_type'].value_counts(
-            normalize=True).to_dict()
-        content_counts = df['content_type'].value_counts(
-            normalize=True).to_dict()
+        entity_counts = Counter()
+        content_counts = Counter()
+        for entity_type, content_type, count in rows:
+            entity_counts[entity_type] += count
+            content_counts[content_type] += count
 
         return {
-            "entity_dominance": {k: round(v * 100, 1) for k, v in entity_counts.items()},
-            "content_dominance": {k: round(v * 100, 1) for k, v in content_counts.items()}
+            "entity_dominance": _share_percentages(entity_counts),
+            "content_dominance": _share_percentages(content_counts)
         }
 
     except Exception as e:
@@ -157,6 +266,7 @@ def get_entity_dominance(run_id):
         return {}
 
 
+@_holds_conn_lock
 def get_rank_deltas(current_run_id):
     """
     Returns a dictionary of {url: rank_delta} for the current run compared to the previous one.
@@ -165,56 +275,16 @@ def get_rank_deltas(current_run_id):
         return {}
 
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            runs_df = pd.read_sql(
-                "SELECT run_id, run_date FROM runs ORDER BY run_date DESC", conn)
-
-            if len(runs_df) < 2:
-                return {}
-
-            # Identify previous run
-            current_run_date_row = runs_df[runs_df['run_id'] == current_run_id]
-            if current_run_date_row.empty:
-                return {}
-
-            current_date = current_run_date_row.iloc[0]['run_date']
-            prev_runs = runs_df[runs_df['run_date'] < current_date]
-
-            if prev_runs.empty:
-                return {}
-
-            prev_run_id = prev_runs.iloc[0]['run_id']
-
-            # Keep keyword + url to avoid collisions when the same URL ranks for multiple keywords.
-            query = """
-                SELECT keyword_text, url, rank
-                FROM serp_results
-                WHERE run_id = ? AND result_type = 'organic'
-            """
-            curr_df = pd.read_sql(query, conn, params=(current_run_id,))
-            prev_df = pd.read_sql(query, conn, params=(prev_run_id,))
-
-        if curr_df.empty or prev_df.empty:
-            return {}
-
-        curr_df['rank'] = pd.to_numeric(curr_df['rank'], errors='coerce')
-        prev_df['rank'] = pd.to_numeric(prev_df['rank'], errors='coerce')
-        curr_df = curr_df.dropna(subset=['rank'])
-        prev_df = prev_df.dropna(subset=['rank'])
-
-        merged = pd.merge(
-            curr_df,
-            prev_df,
-            on=['keyword_text', 'url'],
-            suffixes=('_curr', '_prev')
-        )
-        if merged.empty:
+        conn = _get_conn()
+        prev_run_id = _prev_run_id(conn, current_run_id)
+        if prev_run_id is None:
             return {}
 
-        merged['rank_delta'] = merged['rank_prev'] - merged['rank_curr']
+        # Keep keyword + url to avoid collisions when the same URL ranks for multiple keywords.
+        rows = conn.execute(RANK_DELTA_QUERY, (current_run_id, prev_run_id))
         return {
-            (row['keyword_text'], row['url']): row['rank_delta']
-            for _, row in merged.dropna(subset=['rank_delta']).iterrows()
+            (keyword_text, url): rank_delta
+            for keyword_text, url, _rank_curr, _rank_prev, rank_delta, _row_id in rows
         }
 
     except Exception as e:
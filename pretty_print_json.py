@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+pretty_print_json.py
+
+Reformats the compact raw SerpApi responses under raw/{run_id}/ for reading.
+
+Usage:
+  python pretty_print_json.py raw/20260311_1415/google_response.json
+  python pretty_print_json.py raw/20260311_1415/google_response.json --out google_pretty.json
+"""
+import argparse
+import json
+import sys
+
+
+def pretty_print(json_path, out_path=None):
+    """Write *json_path* indented to *out_path*, or to stdout when it is None."""
+    with open(json_path, "rb") as f:
+        data = json.load(f)
+    text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pretty-print a raw SerpApi JSON response")
+    parser.add_argument("json_path", help="Path to a raw/{run_id}/*_response.json file")
+    parser.add_argument("--out", help="Write here instead of stdout")
+    args = parser.parse_args()
+    pretty_print(args.json_path, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -79,21 +79,26 @@ def refresh_xlsx(xlsx_path, classifier):
 
     updated = 0
     changed = 0
-    for row_idx in range(2, ws.max_row + 1):
-        link = ws.cell(row=row_idx, column=link_col).value
-        source = ws.cell(row=row_idx, column=source_col).value
-        old_type = ws.cell(row=row_idx, column=entity_col).value or "N/A"
-        new_type, _confidence, _evidence = classifier.classify(
-            normalize_domain(link or source),
-            None,
-        )
-        new_type = new_type or "N/A"
-        ws.cell(row=row_idx, column=entity_col).value = new_type
+    # Organic rows repeat the same few dozen domains; classify each once.
+    entity_types = {}
+    for row in ws.iter_rows(min_row=2):
+        link = row[link_col - 1].value
+        source = row[source_col - 1].value
+        entity_cell = row[entity_col - 1]
+        old_type = entity_cell.value or "N/A"
+        domain = normalize_domain(link or source)
+        if domain not in entity_types:
+            entity_type, _confidence, _evidence = classifier.classify(domain, None)
+            entity_types[domain] = entity_type or "N/A"
+        new_type = entity_types[domain]
+        entity_cell.value = new_type
         updated += 1
         if old_type != new_type:
             changed += 1
 
-    wb.save(xlsx_path)
+    # Saving re-serialises every sheet, so skip it when no cell changed.
+    if changed:
+        wb.save(xlsx_path)
     return updated, changed
 
 
@@ -7,19 +7,48 @@ Orchestrates the full SERP audit pipeline:
 3. Verify DB Enrichment
 4. Generate Domain Override Review Candidates
 """
-import subprocess
 import sys
 import os
+import logging
+import traceback
 import yaml
 
+import generate_domain_override_candidates
+import serp_audit
+import validate_xlsx_vs_json
+import verify_enrichment
 
-def run_command(cmd, description):
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def run_step(func, description, **kwargs):
+    """
+    Run a pipeline step in-process; exits with the step's code on failure.
+
+    Logging handlers a step adds to the root logger (serp_audit logs to its
+    run's raw/<run_id>/serp_api.log) are removed afterwards, so later steps
+    do not write into that file.
+    """
     print(f"\n--- {description} ---")
-    print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=False)
-    if result.returncode != 0:
-        print(f"❌ {description} Failed! (Exit Code: {result.returncode})")
-        sys.exit(result.returncode)
+    print(f"Running: {func.__module__}.{func.__name__}()")
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        returncode = func(**kwargs) or 0
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        for handler in root.handlers[:]:
+            if handler not in saved_handlers:
+                root.removeHandler(handler)
+                handler.close()
+        root.setLevel(saved_level)
+    if returncode != 0:
+        print(f"❌ {description} Failed! (Exit Code: {returncode})")
+        sys.exit(returncode)
     print(f"✅ {description} Completed.")
 
 
@@ -28,17 +57,16 @@ def main():
     config = {}
     if os.path.exists("config.yml"):
         with open("config.yml", "r") as f:
-            config = yaml.safe_load(f) or {}
+            config = yaml.load(f, Loader=_YAML_LOADER) or {}
     files_cfg = config.get("files", {})
 
     # 1. Run SERP Audit
-    run_command([sys.executable, "serp_audit.py"],
-                "Step 1: SERP Audit & Enrichment")
+    run_step(serp_audit.run, "Step 1: SERP Audit & Enrichment")
 
-    # Re-read config: serp_audit.py writes the actual output paths on completion.
+    # Re-read config: serp_audit writes the actual output paths on completion.
     if os.path.exists("config.yml"):
         with open("config.yml", "r") as f:
-            config = yaml.safe_load(f) or {}
+            config = yaml.load(f, Loader=_YAML_LOADER) or {}
     files_cfg = config.get("files", {})
 
     # 2. Validate Data Consistency
@@ -47,27 +75,20 @@ def main():
     diff_file = "diff_report.json"
 
     if os.path.exists(xlsx_file) and os.path.exists(json_file):
-        run_command([
-            sys.executable, "validate_xlsx_vs_json.py",
-            "--xlsx", xlsx_file,
-            "--json", json_file,
-            "--out", diff_file
-        ], "Step 2: Data Validation")
+        run_step(validate_xlsx_vs_json.run, "Step 2: Data Validation",
+                 xlsx_path=xlsx_file, json_path=json_file, out_path=diff_file)
     else:
         print("⚠️ Skipping validation: Output files not found.")
 
     # 3. Verify Database Enrichment
-    run_command([sys.executable, "verify_enrichment.py"],
-                "Step 3: DB Enrichment Verification")
+    run_step(verify_enrichment.run, "Step 3: DB Enrichment Verification")
 
     # 4. Generate Domain Override Review Candidates
     if os.path.exists(json_file):
-        run_command([
-            sys.executable, "generate_domain_override_candidates.py",
-            "--json", json_file,
-            "--overrides", files_cfg.get("domain_overrides", "domain_overrides.yml"),
-            "--out", "domain_override_candidates.md",
-        ], "Step 4: Domain Override Candidate Report")
+        run_step(generate_domain_override_candidates.run, "Step 4: Domain Override Candidate Report",
+                 json_path=json_file,
+                 overrides_path=files_cfg.get("domain_overrides", "domain_overrides.yml"),
+                 out_path="domain_override_candidates.md")
     else:
         print("⚠️ Skipping domain override candidate report: JSON output not found.")
 
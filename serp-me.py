@@ -1,5 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
+import asyncio
+import codecs
+import io
+import queue
 import subprocess
 import sys
 import threading
@@ -7,6 +11,7 @@ import os
 import json
 import re
 import time
+from collections import namedtuple
 from datetime import datetime
 import yaml
 
@@ -25,6 +30,17 @@ def normalize_keyword_list(keywords):
     return [value.strip().lower() for value in keywords if str(value).strip()]
 
 
+def make_output_decoder():
+    """Return an incremental UTF-8 decoder that normalizes CRLF/CR to LF.
+
+    Mirrors what text-mode pipes do, but works on arbitrary byte chunks, so a
+    multi-byte character or CRLF pair split across two reads still decodes once.
+    """
+    return io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+    )
+
+
 def derive_topic_slug_from_keyword_file(keyword_file):
     """Return a normalized lowercase slug from the keyword CSV filename.
 
@@ -40,6 +56,136 @@ def derive_topic_slug_from_keyword_file(keyword_file):
     return stem.lower().replace(" ", "_")
 
 
+class OutputLogProtocol(asyncio.SubprocessProtocol):
+    """Decode subprocess output straight from the pipe transport into *log*.
+
+    Each chunk the transport reads from the raw fd is decoded once and handed
+    on, with no StreamReader buffer in between. *finished* resolves once the
+    process has exited and its pipes are closed.
+    """
+
+    def __init__(self, log, finished):
+        self._log = log
+        self._finished = finished
+        self._decoder = make_output_decoder()
+
+    def pipe_data_received(self, fd, data):
+        text = self._decoder.decode(data)
+        if text:
+            self._log(text)
+
+    def connection_lost(self, exc):
+        text = self._decoder.decode(b"", final=True)
+        if text:
+            self._log(text)
+        if not self._finished.done():
+            self._finished.set_result(None)
+
+
+# Launcher menu entries, in listbox order. ``action`` names an in-app handler
+# for entries that don't run a script file.
+Script = namedtuple("Script", "label file args desc action cmd display")
+
+
+def make_script(label, file, args, desc, action=None):
+    """Build a Script entry with its default command line precomputed."""
+    cmd = (sys.executable, file, *args) if file else ()
+    return Script(label, file, args, desc, action, cmd, " ".join(cmd))
+
+
+# ttk style name -> options, applied once at startup. ttk takes one configure
+# call per style name, so the table is applied in a single loop.
+LAUNCHER_STYLES = {
+    "TButton": {"padding": 6},
+    "TLabel": {"font": ("Helvetica", 10)},
+    "Header.TLabel": {"font": ("Helvetica", 16, "bold")},
+}
+
+SCRIPTS = (
+    make_script(
+        label="1. Run Full Pipeline (Daily)",
+        file="run_pipeline.py",
+        args=(),
+        desc=(
+            "WHEN: Run this once per day or weekly.\n\n"
+            "WHY: This is the 'Daily Driver'. It performs the full audit:\n"
+            "  - Fetches SERP data (Google, Maps, AI)\n"
+            "  - Optional: runs AI-likely query alternatives A.1 and A.2\n"
+            "  - Enriches data (HTML parsing, Entity Classification)\n"
+            "  - Stores history in SQLite\n"
+            "  - Generates Excel/Markdown reports\n"
+            "  - Validates data integrity"
+        )
+    ),
+    make_script(
+        label="2. List Content Opportunities",
+        file="generate_content_brief.py",
+        args=(),
+        desc=(
+            "WHEN: Run when you are ready to write content.\n\n"
+            "WHY: The 'Strategist'. Generates a prompt-informed content opportunity report from the latest pipeline data.\n\n"
+            "OUTPUT: Writes topic-matched content opportunities and advisory briefing files and prints a concise summary in the log.\n\n"
+            "NOTE: Requires Anthropic API access (ANTHROPIC_API_KEY). If unavailable, this step fails."
+        )
+    ),
+    make_script(
+        label="3. List Volatility Keywords",
+        file="visualize_volatility.py",
+        args=("--list",),
+        desc=(
+            "WHEN: Run after accumulating a few days of data.\n\n"
+            "WHY: The 'Analyst'. Lists keywords available for historical tracking.\n\n"
+            "NOTE: To generate a chart, run from command line: python visualize_volatility.py --keyword 'Your Keyword'"
+        )
+    ),
+    make_script(
+        label="4. Export History to CSV",
+        file="export_history.py",
+        args=(),
+        desc=(
+            "WHEN: Run monthly or when external analysis is needed.\n\n"
+            "WHY: Dumps the entire SQLite database (runs, serp_results, features) into CSV files in the 'exports/' folder."
+        )
+    ),
+    make_script(
+        label="5. Verify Database",
+        file="verify_enrichment.py",
+        args=(),
+        desc=(
+            "WHEN: Run if you suspect data issues.\n\n"
+            "WHY: Checks the SQLite database to confirm that enrichment data (URL features, Domain features) is being correctly populated."
+        )
+    ),
+    make_script(
+        label="6. Review Domain Override Candidates",
+        file=None,
+        args=(),
+        action="review_domain_overrides",
+        desc=(
+            "WHEN: Run after a pipeline run when you want to improve entity classification.\n\n"
+            "WHY: Opens an in-app checklist of recurring domains not yet in domain_overrides.yml.\n\n"
+            "OUTPUT: Lets you approve checked items directly into domain_overrides.yml."
+        )
+    ),
+    make_script(
+        label="7. Run Feasibility Analysis (Moz DA)",
+        file="run_feasibility.py",
+        args=(),
+        desc=(
+            "WHEN: Run after a pipeline run, or any time you want to check DA competitiveness.\n\n"
+            "WHY: Uses the Moz API to score each keyword by Domain Authority gap. "
+            "Generates a standalone feasibility report with:\n"
+            "  - High / Moderate / Low Feasibility per keyword\n"
+            "  - Hyper-local pivot suggestions for Low Feasibility keywords\n"
+            "  - Local 3-pack check for pivot variants (optional)\n\n"
+            "NOTE: Requires MOZ_TOKEN in .env (free Moz tier: 50 rows/month). "
+            "Results are cached for 30 days so repeat runs don't burn quota.\n\n"
+            "OUTPUT: Writes feasibility_{topic}_{timestamp}.md"
+        )
+    ),
+)
+
+
 class SerpLauncherApp:
     EXIT_STATUS_LABELS = {
         0: "SUCCESS",
@@ -66,6 +212,12 @@ class SerpLauncherApp:
     ]
     MAIN_REPORT_DEFAULT_MODEL = "claude-opus-4-6"
     ADVISORY_DEFAULT_MODEL = "claude-sonnet-4-20250514"
+    # Log output is queued from any thread and flushed to the Text widget on this cadence.
+    LOG_DRAIN_MS = 50
+    # Oldest lines are trimmed past this so long pipeline runs don't bog down the Text widget.
+    MAX_LOG_LINES = 5000
+    STATE_IDLE = "IDLE"
+    STATE_RUNNING = "RUNNING"
 
     def __init__(self, root):
         self.root = root
@@ -78,12 +230,19 @@ class SerpLauncherApp:
         self.last_completed_script = None
         self.keyword_file_options = {}
         self.current_run_context = None
+        self._log_queue = queue.Queue()
+        self._last_sel = -1
+        # Launcher run state; the Run button is only enabled when IDLE with a selection.
+        self._state = self.STATE_IDLE
+        self._run_btn_state = "disabled"
+        # One long-lived event loop runs every script subprocess off the Tk thread.
+        self._process_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._process_loop.run_forever, daemon=True).start()
 
         # Styles
         style = ttk.Style()
-        style.configure("TButton", padding=6)
-        style.configure("TLabel", font=("Helvetica", 10))
-        style.configure("Header.TLabel", font=("Helvetica", 16, "bold"))
+        for style_name, options in LAUNCHER_STYLES.items():
+            style.configure(style_name, **options)
 
         # Header
         header_frame = ttk.Frame(root)
@@ -124,93 +283,8 @@ class SerpLauncherApp:
                                  width=35, bg="#f9f9f9", state="disabled", font=("Helvetica", 11))
         self.desc_text.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Actions Configuration
-        self.scripts = [
-            {
-                "label": "1. Run Full Pipeline (Daily)",
-                "file": "run_pipeline.py",
-                "args": [],
-                "desc": (
-                    "WHEN: Run this once per day or weekly.\n\n"
-                    "WHY: This is the 'Daily Driver'. It performs the full audit:\n"
-                    "  - Fetches SERP data (Google, Maps, AI)\n"
-                    "  - Optional: runs AI-likely query alternatives A.1 and A.2\n"
-                    "  - Enriches data (HTML parsing, Entity Classification)\n"
-                    "  - Stores history in SQLite\n"
-                    "  - Generates Excel/Markdown reports\n"
-                    "  - Validates data integrity"
-                )
-            },
-            {
-                "label": "2. List Content Opportunities",
-                "file": "generate_content_brief.py",
-                "args": [],
-                "desc": (
-                    "WHEN: Run when you are ready to write content.\n\n"
-                    "WHY: The 'Strategist'. Generates a prompt-informed content opportunity report from the latest pipeline data.\n\n"
-                    "OUTPUT: Writes topic-matched content opportunities and advisory briefing files and prints a concise summary in the log.\n\n"
-                    "NOTE: Requires Anthropic API access (ANTHROPIC_API_KEY). If unavailable, this step fails."
-                )
-            },
-            {
-                "label": "3. List Volatility Keywords",
-                "file": "visualize_volatility.py",
-                "args": ["--list"],
-                "desc": (
-                    "WHEN: Run after accumulating a few days of data.\n\n"
-                    "WHY: The 'Analyst'. Lists keywords available for historical tracking.\n\n"
-                    "NOTE: To generate a chart, run from command line: python visualize_volatility.py --keyword 'Your Keyword'"
-                )
-            },
-            {
-                "label": "4. Export History to CSV",
-                "file": "export_history.py",
-                "args": [],
-                "desc": (
-                    "WHEN: Run monthly or when external analysis is needed.\n\n"
-                    "WHY: Dumps the entire SQLite database (runs, serp_results, features) into CSV files in the 'exports/' folder."
-                )
-            },
-            {
-                "label": "5. Verify Database",
-                "file": "verify_enrichment.py",
-                "args": [],
-                "desc": (
-                    "WHEN: Run if you suspect data issues.\n\n"
-                    "WHY: Checks the SQLite database to confirm that enrichment data (URL features, Domain features) is being correctly populated."
-                )
-            },
-            {
-                "label": "6. Review Domain Override Candidates",
-                "file": None,
-                "args": [],
-                "action": "review_domain_overrides",
-                "desc": (
-                    "WHEN: Run after a pipeline run when you want to improve entity classification.\n\n"
-                    "WHY: Opens an in-app checklist of recurring domains not yet in domain_overrides.yml.\n\n"
-                    "OUTPUT: Lets you approve checked items directly into domain_overrides.yml."
-                )
-            },
-            {
-                "label": "7. Run Feasibility Analysis (Moz DA)",
-                "file": "run_feasibility.py",
-                "args": [],
-                "desc": (
-                    "WHEN: Run after a pipeline run, or any time you want to check DA competitiveness.\n\n"
-                    "WHY: Uses the Moz API to score each keyword by Domain Authority gap. "
-                    "Generates a standalone feasibility report with:\n"
-                    "  - High / Moderate / Low Feasibility per keyword\n"
-                    "  - Hyper-local pivot suggestions for Low Feasibility keywords\n"
-                    "  - Local 3-pack check for pivot variants (optional)\n\n"
-                    "NOTE: Requires MOZ_TOKEN in .env (free Moz tier: 50 rows/month). "
-                    "Results are cached for 30 days so repeat runs don't burn quota.\n\n"
-                    "OUTPUT: Writes feasibility_{topic}_{timestamp}.md"
-                )
-            },
-        ]
+        self.script_listbox.insert(tk.END, *(script.label for script in SCRIPTS))
 
-        for s in self.scripts:
-            self.script_listbox.insert(tk.END, s["label"])
 
         # Control Buttons
         btn_frame = ttk.Frame(root)
@@ -307,30 +381,50 @@ class SerpLauncherApp:
         ttk.Button(btn_frame, text="Clear Log",
                    command=self.clear_log).pack(side="right", padx=5)
 
-        # Output Log
-        log_frame = ttk.LabelFrame(root, text="Execution Log")
+        # Output Log: built after the first paint; log() queues until it exists.
+        self.log_text = None
+        self.refresh_keyword_file_options()
+        self.root.after_idle(self._build_log_panel)
+
+    def _build_log_panel(self):
+        log_frame = ttk.LabelFrame(self.root, text="Execution Log")
         log_frame.pack(pady=(0, 20), fill="both", expand=True, padx=20)
 
         self.log_text = scrolledtext.ScrolledText(
             log_frame, height=12, state="disabled", bg="#1e1e1e", fg="#00ff00", font=("Consolas", 10))
         self.log_text.pack(fill="both", expand=True, padx=5, pady=5)
-        self.refresh_keyword_file_options()
+        self.root.after(self.LOG_DRAIN_MS, self._drain_log)
 
     def on_select(self, event):
         selection = self.script_listbox.curselection()
+        index = selection[0] if selection else -1
+        # <<ListboxSelect>> refires on drags and focus changes; skip unchanged selections.
+        if index == self._last_sel:
+            return
+        self._last_sel = index
         if selection:
-            index = selection[0]
-            desc = self.scripts[index]["desc"]
+            desc = SCRIPTS[index].desc
             self.update_desc(desc)
-            self.run_btn.config(state="normal")
         else:
             self.update_desc("")
-            self.run_btn.config(state="disabled")
+        self._sync_run_btn()
+
+    def _set_state(self, new_state):
+        if new_state == self._state:
+            return
+        self._state = new_state
+        self._sync_run_btn()
+
+    def _sync_run_btn(self):
+        """Apply the Run button state implied by the run state and selection, if it changed."""
+        wanted = "normal" if self._state == self.STATE_IDLE and self._last_sel >= 0 else "disabled"
+        if wanted != self._run_btn_state:
+            self._run_btn_state = wanted
+            self.run_btn.config(state=wanted)
 
     def update_desc(self, text):
         self.desc_text.config(state="normal")
-        self.desc_text.delete("1.0", tk.END)
-        self.desc_text.insert(tk.END, text)
+        self.desc_text.replace("1.0", tk.END, text)
         self.desc_text.config(state="disabled")
 
     def config_path(self):
@@ -609,31 +703,33 @@ class SerpLauncherApp:
         }
 
     def run_script(self):
+        if self._state == self.STATE_RUNNING:
+            return
         selection = self.script_listbox.curselection()
         if not selection:
             return
 
-        script_info = self.scripts[selection[0]]
-        if script_info.get("action") == "review_domain_overrides":
+        script_info = SCRIPTS[selection[0]]
+        if script_info.action == "review_domain_overrides":
             self.open_domain_override_review()
             return
 
         run_context = None
         output_names = None
-        if script_info["file"] in {"run_pipeline.py", "generate_content_brief.py", "run_feasibility.py"}:
+        if script_info.file in {"run_pipeline.py", "generate_content_brief.py", "run_feasibility.py"}:
             try:
-                run_context = self.prepare_keyword_run_context(script_info["file"])
+                run_context = self.prepare_keyword_run_context(script_info.file)
             except ValueError as exc:
                 messagebox.showerror("Keyword Setup", str(exc))
                 return
             output_names = run_context["output_names"]
-            if script_info["file"] == "generate_content_brief.py" and not run_context.get("input_json"):
+            if script_info.file == "generate_content_brief.py" and not run_context.get("input_json"):
                 messagebox.showerror(
                     "Content Opportunities",
                     "No existing market analysis JSON was found for this topic. Run Full Pipeline first."
                 )
                 return
-            if script_info["file"] == "run_feasibility.py" and not run_context.get("input_json"):
+            if script_info.file == "run_feasibility.py" and not run_context.get("input_json"):
                 messagebox.showerror(
                     "Feasibility Analysis",
                     "No existing market analysis JSON was found for this topic. Run Full Pipeline first."
@@ -642,11 +738,13 @@ class SerpLauncherApp:
         else:
             archived = []
 
-        cmd = [sys.executable, script_info["file"]]
-        if script_info["file"] == "generate_content_brief.py":
+        cmd = script_info.cmd
+        display = script_info.display
+        if script_info.file == "generate_content_brief.py":
             main_model = self.main_model_var.get().strip() or self.MAIN_REPORT_DEFAULT_MODEL
             advisory_model = self.advisory_model_var.get().strip() or self.ADVISORY_DEFAULT_MODEL
-            cmd.extend([
+            cmd = [
+                *cmd,
                 "--json", run_context["input_json"],
                 "--list",
                 "--report-out", output_names["report_out"],
@@ -656,14 +754,14 @@ class SerpLauncherApp:
                 "--llm-model", main_model,
                 "--advisory-model", advisory_model,
                 "--use-llm",
-            ])
-        elif script_info["file"] == "run_feasibility.py":
+            ]
+            display = " ".join(cmd)
+        elif script_info.file == "run_feasibility.py":
             feasibility_out = output_names.get("feasibility_out", "")
-            cmd.extend(["--json", run_context["input_json"]])
+            cmd = [*cmd, "--json", run_context["input_json"]]
             if feasibility_out:
                 cmd.extend(["--out", feasibility_out])
-        else:
-            cmd.extend(script_info["args"])
+            display = " ".join(cmd)
         cwd = os.getcwd()
         env = os.environ.copy()
         env["PYTHONUNBUFFERED"] = "1"  # force line-by-line stdout flush into the log
@@ -689,11 +787,11 @@ class SerpLauncherApp:
         self.current_run_context = run_context
 
         self.log("\n" + "=" * 68 + "\n")
-        self.log(f"[{started_at}] Starting: {script_info['label']}\n")
+        self.log(f"[{started_at}] Starting: {script_info.label}\n")
         self.log(f"> Working directory: {cwd}\n")
         self.log(f"> Python executable: {sys.executable}\n")
-        self.log(f"> Command: {' '.join(cmd)}\n")
-        self.log(f"> Script file: {script_info['file']}\n")
+        self.log(f"> Command: {display}\n")
+        self.log(f"> Script file: {script_info.file}\n")
         if run_context:
             self.log(f"> Keyword file: {os.path.basename(run_context['keyword_file'])}\n")
             self.log(f"> Keyword count: {len(run_context['keywords'])}\n")
@@ -723,62 +821,83 @@ class SerpLauncherApp:
             self.log("> SERP_AI_PRIORITY_KEYWORDS=<none; A.1/A.2 skipped unless priority keywords are available>\n")
         self.log("> SERP_SINGLE_KEYWORD=<disabled; using keyword file management>\n")
         self.log("-" * 68 + "\n")
-        self.run_btn.config(state="disabled")
+        self._set_state(self.STATE_RUNNING)
 
-        threading.Thread(target=self.execute_thread,
-                         args=(cmd, env, cwd), daemon=True).start()
+        asyncio.run_coroutine_threadsafe(
+            self.execute_process(cmd, env, cwd), self._process_loop)
 
-    def execute_thread(self, cmd, env, cwd):
+    async def execute_process(self, cmd, env, cwd):
         started_at = time.perf_counter()
         try:
-            # Use Popen to capture output in real-time
-            process = subprocess.Popen(
-                cmd,
+            loop = asyncio.get_running_loop()
+            finished = loop.create_future()
+            transport, _protocol = await loop.subprocess_exec(
+                lambda: OutputLogProtocol(self.log, finished),
+                *cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
                 cwd=cwd,
                 env=env
             )
+            try:
+                await finished
+                returncode = transport.get_returncode()
+            finally:
+                transport.close()
 
-            for line in process.stdout:
-                self.root.after(0, self.log, line)
-
-            process.wait()
             elapsed_s = time.perf_counter() - started_at
             finished_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             status_label = self.EXIT_STATUS_LABELS.get(
-                process.returncode, f"FAILED_{process.returncode}"
+                returncode, f"FAILED_{returncode}"
             )
             completed_script = os.path.basename(cmd[1]) if len(cmd) > 1 else ""
-            self.root.after(
-                0,
-                self.log,
+            self.log(
                 f"\n[{finished_at}] Process finished with status {status_label} "
                 f"(elapsed: {elapsed_s:.1f}s)\n" + "=" * 68 + "\n"
             )
-            if process.returncode == 0 and completed_script == "run_pipeline.py":
+            if returncode == 0 and completed_script == "run_pipeline.py":
                 self.root.after(0, self.open_domain_override_review_after_pipeline)
 
         except Exception as e:
             elapsed_s = time.perf_counter() - started_at
-            self.root.after(
-                0,
-                self.log,
+            self.log(
                 f"\n[Error starting process after {elapsed_s:.1f}s: {e}]\n" + "=" * 68 + "\n"
             )
         finally:
             self.root.after(0, self.refresh_keyword_file_options)
-            self.root.after(0, lambda: self.run_btn.config(state="normal"))
+            self.root.after(0, self._reenable_run_btn)
+
+    def _reenable_run_btn(self):
+        self._set_state(self.STATE_IDLE)
 
     def log(self, message):
-        self.log_text.config(state="normal")
-        self.log_text.insert(tk.END, message)
-        self.log_text.see(tk.END)
-        self.log_text.config(state="disabled")
+        """Queue *message* for the log panel; safe to call from worker threads."""
+        self._log_queue.put(message)
+
+    def _drain_log(self):
+        """Flush everything queued since the last tick in a single Text insert."""
+        chunks = []
+        try:
+            while True:
+                chunks.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if chunks:
+            # Only follow new output if the user hasn't scrolled up to read earlier lines.
+            at_bottom = self.log_text.yview()[1] > 0.999
+            self.log_text.config(state="normal")
+            self.log_text.insert(tk.END, "".join(chunks))
+            line_count = int(self.log_text.index("end-1c").split(".")[0])
+            if line_count > self.MAX_LOG_LINES:
+                self.log_text.delete("1.0", f"{line_count - self.MAX_LOG_LINES + 1}.0")
+            if at_bottom:
+                self.log_text.see(tk.END)
+            self.log_text.config(state="disabled")
+        self.root.after(self.LOG_DRAIN_MS, self._drain_log)
 
     def clear_log(self):
+        if self.log_text is None or self.log_text.index("end-1c") == "1.0":
+            return
         self.log_text.config(state="normal")
         self.log_text.delete("1.0", tk.END)
         self.log_text.config(state="disabled")
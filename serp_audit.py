@@ -1,14 +1,26 @@
 import pandas as pd
+import numpy as np
+import asyncio
+import threading
 import time
 import os
 import re
+import sys
 import random
 from dotenv import load_dotenv
 import logging
 import json
+import gzip
+import io
+import math
 from datetime import datetime
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import hashlib
+import importlib.util
+import requests
+from requests.adapters import HTTPAdapter
 import generate_insight_report
 import generate_content_brief
 import yaml
@@ -17,9 +29,20 @@ from urllib.parse import urlparse
 from classifiers import ContentClassifier, EntityClassifier
 from url_enricher import UrlEnricher
 from storage import SerpStorage
+from json_utils import loads_json
 
 try:
-    from serpapi import GoogleSearch
+    from serpapi import GoogleSearch as _SerpApiGoogleSearch
+
+    class GoogleSearch(_SerpApiGoogleSearch):
+        """GoogleSearch that sends requests over the shared keep-alive session."""
+
+        def get_response(self, path="/search"):
+            url, parameter = self.construct_url(path)
+            # The client's own default timeout is 60000 s, which would let one
+            # stalled connection hold a keyword worker for the whole run.
+            return _SERPAPI_SESSION.get(url, params=parameter, timeout=SERPAPI_TIMEOUT_SECONDS)
+
     SERPAPI_AVAILABLE = True
 except ImportError:
     GoogleSearch = None
@@ -36,17 +59,30 @@ except ImportError:
 import feasibility as feasibility_module
 from intent_classifier import IntentClassifier
 
+# Heavy optional libraries are only probed here and imported where they are
+# used, so runs that stop early never pay for TextBlob/NLTK or matplotlib.
+TEXTBLOB_AVAILABLE = importlib.util.find_spec("textblob") is not None
 try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
+    from numba import njit
+    NUMBA_AVAILABLE = True
 except ImportError:
-    TEXTBLOB_AVAILABLE = False
+    njit = None
+    NUMBA_AVAILABLE = False
 try:
-    from wordcloud import WordCloud
-    import matplotlib.pyplot as plt
-    VISUALIZATION_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    VISUALIZATION_AVAILABLE = False
+    orjson = None
+    ORJSON_AVAILABLE = False
+XLSXWRITER_AVAILABLE = importlib.util.find_spec("xlsxwriter") is not None
+try:
+    # Raised when xlsxwriter cannot create the file (e.g. the workbook is open
+    # in Excel); it does not subclass OSError.
+    from xlsxwriter.exceptions import FileCreateError
+except ImportError:
+    FileCreateError = OSError
+VISUALIZATION_AVAILABLE = (importlib.util.find_spec("wordcloud") is not None
+                           and importlib.util.find_spec("matplotlib") is not None)
 
 # --- CONFIGURATION ---
 load_dotenv()
@@ -111,6 +147,18 @@ def _resolve_output_names(input_csv, config):
 
 
 OUTPUT_FILE, OUTPUT_JSON, OUTPUT_MD = _resolve_output_names(INPUT_FILE, CONFIG)
+# Sheets with more rows than this are written to a gzipped JSON Lines file next
+# to the workbook, leaving a one-row pointer in the sheet (Excel caps sheets at
+# 1,048,576 rows and gets slow to build and open long before that).
+EXCEL_SIDECAR_ROW_THRESHOLD = max(1, int(CONFIG.get("files", {}).get("excel_sidecar_row_threshold", 100_000)))
+# Build the workbook in memory and write it with one call instead of streaming
+# it through a buffer; worth it when the output folder is on a network share.
+EXCEL_IN_MEMORY = bool(CONFIG.get("files", {}).get("excel_in_memory", False))
+# Diagnostic sheets nobody reads in Excel always go to a sidecar, whatever their size.
+# AI_Overview_Citations, Rich_Features and SERP_Language_Patterns stay in the
+# workbook below the row threshold: docs/extraction_spec.md and the analysis
+# prompt read them by sheet name and column.
+EXCEL_SIDECAR_SHEETS = frozenset({"Parsing_Warnings", "AIO_Logs"})
 
 LOCATION = CONFIG.get("serpapi", {}).get(
     "location", "Vancouver, British Columbia, Canada")
@@ -125,6 +173,17 @@ MAPS_MAX_PAGES = max(1, int(CONFIG.get("serpapi", {}).get("maps_max_pages", 3)))
 RETRY_MAX_ATTEMPTS = max(1, int(CONFIG.get("serpapi", {}).get("retry_max_attempts", 3)))
 RETRY_BACKOFF_SECONDS = float(CONFIG.get("serpapi", {}).get("retry_backoff_seconds", 1.0))
 REQUEST_DELAY_SECONDS = float(CONFIG.get("serpapi", {}).get("request_delay_seconds", 0.2))
+# Per-request timeout on the shared session; a timed-out call is retried like any other error.
+SERPAPI_TIMEOUT_SECONDS = float(CONFIG.get("serpapi", {}).get("timeout_seconds", 30))
+# Keywords whose SERP requests may be in flight at once during the fetch phase.
+MAX_CONCURRENT_KEYWORDS = max(1, int(CONFIG.get("serpapi", {}).get("max_concurrent_keywords", 4)))
+# Cap on SerpApi calls started per second across all worker threads. 0 disables it.
+MAX_REQUESTS_PER_SECOND = float(CONFIG.get("serpapi", {}).get("max_requests_per_second", 5))
+# Local copy of SerpApi responses, keyed by request params. The default TTL matches
+# SerpApi's own one-hour cache, so repeat runs within the hour skip the network
+# without ever serving rankings older than SerpApi itself would. 0 disables it.
+RESPONSE_CACHE_DIR = CONFIG.get("serpapi", {}).get("response_cache_dir", os.path.join("cache", "serpapi"))
+RESPONSE_CACHE_TTL_SECONDS = float(CONFIG.get("serpapi", {}).get("response_cache_ttl_hours", 1)) * 3600
 AI_FALLBACK_WITHOUT_LOCATION = bool(
     CONFIG.get("serpapi", {}).get("ai_fallback_without_location", True)
 )
@@ -135,6 +194,19 @@ RELATED_QUESTIONS_AI_MAX_CALLS = max(
     0, int(CONFIG.get("serpapi", {}).get("related_questions_ai_max_calls", 5))
 )
 FORCE_LOCAL_INTENT = CONFIG.get("app", {}).get("force_local_intent", True)
+# City part of LOCATION, matched against keywords to decide whether to append it.
+_LOCATION_CITY_LOWER = LOCATION.split(",")[0].lower()
+# Primary SERP request params fixed for the run; fetch_serp_data copies this and sets "q".
+_PRIMARY_PARAMS_TEMPLATE = {
+    "engine": GOOGLE_ENGINE,
+    "q": None,
+    "location": LOCATION,
+    "hl": GOOGLE_HL,
+    "gl": GOOGLE_GL,
+    "api_key": API_KEY,
+    "num": GOOGLE_NUM,
+    "device": GOOGLE_DEVICE
+}
 ENRICHMENT_ENABLED = CONFIG.get("enrichment", {}).get("enabled", True)
 MAX_URLS_TO_ENRICH = CONFIG.get(
     "enrichment", {}).get("max_urls_per_keyword", 5)
@@ -149,7 +221,7 @@ FEASIBILITY_NEIGHBORHOODS = _feas_cfg.get("neighborhoods", [])
 CLIENT_DOMAIN            = SHARED_CONFIG.get("client", {}).get("domain", CONFIG.get("analysis_report", {}).get("client_domain", ""))
 MOZ_CACHE_TTL_DAYS       = int(CONFIG.get("moz", {}).get("cache_ttl_days", 30))
 
-STOP_WORDS = set(SHARED_CONFIG.get("stop_words", [
+STOP_WORDS = frozenset(SHARED_CONFIG.get("stop_words", [
     "the", "and", "to", "of", "a", "in", "is", "for", "on", "with", "as", "at", "by", "an", "be", "or", "are", "from", "that",
     "this", "it", "we", "our", "us", "can", "will", "your", "you", "my", "me", "not", "have", "has", "but", "so", "if", "their", "they",
     "vancouver", "bc", "british", "columbia", "canada", "north", "west", "counselling", "counseling", "therapy", "therapist",
@@ -168,7 +240,55 @@ if os.path.exists(_omitted_path):
     except Exception as e:
         print(f"Warning: Could not load omitted domains from {_omitted_path}: {e}")
 
+# Query-string and keyword patterns used per keyword/page.
+_START_PARAM_RE = re.compile(r"[?&]start=(\d+)")
+_LL_PARAM_RE = re.compile(r"[?&]ll=([0-9.\-]+,[0-9.\-]+)")
+_BEST_TOP_PREFIX_RE = re.compile(r"^(best|top)\s+", re.I)
+
 SERPAPI_CALL_COUNT = 0
+# Keyword fetches run on worker threads; these guard the shared counter and raw/ files.
+_CALL_COUNT_LOCK = threading.Lock()
+_RAW_JSON_LOCK = threading.Lock()
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a call may start."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Keyword and follow-up threads together can start up to
+# MAX_CONCURRENT_KEYWORDS * FOLLOWUP_CONCURRENCY calls at once; this paces them
+# to the account's rate limit instead of tripping SerpApi's 429s.
+_SERPAPI_RATE_LIMITER = _TokenBucket(MAX_REQUESTS_PER_SECOND)
+
+# One pooled session for every SerpApi call, so the primary, AI overview, maps
+# and autocomplete requests reuse open TLS connections instead of reconnecting.
+# Follow-up request chains (AI overview, related questions, Maps) fetched at
+# once per keyword.
+FOLLOWUP_CONCURRENCY = 3
+_SERPAPI_SESSION = requests.Session()
+_SERPAPI_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1, pool_maxsize=MAX_CONCURRENT_KEYWORDS * FOLLOWUP_CONCURRENCY))
 
 
 def _env_bool(name, default=False):
@@ -301,8 +421,57 @@ def setup_logging(run_id):
     )
 
 
-def _fetch_serp_api(params):
-    """Internal function to query SerpApi with retry logic."""
+def log_optional_accelerators():
+    """Record which optional accelerators this run picked up."""
+    logging.info(
+        "Optional accelerators: numba=%s orjson=%s xlsxwriter=%s",
+        NUMBA_AVAILABLE, ORJSON_AVAILABLE, XLSXWRITER_AVAILABLE)
+
+
+def _response_cache_path(params):
+    """
+    Cache file for *params*; the API key and no_cache flag don't affect the response.
+
+    Google ignores case and runs of whitespace in the query, so keyword variants
+    differing only in those share an entry. Anything that can change the SERP
+    (spelling, word order, location, gl/hl) still gets its own key.
+    """
+    key_params = {k: v for k, v in params.items() if k not in ("api_key", "no_cache")}
+    if isinstance(key_params.get("q"), str):
+        key_params["q"] = " ".join(key_params["q"].casefold().split())
+    digest = hashlib.blake2b(json.dumps(key_params, sort_keys=True).encode(), digest_size=16).hexdigest()
+    return os.path.join(RESPONSE_CACHE_DIR, f"{digest}.json")
+
+
+def _load_cached_response(cache_path):
+    """Returns the cached response at *cache_path* if it is younger than the TTL."""
+    try:
+        if time.time() - os.path.getmtime(cache_path) > RESPONSE_CACHE_TTL_SECONDS:
+            return None
+        with open(cache_path, "rb") as f:
+            return loads_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_response(cache_path, results):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_dumps_json(results))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write SerpApi response cache {cache_path}: {e}")
+
+
+def _fetch_serp_api(params, cache_hits=None):
+    """
+    Internal function to query SerpApi with retry logic.
+
+    When *cache_hits* is a list, the params of a call served from the local
+    response cache are appended to it.
+    """
     global SERPAPI_CALL_COUNT
     if not SERPAPI_AVAILABLE:
         logging.error(
@@ -314,19 +483,39 @@ def _fetch_serp_api(params):
     log_params = params.copy()
     if "api_key" in log_params:
         log_params["api_key"] = "REDACTED"
-    logging.info(f"API Call Parameters: {json.dumps(log_params, indent=2)}")
+    logging.info("API Call Parameters: %s", _LazyJSON(log_params))
+
+    cache_path = _response_cache_path(params) if RESPONSE_CACHE_TTL_SECONDS > 0 else None
+    if cache_path and not params.get("no_cache"):
+        cached = _load_cached_response(cache_path)
+        if cached is not None:
+            logging.info("Served from local response cache: %s", cache_path)
+            if cache_hits is not None:
+                cache_hits.append(params)
+            return cached
+
     for attempt in range(1, RETRY_MAX_ATTEMPTS + 1):
         try:
-            SERPAPI_CALL_COUNT += 1
-            logging.info(f"SerpApi Call Count: {SERPAPI_CALL_COUNT}")
+            _SERPAPI_RATE_LIMITER.acquire()
+            with _CALL_COUNT_LOCK:
+                SERPAPI_CALL_COUNT += 1
+                call_count = SERPAPI_CALL_COUNT
+            logging.info("SerpApi Call Count: %d", call_count)
             search = GoogleSearch(params)
             results = search.get_dict()
-            logging.info(f"API Return Message: {json.dumps(results, indent=2)}")
+            # The full response is persisted by save_raw_json; log a summary, not a pretty-printed copy.
+            search_metadata = results.get("search_metadata") or {}
+            logging.info(
+                "API Return: id=%s status=%s keys=%s",
+                search_metadata.get("id"), search_metadata.get("status"), _SortedKeys(results),
+            )
             if "error" in results:
                 logging.error(f"API Error (attempt {attempt}): {results['error']}")
                 if attempt == RETRY_MAX_ATTEMPTS:
                     return None
             else:
+                if cache_path:
+                    _store_cached_response(cache_path, results)
                 return results
         except Exception as e:
             logging.error(
@@ -348,7 +537,7 @@ def _parse_start_from_pagination(results):
     next_link = pagination.get("next")
     if not next_link:
         return None
-    match = re.search(r"[?&]start=(\d+)", next_link)
+    match = _START_PARAM_RE.search(next_link)
     if not match:
         return None
     return int(match.group(1))
@@ -447,13 +636,50 @@ def _extract_text_blocks_text(item):
     return " ".join(parts)
 
 
+def _dumps_json(data, indent=False):
+    """Serialize *data* to UTF-8 JSON bytes with orjson when available.
+
+    Falls back to the stdlib encoder for values orjson rejects (e.g.
+    non-string dict keys).
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except orjson.JSONEncodeError:
+            pass
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class _LazyJSON:
+    """Log argument that pretty-prints *obj* only if the record is emitted."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return _dumps_json(self.obj, indent=True).decode()
+
+
+class _SortedKeys(_LazyJSON):
+    """Log argument rendering a dict's keys, sorted, only if the record is emitted."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return str(sorted(self.obj))
+
+
 def save_raw_json(run_id, engine, data):
-    """Saves raw JSON output to a structured folder."""
+    """Saves raw JSON output (compact; see pretty_print_json.py) to a structured folder."""
     output_dir = f"raw/{run_id}"
     os.makedirs(output_dir, exist_ok=True)
     file_path = f"{output_dir}/{engine}_response.json"
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    with _RAW_JSON_LOCK, open(file_path, 'wb') as f:
+        f.write(_dumps_json(data))
 
 
 def fetch_serp_data(keyword, run_id):
@@ -473,11 +699,15 @@ def fetch_serp_data(keyword, run_id):
         "google_pages_fetched": 0,
         "maps_pages_fetched": 0,
         "related_questions_ai_calls": 0,
+        "cached": False,
+        "cached_calls": 0,
         "error": None
     }
+    # Calls served from the local response cache (appended from the follow-up threads too).
+    cache_hits = []
 
     # --- 1. Primary SERP Request ---
-    if FORCE_LOCAL_INTENT and LOCATION.split(",")[0].lower() not in keyword.lower():
+    if FORCE_LOCAL_INTENT and _LOCATION_CITY_LOWER not in keyword.lower():
         query_term = f"{keyword} {LOCATION}"
     else:
         query_term = keyword
@@ -486,24 +716,19 @@ def fetch_serp_data(keyword, run_id):
     # We hash the params before the API key is added (or we rely on the fact that API_KEY is constant)
     # To be safe and consistent, we hash the dictionary structure excluding the API key if we wanted,
     # but here we just hash the definition before the call.
-    primary_params = {
-        "engine": GOOGLE_ENGINE,
-        "q": query_term,
-        "location": LOCATION,
-        "hl": GOOGLE_HL,
-        "gl": GOOGLE_GL,
-        "api_key": API_KEY,
-        "num": GOOGLE_NUM,
-        "device": GOOGLE_DEVICE
-    }
+    primary_params = _PRIMARY_PARAMS_TEMPLATE.copy()
+    primary_params["q"] = query_term
     _apply_no_cache(primary_params)
 
-    # Create a stable hash of the parameters for audit trails
+    # Create a stable hash of the parameters for audit trails. Kept on MD5 so
+    # hashes stay comparable with runs already recorded; it is a fingerprint,
+    # not a security control (usedforsecurity=False also keeps FIPS builds working).
     params_hash = hashlib.md5(json.dumps(
-        primary_params, sort_keys=True).encode()).hexdigest()
+        primary_params, sort_keys=True).encode(), usedforsecurity=False).hexdigest()
 
     logging.info(f"  - Fetching main SERP for '{query_term}'...")
-    primary_results = _fetch_serp_api(primary_params)
+    primary_results = _fetch_serp_api(primary_params, cache_hits=cache_hits)
+    aio_log["cached"] = bool(cache_hits)
 
     # Metadata capture
     created_at = datetime.now().isoformat()
@@ -520,221 +745,294 @@ def fetch_serp_data(keyword, run_id):
     query_metadata = {"run_id": run_id, "created_at": created_at,
                       "google_url": google_url, "params_hash": params_hash}
 
-    # Fetch additional Google pages, then merge.
-    google_pages = [primary_results]
-    seen_starts = set([0])
-    next_start = _parse_start_from_pagination(primary_results)
-
-    while (
-        next_start is not None
-        and len(google_pages) < GOOGLE_MAX_PAGES
-        and len(_merge_google_pages(google_pages).get("organic_results", [])) < GOOGLE_MAX_RESULTS
-    ):
-        if next_start in seen_starts:
-            break
-        seen_starts.add(next_start)
-        page_params = dict(primary_params)
-        page_params["start"] = next_start
-        logging.info(f"  - Fetching Google page start={next_start}...")
-        page_results = _fetch_serp_api(page_params)
-        if not page_results:
-            break
-        google_pages.append(page_results)
-        next_start = _parse_start_from_pagination(page_results)
-        time.sleep(REQUEST_DELAY_SECONDS)
-
-    primary_results = _merge_google_pages(google_pages)
-    aio_log["google_pages_fetched"] = len(google_pages)
-    query_metadata["google_pages_fetched"] = len(google_pages)
-
-    # Log top-level keys for debugging
-    logging.info(f"Main SERP Keys: {sorted(primary_results.keys())}")
-
-    # Log module booleans for easier debugging
-    module_flags = {
-        "has_ai_overview": "ai_overview" in primary_results,
-        "has_local_results": "local_results" in primary_results,
-        "has_knowledge_panel": "knowledge_graph" in primary_results,
-        "has_ads": "ads" in primary_results,
-        "has_related_questions": "related_questions" in primary_results
-    }
-    logging.info(f"Module Flags: {json.dumps(module_flags, indent=2)}")
-
-    all_results['google'] = primary_results
-    all_results['google_pages'] = google_pages
-    save_raw_json(run_id, 'google', primary_results)
-
     # Update AIO log with audit fields
     aio_log["created_at"] = created_at
     aio_log["google_url"] = google_url
     aio_log["params_hash"] = params_hash
 
-    # --- 2. AI Overview Request (Conditional) ---
-    # Logic: Only call if 'ai_overview' exists AND has a 'page_token'
-    aio_data = primary_results.get("ai_overview")
+    first_page = primary_results
+
+    # The follow-ups write to separate keys, so they are fetched concurrently.
+    # The AI overview and Maps requests only need the first Google page and
+    # start while the remaining pages load; related questions wait for the merge.
+    def fetch_ai_overview():
+        # --- 2. AI Overview Request (Conditional) ---
+        # Logic: Only call if 'ai_overview' exists AND has a 'page_token'
+        aio_data = first_page.get("ai_overview")
+
+        if not aio_data:
+            aio_log["ai_overview_mode"] = "not_present"
+            logging.info("AIO absent in main SERP.")
+
+            if AI_FALLBACK_WITHOUT_LOCATION:
+                logging.info("  - Running AI fallback probe without location bias...")
+                fallback_params = {
+                    "engine": GOOGLE_ENGINE,
+                    "q": keyword,
+                    "hl": GOOGLE_HL,
+                    "gl": GOOGLE_GL,
+                    "device": GOOGLE_DEVICE,
+                    "num": 10,
+                    "api_key": API_KEY
+                }
+                _apply_no_cache(fallback_params)
+                fallback_results = _fetch_serp_api(fallback_params, cache_hits=cache_hits)
+                if fallback_results and fallback_results.get("ai_overview"):
+                    all_results["google_ai_overview_probe"] = fallback_results.get("ai_overview", {})
+                    aio_log["has_ai_overview"] = True
+                    aio_log["ai_overview_mode"] = "fallback_without_location"
+                    save_raw_json(run_id, 'google_ai_overview_probe', fallback_results)
+                else:
+                    logging.info("  - AI fallback probe also returned no ai_overview.")
+        else:
+            aio_log["has_ai_overview"] = True
+            page_token = aio_data.get("page_token")
+
+            if page_token:
+                aio_log["ai_overview_mode"] = "token_followup"
+                aio_log["page_token_received_at"] = datetime.now().isoformat()
+
+                # Construct params for AIO call
+                # Note: We do NOT send 'q' or 'location' again, just the token and engine.
+                aio_params = {
+                    "engine": "google_ai_overview",
+                    "page_token": page_token,
+                    "api_key": API_KEY
+                }
+                _apply_no_cache(aio_params)
+
+                aio_log["followup_started_at"] = datetime.now().isoformat()
+                start_ns = time.perf_counter_ns()
+
+                logging.info(f"  - Fetching AI Overview (token found)...")
+                aio_results = _fetch_serp_api(aio_params, cache_hits=cache_hits)
+
+                # Monotonic clock for the duration; wall-clock time only for the timestamp.
+                aio_log["followup_latency_ms"] = (time.perf_counter_ns() - start_ns) / 1e6
+
+                if aio_results:
+                    aio_log["ai_overview_mode"] = "token_followup_success"
+                    all_results['google_ai_overview'] = aio_results
+                    save_raw_json(run_id, 'google_ai_overview', aio_results)
+                else:
+                    aio_log["ai_overview_mode"] = "token_followup_failed"
+                    aio_log["error"] = "API call returned None"
+            else:
+                # AI Overview is present but fully contained in the main response (no token needed)
+                aio_log["ai_overview_mode"] = "direct_in_main"
+
+    def fetch_related_questions():
+        # --- 2b. Related Questions Follow-up (AI-overview type) ---
+        if RELATED_QUESTIONS_AI_FOLLOWUP and RELATED_QUESTIONS_AI_MAX_CALLS > 0:
+            related_pages = []
+            token_queue = []
+            seen_tokens = set()
+
+            for item in primary_results.get("related_questions", []) or []:
+                token = item.get("next_page_token")
+                if token:
+                    token_queue.append(token)
+
+            while token_queue and len(related_pages) < RELATED_QUESTIONS_AI_MAX_CALLS:
+                token = token_queue.pop(0)
+                if token in seen_tokens:
+                    continue
+                seen_tokens.add(token)
+
+                rq_params = {
+                    "engine": "google_related_questions",
+                    "next_page_token": token,
+                    "api_key": API_KEY
+                }
+                _apply_no_cache(rq_params)
+                rq_results = _fetch_serp_api(rq_params, cache_hits=cache_hits)
+                if not rq_results:
+                    continue
+
+                related_pages.append(rq_results)
+                for rq_item in rq_results.get("related_questions", []) or []:
+                    next_token = rq_item.get("next_page_token")
+                    if next_token and next_token not in seen_tokens:
+                        token_queue.append(next_token)
+
+                time.sleep(REQUEST_DELAY_SECONDS)
 
-    if not aio_data:
-        aio_log["ai_overview_mode"] = "not_present"
-        logging.info("AIO absent in main SERP.")
+            if related_pages:
+                all_results["google_related_questions"] = related_pages
+                aio_log["related_questions_ai_calls"] = len(related_pages)
+                save_raw_json(run_id, "google_related_questions", related_pages)
 
-        if AI_FALLBACK_WITHOUT_LOCATION:
-            logging.info("  - Running AI fallback probe without location bias...")
-            fallback_params = {
-                "engine": GOOGLE_ENGINE,
-                "q": keyword,
+    def fetch_maps():
+        # --- 3. Google Maps Request (Conditional) ---
+        # Logic: Call if 'local_results' are present OR if local intent is forced.
+        has_local_pack = "local_results" in first_page
+
+        if has_local_pack or FORCE_LOCAL_INTENT:
+            logging.info(
+                "  - Fetching Google Maps results (Local Pack detected or Forced)...")
+
+            maps_params = {
+                "engine": "google_maps",
+                "q": query_term,
+                "type": "search",
                 "hl": GOOGLE_HL,
                 "gl": GOOGLE_GL,
-                "device": GOOGLE_DEVICE,
-                "num": 10,
                 "api_key": API_KEY
             }
-            _apply_no_cache(fallback_params)
-            fallback_results = _fetch_serp_api(fallback_params)
-            if fallback_results and fallback_results.get("ai_overview"):
-                all_results["google_ai_overview_probe"] = fallback_results.get("ai_overview", {})
-                aio_log["has_ai_overview"] = True
-                aio_log["ai_overview_mode"] = "fallback_without_location"
-                save_raw_json(run_id, 'google_ai_overview_probe', fallback_results)
+            _apply_no_cache(maps_params)
+
+            # Attempt to extract 'll' (latitude, longitude) from metadata to pin location
+            # This ensures the maps view matches the SERP location context
+            meta = first_page.get("serpapi_search_metadata", {}) or first_page.get("search_metadata", {})
+            maps_url = meta.get("google_maps_url", "")
+            ll_match = _LL_PARAM_RE.search(maps_url)
+
+            if ll_match:
+                maps_params["ll"] = ll_match.group(1)
             else:
-                logging.info("  - AI fallback probe also returned no ai_overview.")
-    else:
-        aio_log["has_ai_overview"] = True
-        page_token = aio_data.get("page_token")
-
-        if page_token:
-            aio_log["ai_overview_mode"] = "token_followup"
-            aio_log["page_token_received_at"] = datetime.now().isoformat()
-
-            # Construct params for AIO call
-            # Note: We do NOT send 'q' or 'location' again, just the token and engine.
-            aio_params = {
-                "engine": "google_ai_overview",
-                "page_token": page_token,
-                "api_key": API_KEY
-            }
-            _apply_no_cache(aio_params)
+                # Fallback to string location if coordinates not found
+                maps_params["location"] = LOCATION
+                # Required when using location (zoom level)
+                maps_params["z"] = "14"
+
+            maps_results = _fetch_serp_api(maps_params, cache_hits=cache_hits)
+            if maps_results:
+                maps_pages = [maps_results]
+                seen_map_starts = set([0])
+                next_map_start = _parse_start_from_pagination(maps_results)
+
+                while next_map_start is not None and len(maps_pages) < MAPS_MAX_PAGES:
+                    if next_map_start in seen_map_starts:
+                        break
+                    seen_map_starts.add(next_map_start)
+                    maps_page_params = dict(maps_params)
+                    maps_page_params["start"] = next_map_start
+                    logging.info(f"  - Fetching Google Maps page start={next_map_start}...")
+                    maps_page = _fetch_serp_api(maps_page_params, cache_hits=cache_hits)
+                    if not maps_page:
+                        break
+                    maps_pages.append(maps_page)
+                    next_map_start = _parse_start_from_pagination(maps_page)
+                    time.sleep(REQUEST_DELAY_SECONDS)
+
+                merged_maps = _merge_maps_pages(maps_pages)
+                aio_log["maps_pages_fetched"] = len(maps_pages)
+                query_metadata["maps_pages_fetched"] = len(maps_pages)
+                all_results['google_maps'] = merged_maps
+                all_results['google_maps_pages'] = maps_pages
+                save_raw_json(run_id, 'google_maps', merged_maps)
+
+    with ThreadPoolExecutor(max_workers=FOLLOWUP_CONCURRENCY) as pool:
+        followups = [pool.submit(fetch_ai_overview), pool.submit(fetch_maps)]
+
+        # Fetch additional Google pages, then merge.
+        google_pages = [first_page]
+        seen_starts = set([0])
+        next_start = _parse_start_from_pagination(first_page)
+
+        while (
+            next_start is not None
+            and len(google_pages) < GOOGLE_MAX_PAGES
+            and len(_merge_google_pages(google_pages).get("organic_results", [])) < GOOGLE_MAX_RESULTS
+        ):
+            if next_start in seen_starts:
+                break
+            seen_starts.add(next_start)
+            page_params = dict(primary_params)
+            page_params["start"] = next_start
+            logging.info(f"  - Fetching Google page start={next_start}...")
+            page_results = _fetch_serp_api(page_params, cache_hits=cache_hits)
+            if not page_results:
+                break
+            google_pages.append(page_results)
+            next_start = _parse_start_from_pagination(page_results)
+            time.sleep(REQUEST_DELAY_SECONDS)
 
-            start_time = datetime.now()
-            aio_log["followup_started_at"] = start_time.isoformat()
+        primary_results = _merge_google_pages(google_pages)
+        aio_log["google_pages_fetched"] = len(google_pages)
+        query_metadata["google_pages_fetched"] = len(google_pages)
 
-            logging.info(f"  - Fetching AI Overview (token found)...")
-            aio_results = _fetch_serp_api(aio_params)
+        # Log top-level keys for debugging
+        logging.info("Main SERP Keys: %s", _SortedKeys(primary_results))
 
-            end_time = datetime.now()
-            aio_log["followup_latency_ms"] = (
-                end_time - start_time).total_seconds() * 1000
+        # Log module booleans for easier debugging
+        module_flags = {
+            "has_ai_overview": "ai_overview" in primary_results,
+            "has_local_results": "local_results" in primary_results,
+            "has_knowledge_panel": "knowledge_graph" in primary_results,
+            "has_ads": "ads" in primary_results,
+            "has_related_questions": "related_questions" in primary_results
+        }
+        logging.debug("Module Flags: %s", module_flags)
 
-            if aio_results:
-                aio_log["ai_overview_mode"] = "token_followup_success"
-                all_results['google_ai_overview'] = aio_results
-                save_raw_json(run_id, 'google_ai_overview', aio_results)
-            else:
-                aio_log["ai_overview_mode"] = "token_followup_failed"
-                aio_log["error"] = "API call returned None"
-        else:
-            # AI Overview is present but fully contained in the main response (no token needed)
-            aio_log["ai_overview_mode"] = "direct_in_main"
-
-    # --- 2b. Related Questions Follow-up (AI-overview type) ---
-    if RELATED_QUESTIONS_AI_FOLLOWUP and RELATED_QUESTIONS_AI_MAX_CALLS > 0:
-        related_pages = []
-        token_queue = []
-        seen_tokens = set()
-
-        for item in primary_results.get("related_questions", []) or []:
-            token = item.get("next_page_token")
-            if token:
-                token_queue.append(token)
-
-        while token_queue and len(related_pages) < RELATED_QUESTIONS_AI_MAX_CALLS:
-            token = token_queue.pop(0)
-            if token in seen_tokens:
-                continue
-            seen_tokens.add(token)
+        all_results['google'] = primary_results
+        all_results['google_pages'] = google_pages
+        save_raw_json(run_id, 'google', primary_results)
 
-            rq_params = {
-                "engine": "google_related_questions",
-                "next_page_token": token,
-                "api_key": API_KEY
-            }
-            _apply_no_cache(rq_params)
-            rq_results = _fetch_serp_api(rq_params)
-            if not rq_results:
-                continue
+        followups.append(pool.submit(fetch_related_questions))
+        for future in followups:
+            future.result()
 
-            related_pages.append(rq_results)
-            for rq_item in rq_results.get("related_questions", []) or []:
-                next_token = rq_item.get("next_page_token")
-                if next_token and next_token not in seen_tokens:
-                    token_queue.append(next_token)
+    aio_log["cached_calls"] = len(cache_hits)
+    return all_results, aio_log, query_metadata
 
-            time.sleep(REQUEST_DELAY_SECONDS)
 
-        if related_pages:
-            all_results["google_related_questions"] = related_pages
-            aio_log["related_questions_ai_calls"] = len(related_pages)
-            save_raw_json(run_id, "google_related_questions", related_pages)
+async def _fetch_serp_data_concurrently(keywords, run_id, max_concurrency):
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-    # --- 3. Google Maps Request (Conditional) ---
-    # Logic: Call if 'local_results' are present OR if local intent is forced.
-    has_local_pack = "local_results" in primary_results
+    async def fetch_one(keyword):
+        async with semaphore:
+            return await asyncio.to_thread(fetch_serp_data, keyword, run_id)
 
-    if has_local_pack or FORCE_LOCAL_INTENT:
-        logging.info(
-            "  - Fetching Google Maps results (Local Pack detected or Forced)...")
+    return await asyncio.gather(*(fetch_one(keyword) for keyword in keywords))
 
-        maps_params = {
-            "engine": "google_maps",
-            "q": query_term,
-            "type": "search",
-            "hl": GOOGLE_HL,
-            "gl": GOOGLE_GL,
-            "api_key": API_KEY
-        }
-        _apply_no_cache(maps_params)
 
-        # Attempt to extract 'll' (latitude, longitude) from metadata to pin location
-        # This ensures the maps view matches the SERP location context
-        meta = primary_results.get("serpapi_search_metadata", {}) or primary_results.get("search_metadata", {})
-        maps_url = meta.get("google_maps_url", "")
-        ll_match = re.search(r"[?&]ll=([0-9\.\-]+,[0-9\.\-]+)", maps_url)
+def fetch_all_serp_data(keywords, run_id, max_concurrency=None):
+    """
+    Runs fetch_serp_data for every keyword, up to *max_concurrency* at a time.
+    Results are returned in the same order as *keywords*.
+    """
+    return asyncio.run(_fetch_serp_data_concurrently(
+        keywords, run_id, max_concurrency or MAX_CONCURRENT_KEYWORDS))
 
-        if ll_match:
-            maps_params["ll"] = ll_match.group(1)
-        else:
-            # Fallback to string location if coordinates not found
-            maps_params["location"] = LOCATION
-            # Required when using location (zoom level)
-            maps_params["z"] = "14"
-
-        maps_results = _fetch_serp_api(maps_params)
-        if maps_results:
-            maps_pages = [maps_results]
-            seen_map_starts = set([0])
-            next_map_start = _parse_start_from_pagination(maps_results)
-
-            while next_map_start is not None and len(maps_pages) < MAPS_MAX_PAGES:
-                if next_map_start in seen_map_starts:
-                    break
-                seen_map_starts.add(next_map_start)
-                maps_page_params = dict(maps_params)
-                maps_page_params["start"] = next_map_start
-                logging.info(f"  - Fetching Google Maps page start={next_map_start}...")
-                maps_page = _fetch_serp_api(maps_page_params)
-                if not maps_page:
-                    break
-                maps_pages.append(maps_page)
-                next_map_start = _parse_start_from_pagination(maps_page)
-                time.sleep(REQUEST_DELAY_SECONDS)
 
-            merged_maps = _merge_maps_pages(maps_pages)
-            aio_log["maps_pages_fetched"] = len(maps_pages)
-            query_metadata["maps_pages_fetched"] = len(maps_pages)
-            all_results['google_maps'] = merged_maps
-            all_results['google_maps_pages'] = maps_pages
-            save_raw_json(run_id, 'google_maps', merged_maps)
+# SerpApi response keys recorded as SERP modules, in inferred page order.
+SERP_MODULE_KEYS = (
+    "top_ads", "ai_overview", "local_pack", "local_results", "related_questions", "organic_results",
+    "bottom_ads", "related_searches", "knowledge_graph", "inline_videos", "top_stories",
+    "image_pack", "shopping_results", "discussions_and_forums", "filters", "local_map",
+)
+SERP_MODULE_KEY_SET = frozenset(SERP_MODULE_KEYS)
+# Modules that also get a Rich_Features row: (feature name, unit counted in Details).
+RICH_FEATURE_COUNTS = {
+    "inline_videos": ("Video Carousel", "videos"),
+    "image_pack": ("Image Pack", "images"),
+    "top_stories": ("Top Stories", "stories"),
+    "shopping_results": ("Shopping Results", "results"),
+}
+# Response keys summarised in the Overview's SERP_Features column, in display order.
+SERP_FEATURE_LABELS = {
+    "inline_videos": "Video Carousel",
+    "knowledge_graph": "Knowledge Panel",
+    "answer_box": "Featured Snippet",
+    "local_results": "Local Map Pack",
+    "shopping_results": "Shopping",
+    "top_stories": "Top Stories",
+    "image_pack": "Image Pack",
+}
 
-    return all_results, aio_log, query_metadata
+# Bridge Strategy Triggers
+PAA_TRIGGER_MAP = {
+    "Commercial": ["cost", "price", "how much", "fees"],
+    "Distress": ["survive", "divorce", "infidelity", "leave", "separation"],
+    "Reactivity": ["narcissist", "toxic", "signs", "mean", "angry", "cut off", "hate"]
+}
+# One alternation per category, checked in map order so the first matching
+# category still wins when a question hits several.
+PAA_TRIGGER_RES = tuple(
+    (cat, re.compile("|".join(map(re.escape, triggers))))
+    for cat, triggers in PAA_TRIGGER_MAP.items()
+)
 
 
 def parse_data(keyword, results, query_metadata):
@@ -760,65 +1058,46 @@ def parse_data(keyword, results, query_metadata):
     # --- 0. SERP MODULES & RICH FEATURES ---
     serp_modules = []
     rich_features = []
-    module_keys = ["top_ads", "ai_overview", "local_pack", "local_results", "related_questions", "organic_results",
-                   "bottom_ads", "related_searches", "knowledge_graph", "inline_videos", "top_stories",
-                   "image_pack", "shopping_results", "discussions_and_forums", "filters", "local_map"]
-    for i, key in enumerate(module_keys):
-        if key in primary_results:
-            serp_modules.append({**common_fields, "Module": key,
-                                "Order": i+1, "Present": True, "Order_Source": "inferred"})
-            if key == "knowledge_graph":
-                if not primary_results[key].get("title"):
-                    parsing_warnings.append({**common_fields, "Module": "knowledge_graph",
-                                            "Field": "title", "Message": "Knowledge Graph title not found"})
-                rich_features.append({**common_fields,
-                                     "Feature": "Knowledge Panel", "Details": primary_results[key].get("title")})
-            if key == "inline_videos":
-                rich_features.append({**common_fields,
-                                     "Feature": "Video Carousel", "Details": f"{len(primary_results[key])} videos"})
-            if key == "image_pack":
-                rich_features.append({**common_fields,
-                                     "Feature": "Image Pack", "Details": f"{len(primary_results[key])} images"})
-            if key == "top_stories":
-                rich_features.append({**common_fields,
-                                     "Feature": "Top Stories", "Details": f"{len(primary_results[key])} stories"})
-            if key == "shopping_results":
-                rich_features.append({**common_fields,
-                                     "Feature": "Shopping Results", "Details": f"{len(primary_results[key])} results"})
-
-    # --- 1. OVERVIEW (Top Organic) ---
+    present_keys = primary_results.keys() & SERP_MODULE_KEY_SET
+    for i, key in enumerate(SERP_MODULE_KEYS):
+        if key not in present_keys:
+            continue
+        serp_modules.append(dict(common_fields, Module=key,
+                                 Order=i+1, Present=True, Order_Source="inferred"))
+        if key == "knowledge_graph":
+            if not primary_results[key].get("title"):
+                parsing_warnings.append(dict(common_fields, Module="knowledge_graph",
+                                             Field="title", Message="Knowledge Graph title not found"))
+            rich_features.append(dict(common_fields,
+                                      Feature="Knowledge Panel", Details=primary_results[key].get("title")))
+        elif key in RICH_FEATURE_COUNTS:
+            feature, unit = RICH_FEATURE_COUNTS[key]
+            rich_features.append(dict(common_fields,
+                                      Feature=feature, Details=f"{len(primary_results[key])} {unit}"))
+
+    # Hot subtrees bound once; absent modules become empty containers.
     organic = primary_results.get("organic_results") or []
+    answer_box = primary_results.get("answer_box") or {}
+    related_questions = primary_results.get("related_questions") or ()
+    ads = primary_results.get("ads") or ()
+    local_results = primary_results.get("local_results") or {}
 
-    metrics = {**common_fields,
-               "Search_Query_Used": primary_results.get("search_parameters", {}).get("q"),
-               "Total_Results": primary_results.get("search_information", {}).get("total_results"),
-               }
+    # --- 1. OVERVIEW (Top Organic) ---
+    metrics = dict(common_fields,
+                   Search_Query_Used=primary_results.get("search_parameters", {}).get("q"),
+                   Total_Results=primary_results.get("search_information", {}).get("total_results"),
+                   )
 
     # --- SERP TERRAIN ANALYSIS (What features exist?) ---
-    features = []
-    if "inline_videos" in primary_results:
-        features.append("Video Carousel")
-    if "knowledge_graph" in primary_results:
-        features.append("Knowledge Panel")
-    if "answer_box" in primary_results:
-        features.append("Featured Snippet")
-    if "local_results" in primary_results:
-        features.append("Local Map Pack")
-    if "shopping_results" in primary_results:
-        features.append("Shopping")
-    if "top_stories" in primary_results:
-        features.append("Top Stories")
-    if "image_pack" in primary_results:
-        features.append("Image Pack")
+    features = [label for key, label in SERP_FEATURE_LABELS.items() if key in primary_results]
 
     metrics["SERP_Features"] = ", ".join(
         features) if features else "Standard Organic"
 
     # --- FEATURED SNIPPET (Position 0) ---
-    answer_box = primary_results.get("answer_box", {})
     if not answer_box.get("title"):
-        parsing_warnings.append({**common_fields, "Module": "answer_box",
-                                "Field": "title", "Message": "Featured Snippet title not found"})
+        parsing_warnings.append(dict(common_fields, Module="answer_box",
+                                    Field="title", Message="Featured Snippet title not found"))
     metrics["Featured_Snippet_Title"] = answer_box.get("title", "N/A")
     metrics["Featured_Snippet_Link"] = answer_box.get("link", "N/A")
     metrics["Featured_Snippet_Snippet"] = answer_box.get("snippet", "N/A")
@@ -848,14 +1127,16 @@ def parse_data(keyword, results, query_metadata):
     ai_overview_text = ai_overview_data.get("snippet") or _extract_text_blocks_text(ai_overview_data)
 
     if not ai_overview_text:
-        parsing_warnings.append({**common_fields, "Module": "ai_overview",
-                                "Field": "snippet", "Message": "AI Overview snippet not found"})
-
-    metrics["AI_Overview"] = ai_overview_text or related_ai_text or "N/A"
-    metrics["AI_Reading_Level"] = calculate_reading_level(
-        metrics["AI_Overview"])
-    metrics["AI_Sentiment"] = calculate_sentiment(metrics["AI_Overview"])
-    metrics["AI_Subjectivity"] = calculate_subjectivity(metrics["AI_Overview"])
+        parsing_warnings.append(dict(common_fields, Module="ai_overview",
+                                    Field="snippet", Message="AI Overview snippet not found"))
+
+    ai_text = ai_overview_text or related_ai_text
+    metrics["AI_Overview"] = ai_text or "N/A"
+    if ai_text:
+        metrics["AI_Reading_Level"] = calculate_reading_level(ai_text)
+        metrics["AI_Sentiment"], metrics["AI_Subjectivity"] = calculate_sentiment_scores(ai_text)
+    else:
+        metrics["AI_Reading_Level"] = metrics["AI_Sentiment"] = metrics["AI_Subjectivity"] = "N/A"
 
     ai_citations = []
     citation_rows = ai_overview_data.get("citations") or ai_overview_data.get("references") or []
@@ -863,21 +1144,21 @@ def parse_data(keyword, results, query_metadata):
         if not isinstance(citation, dict):
             continue
         if not citation.get("link"):
-            parsing_warnings.append({**common_fields,
-                                     "Module": "ai_citations", "Field": "link", "Message": "Citation link not found"})
-        ai_citations.append({**common_fields,
-                             "Title": citation.get("title"),
-                             "Link": citation.get("link"),
-                             "Source": citation.get("source"),
-                             })
+            parsing_warnings.append(dict(common_fields,
+                                         Module="ai_citations", Field="link", Message="Citation link not found"))
+        ai_citations.append(dict(common_fields,
+                                 Title=citation.get("title"),
+                                 Link=citation.get("link"),
+                                 Source=citation.get("source"),
+                                 ))
 
     # Capture Top 3 Organic Results (as per Project Context)
     for i in range(3):
         rank = i + 1
         if i < len(organic):
             if not organic[i].get("title"):
-                parsing_warnings.append({**common_fields, "Module": "organic_results",
-                                        "Field": "title", "Message": f"Rank {rank} title not found"})
+                parsing_warnings.append(dict(common_fields, Module="organic_results",
+                                            Field="title", Message=f"Rank {rank} title not found"))
             # C. Source-of-truth row-level check
             metrics[f"Rank_{rank}_Title"] = organic[i].get("title", "N/A")
             metrics[f"Rank_{rank}_Link"] = organic[i].get("link", "N/A")
@@ -893,67 +1174,59 @@ def parse_data(keyword, results, query_metadata):
     # --- ALL ORGANIC RESULTS ---
     organic_list = []
     for item in organic:
-        organic_list.append({**common_fields,
-                             "Rank": item.get("position", "N/A"),
-                             "Title": item.get("title", "N/A"),
-                             "Link": item.get("link", "N/A"),
-                             "Snippet": item.get("snippet", "N/A"),
-                             "Source": item.get("source", "N/A"),
-                             "Content_Type": "N/A",
-                             "Entity_Type": "N/A",
-                             "Word_Count": "N/A",
-                             "Rank_Delta": "N/A"
-                             })
+        organic_list.append(dict(common_fields,
+                                 Rank=item.get("position", "N/A"),
+                                 Title=item.get("title", "N/A"),
+                                 Link=item.get("link", "N/A"),
+                                 Snippet=item.get("snippet", "N/A"),
+                                 Source=item.get("source", "N/A"),
+                                 Content_Type="N/A",
+                                 Entity_Type="N/A",
+                                 Word_Count="N/A",
+                                 Rank_Delta="N/A"
+                                 ))
 
     # --- 2. PAA INTELLIGENCE (Questions) ---
     paa_list = []
 
-    # Bridge Strategy Triggers
-    trigger_map = {
-        "Commercial": ["cost", "price", "how much", "fees"],
-        "Distress": ["survive", "divorce", "infidelity", "leave", "separation"],
-        "Reactivity": ["narcissist", "toxic", "signs", "mean", "angry", "cut off", "hate"]
-    }
-
     metrics["Has_PAA_AI_Overview"] = False
 
-    if "related_questions" in primary_results:
-        for i, item in enumerate(primary_results["related_questions"]):
-            if not item.get("question"):
-                parsing_warnings.append({**common_fields, "Module": "related_questions",
-                                        "Field": "question", "Message": "PAA question not found"})
-            question_text = item.get("question", "")
-            question_lower = question_text.lower() if question_text else ""
-
-            category = "General"
-            score = 1
-
-            if question_lower:
-                for cat, triggers in trigger_map.items():
-                    if any(t in question_lower for t in triggers):
-                        category = cat
-                        score = 10
-                        break
+    for i, item in enumerate(related_questions):
+        if not item.get("question"):
+            parsing_warnings.append(dict(common_fields, Module="related_questions",
+                                         Field="question", Message="PAA question not found"))
+        question_text = item.get("question", "")
+        question_lower = question_text.lower() if question_text else ""
+
+        category = "General"
+        score = 1
+
+        if question_lower:
+            for cat, trigger_re in PAA_TRIGGER_RES:
+                if trigger_re.search(question_lower):
+                    category = cat
+                    score = 10
+                    break
 
-            # Check for AI Overview in PAA
-            is_ai_paa = item.get("type") == "ai_overview"
-            if is_ai_paa:
-                metrics["Has_PAA_AI_Overview"] = True
-                # Flatten text blocks if present
-                if "text_blocks" in item:
-                    # Simple flattening of text blocks
-                    item["snippet"] = " ".join(
-                        [b.get("text", "") for b in item.get("text_blocks", [])])
-
-            paa_list.append({**common_fields,
-                             "Rank": i + 1,
-                             "Score": score,
-                             "Category": category,
-                             "Is_AI_Generated": is_ai_paa,
-                             "Question": question_text,
-                             "Snippet": item.get("snippet"),
-                             "Link": item.get("link")
-                             })
+        # Check for AI Overview in PAA
+        is_ai_paa = item.get("type") == "ai_overview"
+        if is_ai_paa:
+            metrics["Has_PAA_AI_Overview"] = True
+            # Flatten text blocks if present
+            if "text_blocks" in item:
+                # Simple flattening of text blocks
+                item["snippet"] = " ".join(
+                    [b.get("text", "") for b in item.get("text_blocks", [])])
+
+        paa_list.append(dict(common_fields,
+                             Rank=i + 1,
+                             Score=score,
+                             Category=category,
+                             Is_AI_Generated=is_ai_paa,
+                             Question=question_text,
+                             Snippet=item.get("snippet"),
+                             Link=item.get("link")
+                             ))
 
     if related_ai_items:
         metrics["Has_PAA_AI_Overview"] = True
@@ -962,149 +1235,446 @@ def parse_data(keyword, results, query_metadata):
             text_snippet = _extract_text_blocks_text(item)
             refs = item.get("references", [])
             first_ref = refs[0] if refs and isinstance(refs[0], dict) else {}
-            paa_list.append({**common_fields,
-                             "Rank": base_rank + idx,
-                             "Score": 10,
-                             "Category": "General",
-                             "Is_AI_Generated": True,
-                             "Question": item.get("question"),
-                             "Snippet": text_snippet,
-                             "Link": first_ref.get("link")
-                             })
+            paa_list.append(dict(common_fields,
+                                 Rank=base_rank + idx,
+                                 Score=10,
+                                 Category="General",
+                                 Is_AI_Generated=True,
+                                 Question=item.get("question"),
+                                 Snippet=text_snippet,
+                                 Link=first_ref.get("link")
+                                 ))
 
     # --- 3. STRATEGY EXPANSION (Related Searches & PASF) ---
     # This is the "Gold Mine" for new content ideas
     expansion_list = []
 
     # A. Standard "Related Searches" (Bottom of page)
-    if "related_searches" in primary_results:
-        for item in primary_results["related_searches"]:
-            expansion_list.append({**common_fields,
-                                   "Type": "Related Search",
-                                   "Term": item.get("query"),
-                                   "Link": item.get("link")
-                                   })
-
-    if "discussions_and_forums" in primary_results:
-        for item in primary_results["discussions_and_forums"]:
-            expansion_list.append({**common_fields,
-                                   "Type": "Discussion/Forum",
-                                   "Term": item.get("title"),
-                                   "Link": item.get("link")
-                                   })
-
-    if "filters" in primary_results:
-        for item in primary_results["filters"]:
-            expansion_list.append({**common_fields,
-                                   "Type": "SERP Filter",
-                                   "Term": item.get("name"),
-                                   "Link": item.get("link")
-                                   })
+    for item in primary_results.get("related_searches") or ():
+        expansion_list.append(dict(common_fields,
+                                   Type="Related Search",
+                                   Term=item.get("query"),
+                                   Link=item.get("link")
+                                   ))
+
+    for item in primary_results.get("discussions_and_forums") or ():
+        expansion_list.append(dict(common_fields,
+                                   Type="Discussion/Forum",
+                                   Term=item.get("title"),
+                                   Link=item.get("link")
+                                   ))
+
+    for item in primary_results.get("filters") or ():
+        expansion_list.append(dict(common_fields,
+                                   Type="SERP Filter",
+                                   Term=item.get("name"),
+                                   Link=item.get("link")
+                                   ))
 
     # B. "People Also Search For" (Often inside organic results)
-    if "inline_people_also_search_for" in primary_results:
-        for item in primary_results["inline_people_also_search_for"]:
-            expansion_list.append({**common_fields,
-                                   "Type": "PASF (Inline)",
-                                   "Term": item.get("title"),
-                                   "Link": item.get("link")
-                                   })
+    for item in primary_results.get("inline_people_also_search_for") or ():
+        expansion_list.append(dict(common_fields,
+                                   Type="PASF (Inline)",
+                                   Term=item.get("title"),
+                                   Link=item.get("link")
+                                   ))
 
     # C. "People Also Search For" (Knowledge Graph / Box)
-    if "people_also_search_for" in primary_results:
-        for item in primary_results["people_also_search_for"]:
-            expansion_list.append({**common_fields,
-                                   "Type": "PASF (Box)",
-                                   "Term": item.get("name") or item.get("title"),
-                                   "Link": item.get("link")
-                                   })
+    for item in primary_results.get("people_also_search_for") or ():
+        expansion_list.append(dict(common_fields,
+                                   Type="PASF (Box)",
+                                   Term=item.get("name") or item.get("title"),
+                                   Link=item.get("link")
+                                   ))
 
     # --- 4. COMPETITOR RECON (Ads & Maps) ---
     competitor_list = []
 
     # Ads
-    if "ads" in primary_results:
-        for ad in primary_results["ads"]:
-            if not ad.get("title"):
-                parsing_warnings.append({**common_fields,
-                                         "Module": "ads", "Field": "title", "Message": "Ad title not found"})
-            competitor_list.append({**common_fields,
-                                    "Type": "Paid Ad",
-                                    "Block_Position": "top" if ad.get("block_position") == "top" else "bottom",
-                                    "Name": ad.get("title"),
-                                    "Snippet": ad.get("description"),
-                                    "Position": ad.get("position"),
-                                    "Link": ad.get("link"),
-                                    "Sitelinks": json.dumps(ad.get("sitelinks")),
-                                    "Callouts": json.dumps(ad.get("callouts"))
-                                    })
+    for ad in ads:
+        if not ad.get("title"):
+            parsing_warnings.append(dict(common_fields,
+                                         Module="ads", Field="title", Message="Ad title not found"))
+        competitor_list.append(dict(common_fields,
+                                    Type="Paid Ad",
+                                    Block_Position="top" if ad.get("block_position") == "top" else "bottom",
+                                    Name=ad.get("title"),
+                                    Snippet=ad.get("description"),
+                                    Position=ad.get("position"),
+                                    Link=ad.get("link"),
+                                    Sitelinks=json.dumps(ad.get("sitelinks")),
+                                    Callouts=json.dumps(ad.get("callouts"))
+                                    ))
 
     # --- 5. LOCAL PACK & MAPS RESULTS ---
     all_local_pack = []
     # a) From the main SERP
-    if "local_results" in primary_results and "places" in primary_results["local_results"]:
-        for i, place in enumerate(primary_results["local_results"]["places"]):
+    if "places" in local_results:
+        for i, place in enumerate(local_results["places"]):
             if not place.get("title"):
-                parsing_warnings.append({**common_fields, "Module": "local_results",
-                                        "Field": "title", "Message": "Local Pack title not found"})
+                parsing_warnings.append(dict(common_fields, Module="local_results",
+                                            Field="title", Message="Local Pack title not found"))
             website = place.get("links", {}).get(
                 "website") or place.get("website")
-            all_local_pack.append({**common_fields,
-                                   "Source": "google_serp",
-                                   "Rank": i + 1,
-                                   "Name": place.get("title"),
-                                   "Category": place.get("type"),
-                                   "Rating": place.get("rating"),
-                                   "Reviews": place.get("reviews"),
-                                   "Address": place.get("address"),
-                                   "Phone": place.get("phone"),
-                                   "Website": website,
-                                   "Place_ID": place.get("place_id")
-                                   })
+            all_local_pack.append(dict(common_fields,
+                                       Source="google_serp",
+                                       Rank=i + 1,
+                                       Name=place.get("title"),
+                                       Category=place.get("type"),
+                                       Rating=place.get("rating"),
+                                       Reviews=place.get("reviews"),
+                                       Address=place.get("address"),
+                                       Phone=place.get("phone"),
+                                       Website=website,
+                                       Place_ID=place.get("place_id")
+                                       ))
 
     # b) From the dedicated maps results
     maps_results = results.get('google_maps', {})
     if "local_results" in maps_results:
         for i, place in enumerate(maps_results["local_results"]):
             if not place.get("title"):
-                parsing_warnings.append({**common_fields,
-                                         "Module": "google_maps", "Field": "title", "Message": "Maps title not found"})
-            all_local_pack.append({**common_fields,
-                                   "Source": "google_maps",
-                                   "Rank": i + 1,
-                                   "Name": place.get("title"),
-                                   "Category": place.get("type"),
-                                   "Rating": place.get("rating"),
-                                   "Reviews": place.get("reviews"),
-                                   "Address": place.get("address"),
-                                   "Phone": place.get("phone"),
-                                   "Website": place.get("website"),
-                                   "Place_ID": place.get("place_id")
-                                   })
+                parsing_warnings.append(dict(common_fields,
+                                             Module="google_maps", Field="title", Message="Maps title not found"))
+            all_local_pack.append(dict(common_fields,
+                                       Source="google_maps",
+                                       Rank=i + 1,
+                                       Name=place.get("title"),
+                                       Category=place.get("type"),
+                                       Rating=place.get("rating"),
+                                       Reviews=place.get("reviews"),
+                                       Address=place.get("address"),
+                                       Phone=place.get("phone"),
+                                       Website=place.get("website"),
+                                       Place_ID=place.get("place_id")
+                                       ))
 
     return metrics, organic_list, paa_list, expansion_list, competitor_list, all_local_pack, ai_citations, serp_modules, rich_features, parsing_warnings
 
 
+_NGRAM_CLEAN_RE = re.compile(r'[^\w\s]')
+
+
+def intern_row_strings(rows, pool=None):
+    """
+    Make repeated string values in *rows* share one object, in place.
+
+    Domains, keywords and module names repeat across thousands of rows; a
+    shared *pool* dict lets several row lists reuse the same strings.
+    Returns the pool.
+    """
+    if pool is None:
+        pool = {}
+    for row in rows:
+        for key, val in row.items():
+            if type(val) is str:
+                row[key] = pool.setdefault(val, val)
+    return pool
+
+
+# Output files are written through a 1 MiB buffer so the zip and gzip streams'
+# many small writes reach the OS in large chunks.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _sheet_columns(rows):
+    """Column names for a sheet: every key, in first-seen order (as pd.DataFrame would)."""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+# Exact types the writers take as-is; checked by type() before the isinstance
+# chain since nearly every scraped value is one of these.
+_VERBATIM_CELL_TYPES = frozenset({str, int, bool, type(None), datetime})
+
+
+def _excel_cell_value(val):
+    """Convert a row value the way pandas' Excel export does (missing -> blank)."""
+    val_type = type(val)
+    if val_type in _VERBATIM_CELL_TYPES:
+        return val
+    if isinstance(val, (float, np.floating)):
+        if math.isnan(val):
+            return None
+        if math.isinf(val):
+            return "inf" if val > 0 else "-inf"
+        return float(val)
+    if val is pd.NaT:
+        return None
+    if isinstance(val, (bool, np.bool_)):
+        return bool(val)
+    if isinstance(val, (int, np.integer)):
+        return int(val)
+    if isinstance(val, (str, datetime)):
+        return val
+    return str(val)
+
+
+def _row_cells(row, columns):
+    """
+    Cell values for *row* in *columns* order.
+
+    Rows built by parse_data share one key order per sheet, so when the keys
+    already match the header the values are taken in order instead of
+    looking up each column.
+    """
+    if list(row) == columns:
+        return [_excel_cell_value(val) for val in row.values()]
+    return [_excel_cell_value(row.get(col)) for col in columns]
+
+
+def _write_workbook_openpyxl(path, sheets):
+    """
+    Stream (sheet_name, rows) pairs into a write-only openpyxl workbook saved
+    to *path* (a filename or binary file object), with the column order,
+    blank missing values and bold header pandas' export would produce.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    if not openpyxl.LXML:
+        logging.warning("lxml is not installed; openpyxl write-only mode will not stream as efficiently.")
+
+    thin = Side(style="thin")
+    header_font = Font(bold=True)
+    header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_alignment = Alignment(horizontal="center", vertical="top")
+
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet_name, rows in sheets:
+        ws = wb.create_sheet(sheet_name)
+        columns = _sheet_columns(rows)
+        if not columns:
+            continue
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(ws, value=str(col))
+            cell.font = header_font
+            cell.border = header_border
+            cell.alignment = header_alignment
+            header.append(cell)
+        ws.append(header)
+        for row in rows:
+            ws.append(_row_cells(row, columns))
+    wb.save(path)
+
+
+def _write_workbook_xlsxwriter(path, sheets):
+    """
+    Stream (sheet_name, rows) pairs into an xlsxwriter workbook saved to
+    *path* (a filename or binary file object), row by row.
+
+    Rows are written in order, so constant_memory mode can flush each one to
+    disk as it goes. Scraped text is stored verbatim: no hyperlink conversion,
+    and a snippet starting with '=' is not a formula.
+    """
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "strings_to_urls": False,
+        "strings_to_formulas": False,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    header_format = wb.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    for sheet_name, rows in sheets:
+        ws = wb.add_worksheet(sheet_name)
+        columns = _sheet_columns(rows)
+        if not columns:
+            continue
+        ws.write_row(0, 0, [str(col) for col in columns], header_format)
+        for row_idx, row in enumerate(rows, start=1):
+            ws.write_row(row_idx, 0, _row_cells(row, columns))
+    wb.close()
+
+
+def write_jsonl_sidecar(path, rows):
+    """Write *rows* to *path* as gzipped JSON Lines, one object per row."""
+    with open(path, "wb") as raw, \
+            io.BufferedWriter(raw, buffer_size=_WRITE_BUFFER_SIZE) as buffered, \
+            gzip.GzipFile(fileobj=buffered, mode="wb", compresslevel=6) as f:
+        for row in rows:
+            f.write(_dumps_json(row))
+            f.write(b"\n")
+
+
+def _offload_large_sheets(path, sheets):
+    """
+    Replace sheets above EXCEL_SIDECAR_ROW_THRESHOLD, and the diagnostic
+    sheets in EXCEL_SIDECAR_SHEETS, with a pointer row, writing their rows to
+    '<workbook>.<sheet>.jsonl.gz' instead.
+    """
+    root = os.path.splitext(path)[0]
+    out = []
+    for sheet_name, rows in sheets:
+        if not rows:
+            # Empty sheets are written blank; no sidecar file for zero rows.
+            out.append((sheet_name, rows))
+            continue
+        if sheet_name in EXCEL_SIDECAR_SHEETS or len(rows) > EXCEL_SIDECAR_ROW_THRESHOLD:
+            sidecar_path = f"{root}.{sheet_name}.jsonl.gz"
+            write_jsonl_sidecar(sidecar_path, rows)
+            logging.info(f"Sheet {sheet_name}: {len(rows)} rows written to {sidecar_path}")
+            rows = [{"Sidecar_File": os.path.basename(sidecar_path), "Row_Count": len(rows)}]
+        out.append((sheet_name, rows))
+    return out
+
+
+# Workbook sheets in order, with the full_data key each one is written from.
+EXCEL_SHEETS = (
+    ("Overview", "overview"),
+    ("Organic_Results", "organic_results"),
+    ("PAA_Questions", "paa_questions"),
+    ("Related_Searches", "related_searches"),
+    ("Derived_Expansions", "derived_expansions"),
+    ("Competitors_Ads", "competitors_ads"),
+    ("SERP_Language_Patterns", "serp_language_patterns"),
+    ("Strategic_Recommendations", "strategic_recommendations"),
+    ("Local_Pack_and_Maps", "local_pack_and_maps"),
+    ("AI_Overview_Citations", "ai_overview_citations"),
+    ("SERP_Modules", "serp_modules"),
+    ("Rich_Features", "rich_features"),
+    ("Parsing_Warnings", "parsing_warnings"),
+    ("AIO_Logs", "aio_logs"),
+    ("Autocomplete_Suggestions", "autocomplete_suggestions"),
+    ("Help", "help_guide"),
+    ("Keyword_Feasibility", "keyword_feasibility"),
+)
+# Sheets left out of the workbook when they have no rows.
+OPTIONAL_EXCEL_SHEETS = frozenset({"Keyword_Feasibility"})
+
+
+def excel_sheets(full_data):
+    """(sheet_name, rows) pairs for the workbook, in EXCEL_SHEETS order."""
+    return [
+        (sheet_name, full_data.get(key, []))
+        for sheet_name, key in EXCEL_SHEETS
+        if full_data.get(key) or sheet_name not in OPTIONAL_EXCEL_SHEETS
+    ]
+
+
+def write_excel_workbook(path, sheets):
+    """
+    Write each (sheet_name, rows) pair to *path* as one worksheet, in order.
+
+    *rows* is a list of dicts. The workbook is built in '<path>.tmp' and
+    renamed over *path* only once it is complete, so a failed write (e.g.
+    the old file is open in Excel) leaves the previous workbook intact. With EXCEL_IN_MEMORY the workbook is assembled
+    in memory and written to disk in a single call.
+    """
+    sheets = _offload_large_sheets(path, sheets)
+    write_workbook = _write_workbook_xlsxwriter if XLSXWRITER_AVAILABLE else _write_workbook_openpyxl
+    tmp_path = f"{path}.tmp"
+    try:
+        if EXCEL_IN_MEMORY:
+            buf = io.BytesIO()
+            write_workbook(buf, sheets)
+        with open(tmp_path, "wb") as raw, io.BufferedWriter(raw, buffer_size=_WRITE_BUFFER_SIZE) as fh:
+            if EXCEL_IN_MEMORY:
+                # Through the buffered handle: a raw write may be short.
+                fh.write(buf.getbuffer())
+            else:
+                write_workbook(fh, sheets)
+            fh.flush()
+            os.fsync(raw.fileno())
+            if hasattr(os, "posix_fadvise"):
+                # Written once and not read back: drop it from the page cache.
+                os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        os.replace(tmp_path, path)
+    finally:
+        # Only left behind if the write or rename failed.
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def save_excel_workbook(path, sheets):
+    """
+    write_excel_workbook(path, sheets), logging write errors instead of raising
+    so the run still records its outputs in config.yml. Returns True if saved.
+    """
+    try:
+        write_excel_workbook(path, sheets)
+        print(f"SUCCESS! Data saved to {path}")
+        return True
+    except (OSError, FileCreateError) as e:
+        logging.error(f"Error saving Excel file (is it open?): {e}")
+    except ValueError as e:
+        # e.g. openpyxl's IllegalCharacterError for control characters in scraped text
+        logging.error(f"Error saving Excel file (unwritable cell value): {e}")
+    return False
+
+
+def save_run_outputs(full_data, run_id, json_path, xlsx_path, norm_dir="normalized"):
+    """
+    Save the JSON output and normalized audit trail, then the Excel workbook.
+
+    JSON goes first so an unexpected Excel writer error, which is logged and
+    re-raised, never costs the run its data. Returns True if the workbook saved.
+    """
+    print(f"Saving JSON to {json_path}...")
+    try:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(full_data, f, indent=2, ensure_ascii=False)
+
+        # Save normalized audit trail (per requirements)
+        os.makedirs(norm_dir, exist_ok=True)
+        norm_path = f"{norm_dir}/{run_id}.serp_norm.json"
+        with open(norm_path, 'w', encoding='utf-8') as f:
+            json.dump(full_data, f, indent=2, ensure_ascii=False)
+        print(f"Saved normalized audit to {norm_path}")
+    except Exception as e:
+        logging.error(f"Error saving JSON file: {e}")
+
+    print("Saving to Excel...")
+    try:
+        return save_excel_workbook(xlsx_path, excel_sheets(full_data))
+    except Exception:
+        logging.exception(f"Unexpected error saving Excel file; JSON output is in {json_path}")
+        raise
+
+
+def _ngram_words(text):
+    # Clean: lowercase, replace non-alphanumeric with space (prevents "highly-trained" -> "highlytrained")
+    text = _NGRAM_CLEAN_RE.sub(' ', text.lower())
+    return [w for w in text.split() if w not in STOP_WORDS and len(w) > 2]
+
+
 def get_ngrams(text, n):
     if not isinstance(text, str):
         return []
-    # Clean: lowercase, replace non-alphanumeric with space (prevents "highly-trained" -> "highlytrained")
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    words = [w for w in text.split() if w not in STOP_WORDS and len(w) > 2]
-    return [" ".join(words[i:i+n]) for i in range(len(words)-n+1)]
+    words = _ngram_words(text)
+    # Shifted views of the word list zipped together; no per-ngram slices.
+    return list(map(" ".join, zip(*(words[i:] for i in range(n)))))
+
+
+def count_ngrams(texts):
+    """
+    Returns (bigram_counts, trigram_counts) over *texts*.
+    Each text is tokenized once and both counters are fed straight from zip iterators.
+    """
+    bigram_counts = Counter()
+    trigram_counts = Counter()
+    for text in texts:
+        if not isinstance(text, str):
+            continue
+        words = _ngram_words(text)
+        bigram_counts.update(map(" ".join, zip(words, words[1:])))
+        trigram_counts.update(map(" ".join, zip(words, words[1:], words[2:])))
+    return bigram_counts, trigram_counts
+
+
+# Maps each byte to b"1" for a vowel and b"0" otherwise, so vowel groups can be
+# counted as b"01" transitions in C instead of a per-character Python loop.
+_SYLLABLE_TRANSLATE = bytes(0x31 if chr(i) in "aeiouy" else 0x30 for i in range(256))
 
 
 def count_syllables(word):
     word = word.lower()
-    count = 0
-    vowels = "aeiouy"
     if len(word) == 0:
         return 0
-    if word[0] in vowels:
-        count += 1
-    for index in range(1, len(word)):
-        if word[index] in vowels and word[index - 1] not in vowels:
-            count += 1
+    # Non-ASCII characters become '?' (one per character), i.e. consonants.
+    marks = word.encode("ascii", "replace").translate(_SYLLABLE_TRANSLATE)
+    count = (b"0" + marks).count(b"01")
     if word.endswith("e"):
         count -= 1
     if count == 0:
@@ -1112,40 +1682,199 @@ def count_syllables(word):
     return count
 
 
+# Byte lookup for the vectorized syllable count; non-ASCII characters are
+# encoded as '?' so they act as consonants, exactly as in count_syllables.
+_SYLLABLE_VOWELS = np.zeros(256, dtype=bool)
+_SYLLABLE_VOWELS[np.frombuffer(b"aeiouy", dtype=np.uint8)] = True
+_SPACE_BYTE = ord(" ")
+_E_BYTE = ord("e")
+
+
+def _syllable_kernel(buf, vowel_table):
+    """
+    Single-pass syllable total over space-joined lowercase ASCII bytes, with
+    count_syllables' per-word rules. Written for numba's nopython mode.
+    """
+    total = 0
+    word_syllables = 0
+    prev_vowel = False
+    prev = _SPACE_BYTE
+    for i in range(buf.size):
+        c = buf[i]
+        if c == _SPACE_BYTE:
+            if prev == _E_BYTE:
+                word_syllables -= 1
+            total += word_syllables if word_syllables > 0 else 1
+            word_syllables = 0
+            prev_vowel = False
+        else:
+            is_vowel = vowel_table[c]
+            if is_vowel and not prev_vowel:
+                word_syllables += 1
+            prev_vowel = is_vowel
+        prev = c
+    if buf.size:
+        if prev == _E_BYTE:
+            word_syllables -= 1
+        total += word_syllables if word_syllables > 0 else 1
+    return total
+
+
+if NUMBA_AVAILABLE:
+    _syllable_kernel = njit(cache=True)(_syllable_kernel)
+
+
+def count_syllables_total(words):
+    """Sum count_syllables over *words* in one pass over the joined text."""
+    if not words:
+        return 0
+    arr = np.frombuffer(
+        " ".join(words).lower().encode("ascii", "replace"), dtype=np.uint8)
+    if NUMBA_AVAILABLE:
+        return int(_syllable_kernel(arr, _SYLLABLE_VOWELS))
+    is_vowel = _SYLLABLE_VOWELS[arr]
+    group_starts = is_vowel.copy()
+    group_starts[1:] &= ~is_vowel[:-1]
+    spaces = np.flatnonzero(arr == _SPACE_BYTE)
+    word_starts = np.concatenate(([0], spaces + 1))
+    word_ends = np.append(spaces, arr.size)
+    per_word = np.add.reduceat(group_starts.astype(np.int64), word_starts)
+    per_word -= arr[word_ends - 1] == _E_BYTE
+    per_word[per_word == 0] = 1
+    return int(per_word.sum())
+
+
+_READING_CLEAN_RE = re.compile(r'[^\w\s.?!]')
+_SENTENCE_SPLIT_RE = re.compile(r'[.?!]+')
+
+# Byte classes for the fused reading-level kernel on ASCII text: characters
+# _READING_CLEAN_RE would strip, whitespace (as str.split sees it), sentence
+# terminators, and word characters split into consonants, vowels and 'e'.
+_RC_DROP, _RC_SPACE, _RC_TERM, _RC_CONSONANT, _RC_VOWEL, _RC_E = range(6)
+_READING_CLASSES = np.full(256, _RC_DROP, dtype=np.uint8)
+for _i in range(128):
+    _ch = chr(_i)
+    if _ch.isspace():
+        _READING_CLASSES[_i] = _RC_SPACE
+    elif _ch in ".?!":
+        _READING_CLASSES[_i] = _RC_TERM
+    elif _ch.lower() == "e":
+        _READING_CLASSES[_i] = _RC_E
+    elif _ch.lower() in "aiouy":
+        _READING_CLASSES[_i] = _RC_VOWEL
+    elif _ch.isalnum() or _ch == "_":
+        _READING_CLASSES[_i] = _RC_CONSONANT
+del _i, _ch
+
+
+def _reading_counts_kernel(buf, classes):
+    """
+    Returns (words, sentences, syllables) for ASCII bytes in one walk, with the
+    same results as cleaning, splitting and count_syllables_total in turn.
+    Written for numba's nopython mode.
+    """
+    words = 0
+    sentences = 0
+    syllables = 0
+    in_word = False
+    word_syllables = 0
+    prev_vowel = False
+    ends_in_e = False
+    sentence_open = False
+    for i in range(buf.size):
+        k = classes[buf[i]]
+        if k == _RC_DROP:
+            continue
+        if k == _RC_SPACE:
+            if in_word:
+                if ends_in_e:
+                    word_syllables -= 1
+                syllables += word_syllables if word_syllables > 0 else 1
+                in_word = False
+            continue
+        if not in_word:
+            in_word = True
+            words += 1
+            word_syllables = 0
+            prev_vowel = False
+        if k == _RC_TERM:
+            if sentence_open:
+                sentences += 1
+                sentence_open = False
+            is_vowel = False
+        else:
+            sentence_open = True
+            is_vowel = k >= _RC_VOWEL
+        if is_vowel and not prev_vowel:
+            word_syllables += 1
+        prev_vowel = is_vowel
+        ends_in_e = k == _RC_E
+    if in_word:
+        if ends_in_e:
+            word_syllables -= 1
+        syllables += word_syllables if word_syllables > 0 else 1
+    if sentence_open:
+        sentences += 1
+    return words, sentences, syllables
+
+
+if NUMBA_AVAILABLE:
+    _reading_counts_kernel = njit(cache=True)(_reading_counts_kernel)
+    # Compile (or load from cache) now so the first keyword does not pay for it.
+    _reading_counts_kernel(np.frombuffer(b"Warm up.", dtype=np.uint8), _READING_CLASSES)
+
+
+def _reading_counts(text):
+    """(words, sentences, syllables) for *text* via regex cleanup and tokenization."""
+    clean_text = _READING_CLEAN_RE.sub('', text)
+    num_sentences = sum(1 for s in _SENTENCE_SPLIT_RE.split(clean_text) if s.strip())
+    words = clean_text.split()
+    return len(words), num_sentences, count_syllables_total(words)
+
+
 def calculate_reading_level(text):
     if not text or not isinstance(text, str) or text == "N/A":
         return "N/A"
-    # Basic cleaning and tokenization
-    clean_text = re.sub(r'[^\w\s.?!]', '', text)
-    sentences = [s for s in re.split(r'[.?!]+', clean_text) if s.strip()]
-    words = clean_text.split()
-    if not sentences or not words:
+    # The compiled kernel covers ASCII text; Unicode \w and whitespace rules
+    # need the regex path.
+    if NUMBA_AVAILABLE and text.isascii():
+        num_words, num_sentences, num_syllables = _reading_counts_kernel(
+            np.frombuffer(text.encode("ascii"), dtype=np.uint8), _READING_CLASSES)
+    else:
+        num_words, num_sentences, num_syllables = _reading_counts(text)
+    if not num_sentences or not num_words:
         return "N/A"
-    num_syllables = sum(count_syllables(w) for w in words)
     # Flesch-Kincaid Grade Level Formula
-    score = 0.39 * (len(words) / len(sentences)) + 11.8 * \
-        (num_syllables / len(words)) - 15.59
+    score = 0.39 * (num_words / num_sentences) + 11.8 * \
+        (num_syllables / num_words) - 15.59
     return round(score, 1)
 
 
-def calculate_sentiment(text):
+@lru_cache(maxsize=4096)
+def _tb_sentiment(text):
+    """TextBlob sentiment for *text*, shared by the polarity and subjectivity helpers."""
+    from textblob import TextBlob
+    return TextBlob(text).sentiment
+
+
+def calculate_sentiment_scores(text):
+    """(polarity, subjectivity) for *text* from one TextBlob pass; "N/A" for each when unavailable."""
     if not TEXTBLOB_AVAILABLE or not text or not isinstance(text, str) or text == "N/A":
-        return "N/A"
+        return "N/A", "N/A"
     try:
-        # Returns a float between -1.0 (Negative) and 1.0 (Positive)
-        return round(TextBlob(text).sentiment.polarity, 2)
+        sentiment = _tb_sentiment(text)
     except Exception:
-        return "N/A"
+        return "N/A", "N/A"
+    # Polarity is -1.0 (Negative) to 1.0 (Positive); subjectivity 0.0 (Objective) to 1.0 (Subjective).
+    return round(sentiment.polarity, 2), round(sentiment.subjectivity, 2)
+
+
+def calculate_sentiment(text):
+    return calculate_sentiment_scores(text)[0]
 
 
 def calculate_subjectivity(text):
-    if not TEXTBLOB_AVAILABLE or not text or not isinstance(text, str) or text == "N/A":
-        return "N/A"
-    try:
-        # Returns a float between 0.0 (Objective) and 1.0 (Subjective)
-        return round(TextBlob(text).sentiment.subjectivity, 2)
-    except Exception:
-        return "N/A"
+    return calculate_sentiment_scores(text)[1]
 
 
 def _dataset_topic_profile(keywords):
@@ -1160,6 +1889,23 @@ def _dataset_topic_profile(keywords):
     }
 
 
+@lru_cache(maxsize=8)
+def _trigger_scanner(triggers):
+    """Regex finding every trigger in *triggers* (a tuple), overlaps included, longest first."""
+    ordered = sorted(set(triggers), key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+
+
+def _find_triggers(text, triggers):
+    """The set of *triggers* occurring in *text* as substrings, found in one regex pass."""
+    if not triggers:
+        return set()
+    hits = {m.group(1) for m in _trigger_scanner(triggers).finditer(text)}
+    # Only the longest trigger is captured at a position; shorter ones that are
+    # its prefix occur there too.
+    return hits | {t for t in triggers if any(h.startswith(t) for h in hits)}
+
+
 def analyze_strategic_opportunities(ngram_results, keywords=None):
     """
     Maps detected N-Gram patterns to Bowen Theory strategic recommendations.
@@ -1216,9 +1962,10 @@ def analyze_strategic_opportunities(ngram_results, keywords=None):
 
     # Flatten ngrams for searching
     all_phrases = " ".join([item["Phrase"] for item in ngram_results]).lower()
+    present = _find_triggers(all_phrases, tuple(t for item in strategies for t in item["Triggers"]))
 
     for strategy in strategies:
-        found_triggers = [t for t in strategy["Triggers"] if t in all_phrases]
+        found_triggers = [t for t in strategy["Triggers"] if t in present]
         if found_triggers:
             # Create a copy to avoid mutating the template if we were reusing it
             rec = strategy.copy()
@@ -1271,6 +2018,16 @@ def _autocomplete_query_variants(keyword):
     return deduped
 
 
+@lru_cache(maxsize=8)
+def _directional_city_res(city_lower):
+    """Compiled ' in north <city>' and ' north <city>' suffix patterns for *city_lower*."""
+    city = re.escape(city_lower)
+    return (
+        re.compile(rf"\s+in\s+(north|south|east|west)\s+{city}$", re.I),
+        re.compile(rf"\s+(north|south|east|west)\s+{city}$", re.I),
+    )
+
+
 def _ai_query_alternatives(base_keyword):
     """Generate two AI-likely informational alternatives for a base query."""
     q = (base_keyword or "").strip()
@@ -1283,14 +2040,9 @@ def _ai_query_alternatives(base_keyword):
     base_lower = base.lower()
 
     # Remove obvious local suffixes (often suppress AI overviews).
-    directional_city_pattern = rf"\s+in\s+(north|south|east|west)\s+{re.escape(city_lower)}$"
-    if re.search(directional_city_pattern, base_lower):
-        base = re.sub(directional_city_pattern, "", base, flags=re.I).strip()
-        base_lower = base.lower()
-    directional_city_pattern_2 = rf"\s+(north|south|east|west)\s+{re.escape(city_lower)}$"
-    if re.search(directional_city_pattern_2, base_lower):
-        base = re.sub(directional_city_pattern_2, "", base, flags=re.I).strip()
-        base_lower = base.lower()
+    for directional_city_re in _directional_city_res(city_lower):
+        base = directional_city_re.sub("", base).strip()
+    base_lower = base.lower()
 
     for suffix in (f" in {city_lower}", f" near {city_lower}", f" {city_lower}"):
         if base_lower.endswith(suffix):
@@ -1298,7 +2050,7 @@ def _ai_query_alternatives(base_keyword):
             base_lower = base.lower()
             break
 
-    base = re.sub(r"^(best|top)\s+", "", base, flags=re.I).strip()
+    base = _BEST_TOP_PREFIX_RE.sub("", base).strip()
     base_lower = base.lower()
     if not base:
         return []
@@ -1424,6 +2176,18 @@ def fetch_autocomplete(keyword):
     return out
 
 
+def fetch_all_autocomplete(keywords, max_concurrency=None):
+    """
+    Runs fetch_autocomplete for every keyword, up to *max_concurrency* at a time.
+    Results are returned in the same order as *keywords*.
+    """
+    if not keywords:
+        return []
+    workers = min(max_concurrency or MAX_CONCURRENT_KEYWORDS, len(keywords))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fetch_autocomplete, keywords))
+
+
 def build_help_rows():
     """Guidance rows for why specific sheets may be empty."""
     return [
@@ -1476,23 +2240,24 @@ def load_keywords(input_file):
 def main():
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     setup_logging(run_id)
+    log_optional_accelerators()
 
     if not SERPAPI_AVAILABLE:
         logging.error(
             "Missing dependency: google-search-results (serpapi client). Run: pip install -r requirements.txt"
         )
-        return
+        return 1
 
     if not API_KEY:
         logging.error(
             "SERPAPI_KEY environment variable not set. Please run: export SERPAPI_KEY='your_key'")
-        return
+        return 1
 
     print(f"--- STARTING RUN: {run_id} ---")
 
     keywords = load_keywords(INPUT_FILE)
     if keywords is None:
-        return
+        return 1
 
     query_jobs = expand_keywords_for_ai(keywords)
 
@@ -1554,6 +2319,11 @@ def main():
     print(f"--- FORCE LOCAL INTENT: {FORCE_LOCAL_INTENT} ---")
     print(f"--- BRIDGE STRATEGY: Mapping Symptoms -> Systems ---")
 
+    # SERP fetching is network-bound, so all queries are fetched up front in parallel.
+    print(f"--- Fetching SERP data ({MAX_CONCURRENT_KEYWORDS} queries at a time) ---")
+    fetched_serp_data = fetch_all_serp_data([job[0] for job in query_jobs], run_id)
+    fetched_autocomplete = fetch_all_autocomplete([job[0] for job in query_jobs])
+
     for i, (keyword, source_keyword, query_label) in enumerate(query_jobs):
         print(f"\n{'='*60}")
         print(
@@ -1561,8 +2331,7 @@ def main():
         )
         print(f"{'='*60}\n")
 
-        raw_data_dict, aio_log, query_metadata = fetch_serp_data(
-            keyword, run_id)
+        raw_data_dict, aio_log, query_metadata = fetched_serp_data[i]
         aio_log["Source_Keyword"] = source_keyword
         aio_log["Query_Label"] = query_label
         aio_log["Executed_Query"] = keyword
@@ -1667,7 +2436,8 @@ def main():
 
                                 # Classify
                                 c_type, c_conf, c_ev = content_classifier.classify(
-                                    url, soup, fetch_res.get('headers'))
+                                    url, soup, fetch_res.get('headers'),
+                                    raw_html=fetch_res.get('content'))
                                 e_type, e_conf, e_ev = entity_classifier.classify(
                                     domain, soup)
 
@@ -1767,7 +2537,7 @@ def main():
                                 print(f"  [Pivot queued] → {pivot_result['suggested_keyword']}")
 
         # --- AUTOCOMPLETE ---
-        ac_data = fetch_autocomplete(keyword)
+        ac_data = fetched_autocomplete[i]
         if ac_data and "suggestions" in ac_data:
             for idx, s in enumerate(ac_data["suggestions"]):
                 # Handle both dict and string formats
@@ -1790,8 +2560,6 @@ def main():
                     storage.save_autocomplete_suggestion(
                         run_id, source_keyword, val, idx + 1, rel, typ)
 
-        time.sleep(1.2)  # Polite delay
-
     # --- PIVOT KEYWORD FETCH PASS ---
     # Secondary SERP + Maps fetch for Low Feasibility keywords.
     # Maps is automatically included (FORCE_LOCAL_INTENT=true) so the local
@@ -1800,12 +2568,13 @@ def main():
         print(f"\n{'='*60}")
         print(f"Running {len(pending_pivot_jobs)} pivot keyword fetch(es)...")
         print(f"{'='*60}")
+    fetched_pivots = fetch_all_serp_data([job[0] for job in pending_pivot_jobs], run_id)
 
     for p_idx, (pivot_keyword, source_keyword, query_label) in enumerate(pending_pivot_jobs):
         print(f"\n[Pivot {p_idx+1}/{len(pending_pivot_jobs)}] '{pivot_keyword}' "
               f"(from '{source_keyword}')")
 
-        raw_pivot, aio_log_p, meta_p = fetch_serp_data(pivot_keyword, run_id)
+        raw_pivot, aio_log_p, meta_p = fetched_pivots[p_idx]
         if not raw_pivot:
             print(f"  [Pivot] No data returned for '{pivot_keyword}' — skipping.")
             continue
@@ -1882,8 +2651,6 @@ def main():
         print(f"  [Pivot result] {status_icon} {pivot_feas['feasibility_status']} "
               f"gap={pivot_feas['gap']} avg_da={pivot_feas['avg_serp_da']}")
 
-        time.sleep(1.2)
-
     # --- N-GRAM ANALYSIS (SERP Language Patterns) ---
     print("Running N-Gram Analysis (SERP Language Patterns)...")
 
@@ -1913,18 +2680,13 @@ def main():
         if a.get("Suggestion"):
             all_snippets.append(a["Suggestion"])
 
-    bigrams = []
-    trigrams = []
-
-    for s in all_snippets:
-        bigrams.extend(get_ngrams(s, 2))
-        trigrams.extend(get_ngrams(s, 3))
+    bigram_counts, trigram_counts = count_ngrams(all_snippets)
 
     ngram_results = []
-    for term, count in Counter(bigrams).most_common():
+    for term, count in bigram_counts.most_common():
         ngram_results.append(
             {"Type": "Bigram", "Phrase": term, "Count": count})
-    for term, count in Counter(trigrams).most_common():
+    for term, count in trigram_counts.most_common():
         ngram_results.append(
             {"Type": "Trigram", "Phrase": term, "Count": count})
 
@@ -1953,6 +2715,8 @@ def main():
     # --- VISUALIZATION (Word Cloud) ---
     if VISUALIZATION_AVAILABLE:
         print("Generating Word Cloud...")
+        from wordcloud import WordCloud
+        import matplotlib.pyplot as plt
         frequencies = {item["Phrase"]: item["Count"] for item in ngram_results}
 
         if frequencies:
@@ -1968,6 +2732,11 @@ def main():
         print("Skipping Word Cloud generation (libraries not installed).")
 
     # --- PREPARE DATA FOR JSON & EXCEL ---
+    string_pool = {}
+    for rows in (all_competitors, all_serp_modules, all_local_pack, all_ai_citations,
+                 all_organic, all_paa, all_rich_features, all_autocomplete):
+        intern_row_strings(rows, string_pool)
+
     # Split Strategy_Expansion into Related_Searches and Derived_Expansions
     related_searches_data = [
         x for x in all_expansion if x.get("Type") == "Related Search"]
@@ -1995,63 +2764,7 @@ def main():
         "keyword_feasibility": all_feasibility,
     }
 
-    print(f"Saving JSON to {OUTPUT_JSON}...")
-    try:
-        with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-            json.dump(full_data, f, indent=2, ensure_ascii=False)
-
-        # Save normalized audit trail (per requirements)
-        norm_dir = "normalized"
-        os.makedirs(norm_dir, exist_ok=True)
-        norm_path = f"{norm_dir}/{run_id}.serp_norm.json"
-        with open(norm_path, 'w', encoding='utf-8') as f:
-            json.dump(full_data, f, indent=2, ensure_ascii=False)
-        print(f"Saved normalized audit to {norm_path}")
-    except Exception as e:
-        logging.error(f"Error saving JSON file: {e}")
-
-    print("Saving to Excel...")
-    try:
-        with pd.ExcelWriter(OUTPUT_FILE, engine='openpyxl') as writer:
-            pd.DataFrame(all_metrics).to_excel(
-                writer, sheet_name="Overview", index=False)
-            pd.DataFrame(all_organic).to_excel(
-                writer, sheet_name="Organic_Results", index=False)
-            pd.DataFrame(all_paa).to_excel(
-                writer, sheet_name="PAA_Questions", index=False)
-            pd.DataFrame(related_searches_data).to_excel(
-                writer, sheet_name="Related_Searches", index=False)
-            pd.DataFrame(derived_expansions_data).to_excel(
-                writer, sheet_name="Derived_Expansions", index=False)
-            pd.DataFrame(all_competitors).to_excel(
-                writer, sheet_name="Competitors_Ads", index=False)
-            pd.DataFrame(ngram_results).to_excel(
-                writer, sheet_name="SERP_Language_Patterns", index=False)
-            pd.DataFrame(strategic_recs).to_excel(
-                writer, sheet_name="Strategic_Recommendations", index=False)
-            pd.DataFrame(all_local_pack).to_excel(
-                writer, sheet_name="Local_Pack_and_Maps", index=False)
-            pd.DataFrame(all_ai_citations).to_excel(
-                writer, sheet_name="AI_Overview_Citations", index=False)
-            pd.DataFrame(all_serp_modules).to_excel(
-                writer, sheet_name="SERP_Modules", index=False)
-            pd.DataFrame(all_rich_features).to_excel(
-                writer, sheet_name="Rich_Features", index=False)
-            pd.DataFrame(all_parsing_warnings).to_excel(
-                writer, sheet_name="Parsing_Warnings", index=False)
-            pd.DataFrame(all_aio_logs).to_excel(
-                writer, sheet_name="AIO_Logs", index=False)
-            pd.DataFrame(all_autocomplete).to_excel(
-                writer, sheet_name="Autocomplete_Suggestions", index=False)
-            pd.DataFrame(help_rows).to_excel(
-                writer, sheet_name="Help", index=False)
-            if all_feasibility:
-                pd.DataFrame(all_feasibility).to_excel(
-                    writer, sheet_name="Keyword_Feasibility", index=False)
-
-        print(f"SUCCESS! Data saved to {OUTPUT_FILE}")
-    except Exception as e:
-        logging.error(f"Error saving Excel file (is it open?): {e}")
+    save_run_outputs(full_data, run_id, OUTPUT_JSON, OUTPUT_FILE)
 
     print("Generating Markdown Report...")
     try:
@@ -2099,5 +2812,10 @@ def main():
         logging.warning(f"Could not update config.yml output paths: {_e}")
 
 
+def run() -> int:
+    """Run the audit in-process (used by run_pipeline.py); returns 1 if it could not start."""
+    return main() or 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(run())
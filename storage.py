@@ -108,6 +108,11 @@ class SerpStorage:
             FOREIGN KEY(run_id) REFERENCES runs(run_id)
         )''')
 
+        # Cover the previous-run lookup and run-vs-run rank comparisons in metrics.py.
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_runs_date ON runs(run_date)''')
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_serp_run_type
+                     ON serp_results(run_id, result_type, keyword_text, url)''')
+
         # --- Migrations: add Moz DA/PA columns to url_features if absent ---
         for col, col_type in [("competitor_da", "INTEGER"), ("page_authority", "INTEGER")]:
             try:
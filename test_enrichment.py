@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from bs4 import BeautifulSoup
 from classifiers import ContentClassifier, EntityClassifier
@@ -66,6 +68,35 @@ class TestClassifiers(unittest.TestCase):
         self.assertEqual(c_type, "guide")
         self.assertIn("high_word_count", ev)
 
+    def test_content_guide_word_count_splits_on_any_whitespace(self):
+        """Newline/tab-separated words count like get_text().split() around the 1500 threshold."""
+        # 4 words per repeat: 400 repeats is 1600 words, 370 is 1480.
+        cases = {400: ("guide", ["high_word_count"]), 370: ("other", ["fallback"])}
+        for repeats, (expected, evidence) in cases.items():
+            with self.subTest(repeats=repeats):
+                text = "word\nword\tword  word " * repeats
+                soup = BeautifulSoup(f"<html><body><pre>{text}</pre></body></html>", "html.parser")
+                c_type, _, ev = self.content_classifier.classify(
+                    "http://example.com/article", soup, {})
+                self.assertEqual((c_type, ev), (expected, evidence))
+
+    def test_content_news_from_raw_html(self):
+        """Test article meta in the raw HTML head short-circuits to news."""
+        html = (
+            "<html><head><title>Family update</title>"
+            "<meta content='2026-01-01' property='article:published_time'></head>"
+            "<body><p>Contact us about pricing.</p></body></html>"
+        )
+        soup = BeautifulSoup(html, "html.parser")
+        c_type, conf, ev = self.content_classifier.classify(
+            "http://example.com/news", soup, {}, raw_html=html.encode())
+        self.assertEqual(c_type, "news")
+        self.assertIn("meta_article_published", ev)
+
+        # Without raw HTML the tree walk finds the same meta tag.
+        self.assertEqual(
+            self.content_classifier.classify("http://example.com/news", soup, {})[0], "news")
+
     def test_entity_government(self):
         """Test Government entity detection via TLD."""
         c_type, conf, ev = self.entity_classifier.classify(
@@ -92,6 +123,12 @@ class TestClassifiers(unittest.TestCase):
         self.assertEqual(c_type, "directory")
         self.assertIn("known_directory_domain", ev)
 
+        # Regional variants of a known directory match too.
+        c_type, conf, ev = self.entity_classifier.classify(
+            "www.psychologytoday.com.au", None)
+        self.assertEqual(c_type, "directory")
+        self.assertIn("known_directory_domain", ev)
+
     def test_entity_unknown_fallback(self):
         """Test fallback to unclassified when no strong domain signal exists."""
         c_type, conf, ev = self.entity_classifier.classify(
@@ -118,6 +155,21 @@ class TestClassifiers(unittest.TestCase):
         self.assertEqual(c_type, "legal")
         self.assertIn("domain_legal_pattern", ev)
 
+    def test_entity_overrides_cached_until_file_changes(self):
+        """Test override parsing is reused across instances and refreshed on edit."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "overrides.yml")
+            with open(path, "w") as f:
+                f.write("example.com: legal\n")
+            first = EntityClassifier(override_file=path)
+            second = EntityClassifier(override_file=path)
+            self.assertIs(first.overrides, second.overrides)
+
+            with open(path, "w") as f:
+                f.write("example.com: counselling\nother.com: media\n")
+            third = EntityClassifier(override_file=path)
+            self.assertEqual(third.classify("example.com", None)[0], "counselling")
+
 
 if __name__ == '__main__':
     unittest.main()
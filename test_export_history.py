@@ -0,0 +1,79 @@
+import csv
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import export_history
+
+
+class TestExportHistory(unittest.TestCase):
+    def _seed_db(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE runs (run_id TEXT PRIMARY KEY, run_date TEXT, params_hash TEXT)")
+            conn.execute("CREATE TABLE keywords (id INTEGER PRIMARY KEY, keyword_text TEXT)")
+            conn.execute(
+                "CREATE TABLE serp_results (id INTEGER PRIMARY KEY, run_id TEXT, keyword_text TEXT, "
+                "rank INTEGER, url TEXT, snippet TEXT)"
+            )
+            conn.execute("CREATE TABLE url_features (url TEXT PRIMARY KEY, content_type TEXT)")
+            conn.execute("CREATE TABLE domain_features (domain TEXT PRIMARY KEY, entity_type TEXT)")
+            conn.execute("INSERT INTO runs VALUES ('run_1', '2026-02-01T00:00:00', 'abc')")
+            conn.execute("INSERT INTO keywords VALUES (1, 'couples therapy')")
+            conn.executemany(
+                "INSERT INTO serp_results (run_id, keyword_text, rank, url, snippet) VALUES (?, ?, ?, ?, ?)",
+                [("run_1", "couples therapy", rank, f"https://example.com/{rank}",
+                  'Quotes "here", commas, and\na newline' if rank == 1 else None)
+                 for rank in range(1, 26)],
+            )
+            conn.execute("INSERT INTO domain_features VALUES ('example.com', 'counselling')")
+
+    def _read_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_exports_one_csv_per_non_empty_table(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "serp.db")
+            export_dir = os.path.join(tmp, "exports")
+            self._seed_db(db_path)
+
+            # Chunks smaller than the table exercise the fetchmany loop.
+            with patch.object(export_history, "DB_PATH", db_path), \
+                    patch.object(export_history, "EXPORT_DIR", export_dir), \
+                    patch.object(export_history, "CHUNK_SIZE", 10), \
+                    patch("builtins.print") as mock_print:
+                export_history.export_tables()
+
+            self.assertEqual(
+                sorted(os.listdir(export_dir)),
+                ["domain_features.csv", "keywords.csv", "runs.csv", "serp_results.csv"],
+            )
+            printed = [call.args[0] for call in mock_print.call_args_list]
+            self.assertIn("  - url_features: [Empty]", printed)
+
+            self.assertEqual(
+                self._read_csv(os.path.join(export_dir, "runs.csv")),
+                [["run_id", "run_date", "params_hash"], ["run_1", "2026-02-01T00:00:00", "abc"]],
+            )
+            results = self._read_csv(os.path.join(export_dir, "serp_results.csv"))
+            self.assertEqual(results[0], ["id", "run_id", "keyword_text", "rank", "url", "snippet"])
+            self.assertEqual(len(results), 26)
+            self.assertEqual(results[1], ["1", "run_1", "couples therapy", "1", "https://example.com/1",
+                                          'Quotes "here", commas, and\na newline'])
+            self.assertEqual(results[25][3:5], ["25", "https://example.com/25"])
+            self.assertEqual(results[2][5], "")
+
+    def test_missing_database_exports_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = os.path.join(tmp, "exports")
+            with patch.object(export_history, "DB_PATH", os.path.join(tmp, "missing.db")), \
+                    patch.object(export_history, "EXPORT_DIR", export_dir), \
+                    patch("builtins.print"):
+                export_history.export_tables()
+            self.assertFalse(os.path.exists(export_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import json
+import math
+import unittest
+from unittest.mock import patch
+
+import json_utils
+
+
+class TestLoadsJson(unittest.TestCase):
+    def test_parses_bytes_and_str(self):
+        self.assertEqual(json_utils.loads_json(b'{"a": [1, "caf\\u00e9"]}'), {"a": [1, "café"]})
+        self.assertEqual(json_utils.loads_json('{"a": null}'), {"a": None})
+
+    def test_accepts_nan_written_by_json_dump(self):
+        data = json_utils.loads_json(json.dumps({"score": float("nan")}).encode())
+        self.assertTrue(math.isnan(data["score"]))
+
+    def test_stdlib_path_without_orjson(self):
+        with patch.object(json_utils, "ORJSON_AVAILABLE", False):
+            self.assertEqual(json_utils.loads_json(b'[1, 2]'), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -69,6 +69,41 @@ class TestMetrics(unittest.TestCase):
         self.assertEqual(deltas[("kw_b", "https://example.com/shared")], -4)
         self.assertEqual(len(deltas), 2)
 
+    def test_get_volatility_metrics_orders_winners_and_losers(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "test.db")
+            self._seed_db(db_path)
+
+            with patch.object(metrics, "DB_PATH", db_path):
+                result = metrics.get_volatility_metrics("run_curr")
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual([(m["keyword_text"], m["rank_delta"]) for m in result["winners"]], [("kw_a", 5)])
+        self.assertEqual([(m["keyword_text"], m["rank_delta"]) for m in result["losers"]], [("kw_b", -4)])
+        self.assertEqual(result["volatility_score"], 4.5)
+
+    def test_get_volatility_metrics_insufficient_history_messages(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "test.db")
+            self._seed_db(db_path)
+            with patch.object(metrics, "DB_PATH", db_path):
+                # The earliest of two runs has no prior run.
+                self.assertEqual(metrics.get_volatility_metrics("run_prev"),
+                                 {"status": "insufficient_history", "msg": "No prior run found."})
+                self.assertIsNone(metrics.get_volatility_metrics("run_missing"))
+
+                with sqlite3.connect(db_path) as conn:
+                    conn.execute("DELETE FROM runs WHERE run_id = 'run_prev'")
+                self.assertEqual(
+                    metrics.get_volatility_metrics("run_curr"),
+                    {"status": "insufficient_history", "msg": "Need at least 2 runs to calculate volatility."},
+                )
+            metrics.close_conn()
+
+    def test_fetch_movers_rejects_unknown_sort_direction(self):
+        with self.assertRaises(ValueError):
+            metrics._fetch_movers(None, "rank_delta > 0", "DESC; DROP TABLE runs", ())
+
     def test_get_volatility_metrics_warns_on_keyword_mismatch(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             db_path = os.path.join(tmp_dir, "test.db")
@@ -112,6 +147,59 @@ class TestMetrics(unittest.TestCase):
         self.assertEqual(result["status"], "success")
         self.assertIn("non-identical keyword sets", result["comparability_warning"])
 
+    def test_get_entity_dominance_ignores_unclassified_rows(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "test.db")
+            self._seed_db(db_path)
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("CREATE TABLE domain_features (domain TEXT PRIMARY KEY, entity_type TEXT)")
+                conn.execute("CREATE TABLE url_features (url TEXT PRIMARY KEY, content_type TEXT)")
+                conn.execute("INSERT INTO domain_features VALUES ('example.com', 'counselling')")
+                conn.execute(
+                    """
+                    INSERT INTO serp_results
+                    (run_id, keyword_text, result_type, rank, title, url, domain, snippet, features_json)
+                    VALUES ('run_curr', 'kw_c', 'organic', 3, '', 'https://other.org/', 'other.org', '', '{}')
+                    """
+                )
+
+            with patch.object(metrics, "DB_PATH", db_path):
+                dominance = metrics.get_entity_dominance("run_curr")
+
+        self.assertEqual(dominance["entity_dominance"], {"counselling": 100.0})
+        self.assertEqual(dominance["content_dominance"], {})
+
+    def test_connection_shared_until_db_path_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_a = os.path.join(tmp_dir, "a.db")
+            db_b = os.path.join(tmp_dir, "b.db")
+            self._seed_db(db_a)
+            self._seed_db(db_b)
+
+            with patch.object(metrics, "DB_PATH", db_a):
+                first = metrics._get_conn()
+                metrics.get_rank_deltas("run_curr")
+                self.assertIs(metrics._get_conn(), first)
+            with patch.object(metrics, "DB_PATH", db_b):
+                self.assertIsNot(metrics._get_conn(), first)
+            metrics.close_conn()
+            self.assertIsNone(metrics._CONN)
+
+            # Reading metrics must not switch the file out of its journal mode.
+            with sqlite3.connect(db_a) as conn:
+                self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+
+    def test_queries_from_several_threads_share_the_connection_safely(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "test.db")
+            self._seed_db(db_path)
+            with patch.object(metrics, "DB_PATH", db_path):
+                with ThreadPoolExecutor(max_workers=8) as ex:
+                    results = list(ex.map(lambda _: metrics.get_volatility_metrics("run_curr"), range(32)))
+                metrics.close_conn()
+        self.assertTrue(all(r["status"] == "success" and r["total_compared"] == 2 for r in results))
+
 
 if __name__ == "__main__":
     unittest.main()
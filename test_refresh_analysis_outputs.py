@@ -2,6 +2,7 @@ import json
 import os
 import tempfile
 import unittest
+import unittest.mock
 
 import openpyxl
 import yaml
@@ -62,6 +63,30 @@ class TestRefreshAnalysisOutputs(unittest.TestCase):
             wb_check = openpyxl.load_workbook(xlsx_path)
             self.assertEqual(wb_check["Organic_Results"]["C2"].value, "legal")
 
+    def test_refresh_xlsx_leaves_unchanged_workbook_untouched(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            xlsx_path = os.path.join(tmpdir, "market_analysis_v2.xlsx")
+            overrides_path = os.path.join(tmpdir, "domain_overrides.yml")
+            wb = openpyxl.Workbook()
+            ws = wb.active
+            ws.title = "Organic_Results"
+            ws.append(["Link", "Source", "Entity_Type"])
+            ws.append(["https://example.com/a", "example.com", "legal"])
+            ws.append(["https://example.com/b", "example.com", "legal"])
+            wb.save(xlsx_path)
+            with open(overrides_path, "w", encoding="utf-8") as f:
+                yaml.safe_dump({"example.com": "legal"}, f)
+            before = os.path.getmtime(xlsx_path)
+            os.utime(xlsx_path, (before - 60, before - 60))
+
+            classifier = rao.EntityClassifier(override_file=overrides_path)
+            with unittest.mock.patch.object(classifier, "classify", wraps=classifier.classify) as classify:
+                updated, changed = rao.refresh_xlsx(xlsx_path, classifier)
+
+            self.assertEqual((updated, changed), (2, 0))
+            self.assertEqual(classify.call_count, 1)
+            self.assertEqual(os.path.getmtime(xlsx_path), before - 60)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+import logging
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import run_pipeline
+
+
+class TestRunStep(unittest.TestCase):
+    def _run(self, func):
+        """Run *func* through run_step; return the exit code (0 if it did not exit)."""
+        try:
+            run_pipeline.run_step(func, "Test Step")
+        except SystemExit as e:
+            return e.code
+        return 0
+
+    def test_zero_and_none_returns_continue(self):
+        self.assertEqual(self._run(lambda: 0), 0)
+        self.assertEqual(self._run(lambda: None), 0)
+
+    def test_nonzero_return_exits_with_that_code(self):
+        self.assertEqual(self._run(lambda: 3), 3)
+
+    def test_system_exit_codes(self):
+        def exit_with(code):
+            def step():
+                raise SystemExit(code)
+            return step
+
+        self.assertEqual(self._run(exit_with(2)), 2)
+        self.assertEqual(self._run(exit_with(0)), 0)
+        self.assertEqual(self._run(exit_with(None)), 0)
+        self.assertEqual(self._run(exit_with("fatal: bad input")), 1)
+
+    def test_raised_exception_exits_with_one(self):
+        def step():
+            raise RuntimeError("boom")
+
+        with unittest.mock.patch("traceback.print_exc"):
+            self.assertEqual(self._run(step), 1)
+
+    def test_root_handlers_added_by_a_step_are_removed(self):
+        root = logging.getLogger()
+        before = root.handlers[:]
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "step.log")
+
+            def step():
+                root.addHandler(logging.FileHandler(log_path))
+                return 0
+
+            self.assertEqual(self._run(step), 0)
+            self.assertEqual(root.handlers, before)
+
+
+class TestSerpAuditRun(unittest.TestCase):
+    def test_run_returns_nonzero_when_audit_cannot_start(self):
+        serp_audit = run_pipeline.serp_audit
+        with unittest.mock.patch.object(serp_audit, "setup_logging"), \
+                unittest.mock.patch.object(serp_audit, "SERPAPI_AVAILABLE", True), \
+                unittest.mock.patch.object(serp_audit, "API_KEY", None), \
+                self.assertLogs(level="ERROR"):
+            self.assertEqual(serp_audit.run(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
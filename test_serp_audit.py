@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import serp_audit
 import json
+import logging
 import os
 from classifiers import EntityClassifier
 
@@ -81,6 +82,373 @@ class TestSerpAudit(unittest.TestCase):
         self.assertEqual(serp_audit.get_ngrams(None, 2), [])
         self.assertEqual(serp_audit.get_ngrams("", 2), [])
 
+    def test_count_ngrams_matches_get_ngrams(self):
+        """Fused counting should match per-text get_ngrams, including tie order."""
+        from collections import Counter
+        texts = [
+            "Family therapy cost in Vancouver: family therapy sessions",
+            "highly-trained family therapy experts",
+            None,
+            "",
+        ]
+        bigrams, trigrams = serp_audit.count_ngrams(texts)
+        expected_bi = Counter(g for t in texts for g in serp_audit.get_ngrams(t, 2))
+        expected_tri = Counter(g for t in texts for g in serp_audit.get_ngrams(t, 3))
+        self.assertEqual(bigrams.most_common(), expected_bi.most_common())
+        self.assertEqual(trigrams.most_common(), expected_tri.most_common())
+
+    def test_find_triggers_matches_substring_checks(self):
+        import random
+        triggers = ("mean", "meaning", "ear", "clinical", "deal with", "reach out", "a")
+        alphabet = "meaningclr hwitdoa"
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(serp_audit._find_triggers(text, triggers),
+                             {t for t in triggers if t in text}, text)
+        self.assertEqual(serp_audit._find_triggers("anything", ()), set())
+
+    def test_count_syllables_known_words(self):
+        cases = {"": 0, "e": 1, "the": 1, "queue": 1, "rhythm": 1, "café": 1,
+                 "naïve": 1, "counselling": 3, "relationship": 4, "EE": 1}
+        for word, expected in cases.items():
+            with self.subTest(word=word):
+                self.assertEqual(serp_audit.count_syllables(word), expected)
+
+    def test_count_syllables_total_matches_per_word(self):
+        """Vectorized syllable count should match count_syllables word by word."""
+        words = "The naïve café owner's aïa rhythm e EE queue strengths".split()
+        self.assertEqual(
+            serp_audit.count_syllables_total(words),
+            sum(serp_audit.count_syllables(w) for w in words),
+        )
+        self.assertEqual(serp_audit.count_syllables_total([]), 0)
+
+    def test_syllable_kernel_matches_count_syllables(self):
+        """The single-pass kernel (numba-compiled when available) should agree too."""
+        import numpy as np
+        for text in ["The naïve café owner's aïa rhythm e EE queue strengths", "e", "bcd"]:
+            words = text.split()
+            buf = np.frombuffer(" ".join(words).lower().encode("ascii", "replace"), dtype=np.uint8)
+            self.assertEqual(
+                int(serp_audit._syllable_kernel(buf, serp_audit._SYLLABLE_VOWELS)),
+                sum(serp_audit.count_syllables(w) for w in words),
+            )
+
+    def test_reading_counts_kernel_matches_regex_path(self):
+        """The fused kernel should count words, sentences and syllables like the regex path."""
+        import numpy as np
+        texts = [
+            "Couples therapy helps. Does it work?! Yes... mostly",
+            "Dr. Smith's highly-trained team (est. 1999) -- call now!",
+            "   \t\n ",
+            "...?!",
+            "one\x1ctwo three_four e EE.",
+            "No terminator here",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+                self.assertEqual(
+                    tuple(int(n) for n in serp_audit._reading_counts_kernel(buf, serp_audit._READING_CLASSES)),
+                    serp_audit._reading_counts(text),
+                )
+
+    @unittest.skipUnless(serp_audit.TEXTBLOB_AVAILABLE, "textblob not installed")
+    def test_sentiment_and_subjectivity_share_one_textblob_pass(self):
+        """Polarity and subjectivity for the same text should build one TextBlob."""
+        serp_audit._tb_sentiment.cache_clear()
+        text = "Therapy can be a deeply helpful and hopeful experience."
+        import textblob
+        with patch.object(textblob, "TextBlob", wraps=textblob.TextBlob) as tb:
+            serp_audit.calculate_sentiment(text)
+            serp_audit.calculate_subjectivity(text)
+        self.assertEqual(tb.call_count, 1)
+        self.assertEqual(
+            serp_audit.calculate_sentiment_scores(text),
+            (serp_audit.calculate_sentiment(text), serp_audit.calculate_subjectivity(text)),
+        )
+        self.assertEqual(serp_audit.calculate_sentiment_scores("N/A"), ("N/A", "N/A"))
+        serp_audit._tb_sentiment.cache_clear()
+
+    def test_write_excel_workbook_matches_pandas_output(self):
+        """Both streaming writers should read back like pandas' own export."""
+        import importlib.util
+        import tempfile
+        import numpy as np
+        import openpyxl
+        sheets = [
+            ("Overview", [
+                {"Run_ID": "r1", "Rank": np.int64(1), "Score": 0.5, "Flag": True},
+                {"Run_ID": "r1", "Score": float("nan"), "Extra": ["a", "b"], "Flag": None},
+                {"Rank": 3, "Score": float("inf"), "Run_ID": "r2"},
+            ]),
+            ("Empty", []),
+        ]
+        for use_xlsxwriter in (False, True):
+            if use_xlsxwriter and importlib.util.find_spec("xlsxwriter") is None:
+                continue
+            with self.subTest(xlsxwriter=use_xlsxwriter), tempfile.TemporaryDirectory() as tmp, \
+                    patch.object(serp_audit, "XLSXWRITER_AVAILABLE", use_xlsxwriter):
+                path = os.path.join(tmp, "out.xlsx")
+                expected_path = os.path.join(tmp, "expected.xlsx")
+                serp_audit.write_excel_workbook(path, sheets)
+                with serp_audit.pd.ExcelWriter(expected_path, engine="openpyxl") as writer:
+                    for name, rows in sheets:
+                        serp_audit.pd.DataFrame(rows).to_excel(writer, sheet_name=name, index=False)
+
+                actual = serp_audit.pd.read_excel(path, sheet_name=None)
+                expected = serp_audit.pd.read_excel(expected_path, sheet_name=None)
+                self.assertEqual(list(actual), ["Overview", "Empty"])
+                for name in expected:
+                    serp_audit.pd.testing.assert_frame_equal(actual[name], expected[name])
+                header = openpyxl.load_workbook(path)["Overview"]["A1"]
+                self.assertTrue(header.font.bold)
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    def test_write_excel_workbook_keeps_previous_file_when_write_fails(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            with open(path, "wb") as f:
+                f.write(b"previous workbook")
+            with patch.object(serp_audit, "_write_workbook_openpyxl", side_effect=ValueError("bad cell")):
+                with self.assertRaises(ValueError):
+                    serp_audit.write_excel_workbook(path, [("Overview", [{"Keyword": "k"}])])
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"previous workbook")
+            self.assertEqual(os.listdir(tmp), ["out.xlsx"])
+
+            serp_audit.write_excel_workbook(path, [("Overview", [{"Keyword": "k"}])])
+            self.assertEqual(serp_audit.pd.read_excel(path)["Keyword"].tolist(), ["k"])
+            self.assertEqual(os.listdir(tmp), ["out.xlsx"])
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    @patch.object(serp_audit, "EXCEL_IN_MEMORY", True)
+    def test_write_excel_workbook_in_memory_writes_one_chunk(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            with patch.object(serp_audit, "_write_workbook_openpyxl",
+                              wraps=serp_audit._write_workbook_openpyxl) as writer:
+                serp_audit.write_excel_workbook(path, [("Overview", [{"Keyword": "k", "Rank": 1}])])
+            self.assertIsInstance(writer.call_args.args[0], serp_audit.io.BytesIO)
+            frame = serp_audit.pd.read_excel(path)
+            self.assertEqual(frame.to_dict("records"), [{"Keyword": "k", "Rank": 1}])
+            self.assertEqual(os.listdir(tmp), ["out.xlsx"])
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    @patch.object(serp_audit, "EXCEL_IN_MEMORY", True)
+    def test_write_excel_workbook_in_memory_survives_short_writes(self):
+        """A raw file that accepts only part of each write still ends up with the whole workbook."""
+        import tempfile
+
+        class ShortWriteFile(serp_audit.io.FileIO):
+            def write(self, b):
+                return super().write(memoryview(b)[:512])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            rows = [{"Keyword": f"k{i}", "Rank": i} for i in range(200)]
+            with patch.object(serp_audit, "open", create=True,
+                              side_effect=lambda name, mode: ShortWriteFile(name, mode)):
+                serp_audit.write_excel_workbook(path, [("Overview", rows)])
+            frame = serp_audit.pd.read_excel(path)
+            self.assertEqual(frame.to_dict("records"), rows)
+
+    def test_save_excel_workbook_logs_file_create_error(self):
+        """A locked workbook under xlsxwriter is logged, not raised out of main."""
+        import tempfile
+        error = serp_audit.FileCreateError("[Errno 13] Permission denied: 'out.xlsx'")
+        with patch.object(serp_audit, "write_excel_workbook", side_effect=error):
+            with self.assertLogs(level="ERROR") as logs:
+                self.assertFalse(serp_audit.save_excel_workbook("out.xlsx", []))
+        self.assertIn("is it open?", logs.output[0])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            self.assertTrue(serp_audit.save_excel_workbook(path, [("Overview", [{"Keyword": "k", "Rank": 2}])]))
+            frame = serp_audit.pd.read_excel(path)
+            self.assertEqual(frame.to_dict("records"), [{"Keyword": "k", "Rank": 2}])
+            with self.assertLogs(level="ERROR"):
+                self.assertFalse(serp_audit.save_excel_workbook(os.path.join(tmp, "missing", "out.xlsx"), []))
+
+    @patch.object(serp_audit, "NUMBA_AVAILABLE", False)
+    @patch.object(serp_audit, "ORJSON_AVAILABLE", True)
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    def test_optional_accelerators_logged_at_info(self):
+        with self.assertLogs(level="INFO") as logs:
+            serp_audit.log_optional_accelerators()
+        self.assertEqual(logs.output, [
+            "INFO:root:Optional accelerators: numba=False orjson=True xlsxwriter=False"])
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    def test_save_run_outputs_keeps_json_when_excel_writer_raises(self):
+        """An unexpected writer error propagates only after the JSON is on disk and the tmp file is gone."""
+        import tempfile
+        full_data = {"overview": [{"Keyword": "k", "Rank": 1}]}
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "out.json")
+            xlsx_path = os.path.join(tmp, "out.xlsx")
+            norm_dir = os.path.join(tmp, "normalized")
+            with open(xlsx_path, "wb") as f:
+                f.write(b"previous workbook")
+            with patch.object(serp_audit, "_write_workbook_openpyxl", side_effect=TypeError("bad cell")):
+                with self.assertLogs(level="ERROR") as logs, self.assertRaises(TypeError):
+                    serp_audit.save_run_outputs(full_data, "run1", json_path, xlsx_path, norm_dir)
+            self.assertIn(json_path, logs.output[0])
+            with open(json_path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), full_data)
+            self.assertTrue(os.path.exists(os.path.join(norm_dir, "run1.serp_norm.json")))
+            with open(xlsx_path, "rb") as f:
+                self.assertEqual(f.read(), b"previous workbook")
+            self.assertFalse(os.path.exists(f"{xlsx_path}.tmp"))
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", True)
+    def test_xlsxwriter_streams_rows_in_order_with_literal_strings(self):
+        """xlsxwriter runs in constant_memory mode and never turns snippets into formulas or links."""
+        import sys
+        import tempfile
+        fake_xlsxwriter = MagicMock()
+        with patch.dict(sys.modules, {"xlsxwriter": fake_xlsxwriter}), tempfile.TemporaryDirectory() as tmp:
+            serp_audit.write_excel_workbook(os.path.join(tmp, "out.xlsx"), [
+                ("Competitors_Ads", [{"Name": "=HYPERLINK(1)", "Rank": 1}, {"Rank": 2}]),
+            ])
+        options = fake_xlsxwriter.Workbook.call_args.args[1]
+        self.assertTrue(options["constant_memory"])
+        self.assertFalse(options["strings_to_formulas"])
+        self.assertFalse(options["strings_to_urls"])
+        ws = fake_xlsxwriter.Workbook.return_value.add_worksheet.return_value
+        rows = [c.args[:3] for c in ws.write_row.call_args_list]
+        self.assertEqual(rows, [
+            (0, 0, ["Name", "Rank"]),
+            (1, 0, ["=HYPERLINK(1)", 1]),
+            (2, 0, [None, 2]),
+        ])
+        fake_xlsxwriter.Workbook.return_value.close.assert_called_once()
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    @patch.object(serp_audit, "EXCEL_SIDECAR_ROW_THRESHOLD", 2)
+    def test_write_excel_workbook_moves_large_sheets_to_sidecar(self):
+        """Sheets over the threshold become a pointer row plus a .jsonl.gz the validator can read."""
+        import tempfile
+        import validate_xlsx_vs_json
+        from pathlib import Path
+        rows = [{"Rank": i, "Title": f"t{i}"} for i in range(3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            serp_audit.write_excel_workbook(path, [("Organic_Results", rows), ("Help", rows[:1])])
+
+            sheets = serp_audit.pd.read_excel(path, sheet_name=None)
+            pointer = sheets["Organic_Results"]
+            self.assertEqual(pointer["Sidecar_File"].tolist(), ["out.Organic_Results.jsonl.gz"])
+            self.assertEqual(pointer["Row_Count"].tolist(), [3])
+            self.assertEqual(len(sheets["Help"]), 1)
+            self.assertEqual(validate_xlsx_vs_json.sidecar_records(pointer, Path(tmp)), rows)
+            self.assertIsNone(validate_xlsx_vs_json.sidecar_records(sheets["Help"], Path(tmp)))
+
+    @patch.object(serp_audit, "XLSXWRITER_AVAILABLE", False)
+    def test_diagnostic_sheets_always_go_to_sidecars(self):
+        import tempfile
+        import validate_xlsx_vs_json
+        from pathlib import Path
+        warnings = [{"Keyword": "k", "Warning": "missing rank"}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            serp_audit.write_excel_workbook(path, [
+                ("Overview", [{"Keyword": "k"}]),
+                ("Parsing_Warnings", warnings),
+                ("AIO_Logs", []),
+            ])
+            sheets = serp_audit.pd.read_excel(path, sheet_name=None)
+            self.assertEqual(list(sheets), ["Overview", "Parsing_Warnings", "AIO_Logs"])
+            self.assertIsNone(validate_xlsx_vs_json.sidecar_records(sheets["Overview"], Path(tmp)))
+            self.assertEqual(validate_xlsx_vs_json.sidecar_records(sheets["Parsing_Warnings"], Path(tmp)), warnings)
+            self.assertTrue(sheets["AIO_Logs"].empty)
+            self.assertIsNone(validate_xlsx_vs_json.sidecar_records(sheets["AIO_Logs"], Path(tmp)))
+            self.assertFalse(os.path.exists(os.path.join(tmp, "out.AIO_Logs.jsonl.gz")))
+        self.assertFalse({"AI_Overview_Citations", "Rich_Features", "SERP_Language_Patterns"}
+                         & serp_audit.EXCEL_SIDECAR_SHEETS)
+
+    @patch.object(serp_audit, "EXCEL_SIDECAR_ROW_THRESHOLD", 1)
+    def test_sidecar_records_fill_missing_columns_like_a_sheet(self):
+        import tempfile
+        import validate_xlsx_vs_json
+        from pathlib import Path
+        rows = [{"Rank": 1, "Title": "a"}, {"Rank": float("nan"), "Snippet": "b"}]
+        with tempfile.TemporaryDirectory() as tmp:
+            (_, pointer_rows), = serp_audit._offload_large_sheets(os.path.join(tmp, "out.xlsx"), [("Organic_Results", rows)])
+            pointer = serp_audit.pd.DataFrame(pointer_rows)
+            self.assertEqual(validate_xlsx_vs_json.sidecar_records(pointer, Path(tmp)), [
+                {"Rank": 1, "Title": "a", "Snippet": None},
+                {"Rank": None, "Title": None, "Snippet": "b"},
+            ])
+
+    def test_excel_sheets_follow_table_order_and_drop_empty_feasibility(self):
+        full_data = {key: [{"k": key}] for _, key in serp_audit.EXCEL_SHEETS}
+        self.assertEqual(
+            [name for name, _ in serp_audit.excel_sheets(full_data)],
+            [name for name, _ in serp_audit.EXCEL_SHEETS],
+        )
+        full_data["keyword_feasibility"] = []
+        full_data["aio_logs"] = []
+        sheets = dict(serp_audit.excel_sheets(full_data))
+        self.assertNotIn("Keyword_Feasibility", sheets)
+        self.assertEqual(sheets["AIO_Logs"], [])
+        self.assertEqual(sheets["Overview"], [{"k": "overview"}])
+
+    def test_intern_row_strings_shares_equal_values_across_lists(self):
+        domain = "".join(["example", ".com"])
+        first = [{"Domain": "example.com", "Rank": 1}]
+        second = [{"Domain": domain, "Rank": None}]
+        pool = serp_audit.intern_row_strings(first)
+        serp_audit.intern_row_strings(second, pool)
+        self.assertIs(second[0]["Domain"], first[0]["Domain"])
+        self.assertEqual(second[0], {"Domain": "example.com", "Rank": None})
+
+    def test_excel_cell_value_normalizes_numpy_and_missing_values(self):
+        import numpy as np
+        convert = serp_audit._excel_cell_value
+        self.assertIs(convert(np.bool_(True)), True)
+        self.assertEqual(type(convert(np.int32(4))), int)
+        self.assertEqual(type(convert(np.float32(0.5))), float)
+        self.assertIsNone(convert(np.float64("nan")))
+        self.assertIsNone(convert(serp_audit.pd.NaT))
+        self.assertEqual(convert(float("-inf")), "-inf")
+        self.assertEqual(convert(["a"]), "['a']")
+
+    def test_row_cells_follow_header_order_for_mismatched_rows(self):
+        columns = ["Keyword", "Rank", "Domain"]
+        self.assertEqual(
+            serp_audit._row_cells({"Keyword": "k", "Rank": 1, "Domain": "d"}, columns),
+            ["k", 1, "d"],
+        )
+        self.assertEqual(
+            serp_audit._row_cells({"Domain": "d", "Keyword": "k"}, columns),
+            ["k", None, "d"],
+        )
+
+    def test_parse_data_rows_share_common_field_values(self):
+        """Every row of every sheet references the same per-keyword audit strings, not copies."""
+        metadata = {
+            "run_id": "".join(["run", "_1"]),
+            "created_at": "2024-01-01T12:00:00",
+            "google_url": "https://google.com/search?q=test",
+            "params_hash": "hash",
+        }
+        results = {"google": {
+            "organic_results": [{"title": "A", "link": "http://a.com"}, {"title": "B", "link": "http://b.com"}],
+            "related_questions": [{"question": "How much?", "snippet": "s"}],
+            "inline_videos": [{}],
+        }}
+        metrics, organic, paa, *_, modules, rich_features, _warnings = serp_audit.parse_data(
+            "kw", results, metadata)
+        rows = [metrics, *organic, *paa, *modules, *rich_features]
+        self.assertGreater(len(rows), 5)
+        for field in ("Run_ID", "Created_At", "Google_URL", "Params_Hash"):
+            with self.subTest(field=field):
+                self.assertTrue(all(row[field] is rows[0][field] for row in rows))
+
     def test_parse_data_structure(self):
         """Test that parse_data extracts the correct fields from a mock API response."""
         mock_keyword = "test keyword"
@@ -129,6 +497,23 @@ class TestSerpAudit(unittest.TestCase):
         self.assertEqual(competitors[0]["Block_Position"], "top")
         self.assertEqual(len(warnings), 2)
 
+    def test_parse_data_paa_categories_follow_trigger_map_order(self):
+        """The first matching trigger category wins, not the earliest match in the text."""
+        mock_metadata = {
+            "run_id": "r", "created_at": "t", "google_url": "u", "params_hash": "h"
+        }
+        questions = [
+            "Should I leave a toxic partner if counselling has a cost?",
+            "Signs of an angry spouse",
+            "What is therapy?",
+        ]
+        mock_results = {"google": {
+            "related_questions": [{"question": q} for q in questions]
+        }}
+        paa = serp_audit.parse_data("kw", mock_results, mock_metadata)[2]
+        self.assertEqual([row["Category"] for row in paa],
+                         ["Commercial", "Reactivity", "General"])
+
     def test_parsing_warnings(self):
         """Test that parsing warnings are generated for missing fields."""
         mock_metadata = {
@@ -341,27 +726,30 @@ class TestSerpAudit(unittest.TestCase):
         mock_ai_response = {"snippet": "Detailed AI answer"}
         mock_maps_response = {"local_results": [{"title": "A Place"}]}
 
-        # Configure the mock to return different values on subsequent calls
-        mock_fetch.side_effect = [
-            mock_primary_response, mock_ai_response, mock_maps_response]
+        # The follow-ups run concurrently, so answer by engine rather than call order
+        responses = {
+            "google": mock_primary_response,
+            "google_ai_overview": mock_ai_response,
+            "google_maps": mock_maps_response,
+        }
+        mock_fetch.side_effect = lambda params, **_: responses[params["engine"]]
 
         results, aio_log, metadata = serp_audit.fetch_serp_data(
             mock_keyword, mock_run_id)
 
-        # 1. Check that fetch was called 3 times
+        # 1. Check that fetch was called 3 times, primary first
         self.assertEqual(mock_fetch.call_count, 3)
 
         # 2. Check the engines and params called
-        calls = mock_fetch.call_args_list
-        self.assertEqual(calls[0][0][0]['engine'], 'google')
-        self.assertEqual(calls[1][0][0]['engine'], 'google_ai_overview')
-        self.assertIn('page_token', calls[1][0][0])
-        self.assertEqual(calls[1][0][0]['page_token'], 'some_token')
-        self.assertEqual(calls[2][0][0]['engine'], 'google_maps')
-        self.assertIn('ll', calls[2][0][0])
-        self.assertEqual(calls[2][0][0]['ll'], '49.2827,-123.1207')
-        self.assertNotIn('location', calls[2][0][0])
-        self.assertNotIn('z', calls[2][0][0])
+        calls = {call[0][0]['engine']: call[0][0] for call in mock_fetch.call_args_list}
+        self.assertEqual(mock_fetch.call_args_list[0][0][0]['engine'], 'google')
+        self.assertEqual(set(calls), {'google', 'google_ai_overview', 'google_maps'})
+        self.assertIn('page_token', calls['google_ai_overview'])
+        self.assertEqual(calls['google_ai_overview']['page_token'], 'some_token')
+        self.assertIn('ll', calls['google_maps'])
+        self.assertEqual(calls['google_maps']['ll'], '49.2827,-123.1207')
+        self.assertNotIn('location', calls['google_maps'])
+        self.assertNotIn('z', calls['google_maps'])
 
         # 3. Check that results from all calls are in the final dictionary
         self.assertIn('google', results)
@@ -381,28 +769,81 @@ class TestSerpAudit(unittest.TestCase):
         self.assertIsNotNone(aio_log["followup_latency_ms"])
         self.assertIsNone(aio_log["error"])
 
+    @patch('serp_audit.FORCE_LOCAL_INTENT', True)
+    @patch('serp_audit.save_raw_json')
+    @patch('serp_audit._fetch_serp_api', return_value=None)
+    def test_fetch_serp_data_primary_params_from_template(self, mock_fetch, mock_save):
+        """Primary params come from a per-call copy of the template; the city is appended once."""
+        city = serp_audit.LOCATION.split(",")[0]
+        serp_audit.fetch_serp_data("couples therapy", "run123")
+        serp_audit.fetch_serp_data(f"couples therapy {city.upper()}", "run123")
+
+        first, second = (c.args[0] for c in mock_fetch.call_args_list)
+        self.assertEqual(first["q"], f"couples therapy {serp_audit.LOCATION}")
+        self.assertEqual(second["q"], f"couples therapy {city.upper()}")
+        self.assertEqual(first["location"], serp_audit.LOCATION)
+        self.assertIsNone(serp_audit._PRIMARY_PARAMS_TEMPLATE["q"])
+
     @patch('serp_audit.FORCE_LOCAL_INTENT', False)
     @patch('serp_audit.save_raw_json')
     @patch('serp_audit._fetch_serp_api')
     def test_fetch_serp_data_google_pagination_merge(self, mock_fetch, mock_save):
         """Test that Google pagination merges organic results across pages."""
-        mock_fetch.side_effect = [
-            {
+        pages = {
+            None: {
                 "organic_results": [{"title": "P1", "link": "http://a.com", "position": 1}],
                 "serpapi_pagination": {"next": "https://serpapi.com/search.json?start=10"}
             },
-            {
+            10: {
                 "organic_results": [{"title": "P2", "link": "http://b.com", "position": 11}],
                 "serpapi_pagination": {}
             },
-            None  # AI fallback call (no location) for this test
-        ]
+        }
+
+        def fake_fetch(params, cache_hits=None):
+            # The AI fallback probe (no location) runs alongside page 2 and finds nothing.
+            if "location" not in params:
+                return None
+            return pages[params.get("start")]
+
+        mock_fetch.side_effect = fake_fetch
 
         results, aio_log, _ = serp_audit.fetch_serp_data("keyword", "run123")
 
         self.assertEqual(len(results["google"]["organic_results"]), 2)
         self.assertEqual(aio_log["google_pages_fetched"], 2)
 
+    @patch('serp_audit.FORCE_LOCAL_INTENT', False)
+    @patch('serp_audit.save_raw_json')
+    @patch('serp_audit._fetch_serp_api')
+    def test_fetch_serp_data_ai_overview_starts_before_later_pages(self, mock_fetch, mock_save):
+        """The AI overview follow-up only needs page 1, so it runs while page 2 is in flight."""
+        import threading
+        aio_started = threading.Event()
+        first_page = {
+            "organic_results": [{"title": "P1", "link": "http://a.com", "position": 1}],
+            "ai_overview": {"page_token": "tok"},
+            "serpapi_pagination": {"next": "https://serpapi.com/search.json?start=10"},
+        }
+
+        def fake_fetch(params, cache_hits=None):
+            if params.get("engine") == "google_ai_overview":
+                aio_started.set()
+                return {"text_blocks": []}
+            if params.get("start") == 10:
+                # Page 2 only returns once the AI overview request has begun.
+                self.assertTrue(aio_started.wait(timeout=5))
+                return {"organic_results": [{"title": "P2", "link": "http://b.com", "position": 11}]}
+            return first_page
+
+        mock_fetch.side_effect = fake_fetch
+        with patch.object(serp_audit, "RELATED_QUESTIONS_AI_FOLLOWUP", False):
+            results, aio_log, _ = serp_audit.fetch_serp_data("keyword", "run123")
+
+        self.assertEqual(aio_log["ai_overview_mode"], "token_followup_success")
+        self.assertEqual(aio_log["google_pages_fetched"], 2)
+        self.assertEqual(len(results["google"]["organic_results"]), 2)
+
     @patch('serp_audit.FORCE_LOCAL_INTENT', False)
     @patch('serp_audit.save_raw_json')
     @patch('serp_audit._fetch_serp_api')
@@ -453,6 +894,26 @@ class TestSerpAudit(unittest.TestCase):
         engines = [call[0][0].get("engine") for call in mock_fetch.call_args_list]
         self.assertIn("google_related_questions", engines)
 
+    @patch('serp_audit.FORCE_LOCAL_INTENT', True)
+    @patch('serp_audit.save_raw_json')
+    @patch('serp_audit._fetch_serp_api')
+    def test_fetch_serp_data_runs_followups_concurrently(self, mock_fetch, mock_save):
+        """AI overview and Maps follow-ups should be in flight at the same time."""
+        import threading
+        both_started = threading.Barrier(2, timeout=5)
+
+        def fake_fetch(params, **_):
+            if params["engine"] == "google":
+                return {"ai_overview": {"page_token": "tok"}, "organic_results": []}
+            both_started.wait()  # raises BrokenBarrierError if run one after the other
+            return {"engine": params["engine"]}
+
+        mock_fetch.side_effect = fake_fetch
+        results, aio_log, _ = serp_audit.fetch_serp_data("therapy", "run123")
+        self.assertEqual(results["google_ai_overview"], {"engine": "google_ai_overview"})
+        self.assertEqual(results["google_maps"]["local_results"], [])
+        self.assertEqual(aio_log["ai_overview_mode"], "token_followup_success")
+
     @patch('serp_audit._fetch_serp_api')
     def test_fetch_autocomplete_uses_fallback_variant(self, mock_fetch):
         """Autocomplete should try shorter variants when long-tail query returns no suggestions."""
@@ -569,6 +1030,7 @@ class TestSerpAudit(unittest.TestCase):
 
     @patch("serp_audit.GoogleSearch")
     @patch.object(serp_audit, "SERPAPI_AVAILABLE", True)
+    @patch.object(serp_audit, "RESPONSE_CACHE_TTL_SECONDS", 0)
     def test_fetch_serp_api_increments_call_counter(self, mock_search_cls):
         serp_audit.SERPAPI_CALL_COUNT = 0
         mock_search = MagicMock()
@@ -578,6 +1040,85 @@ class TestSerpAudit(unittest.TestCase):
         self.assertEqual(result, {"organic_results": []})
         self.assertEqual(serp_audit.SERPAPI_CALL_COUNT, 1)
 
+    @patch("serp_audit.GoogleSearch")
+    @patch.object(serp_audit, "SERPAPI_AVAILABLE", True)
+    def test_fetch_serp_api_serves_repeat_calls_from_response_cache(self, mock_search_cls):
+        """A repeat request within the TTL should not hit SerpApi; no_cache bypasses it."""
+        import tempfile
+        mock_search_cls.return_value.get_dict.return_value = {"organic_results": [{"link": "a"}]}
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(serp_audit, "RESPONSE_CACHE_DIR", tmpdir), \
+                patch.object(serp_audit, "RESPONSE_CACHE_TTL_SECONDS", 3600):
+            first = serp_audit._fetch_serp_api({"engine": "google", "q": "test", "api_key": "k1"})
+            second = serp_audit._fetch_serp_api({"engine": "google", "q": "test", "api_key": "k2"})
+            self.assertEqual(first, second)
+            self.assertEqual(mock_search_cls.call_count, 1)
+
+            serp_audit._fetch_serp_api({"engine": "google", "q": "test", "no_cache": True})
+            self.assertEqual(mock_search_cls.call_count, 2)
+
+    @unittest.skipUnless(serp_audit.SERPAPI_AVAILABLE, "google-search-results not installed")
+    @patch.object(serp_audit, "SERPAPI_TIMEOUT_SECONDS", 12.5)
+    def test_google_search_uses_shared_session_with_bounded_timeout(self):
+        with patch.object(serp_audit._SERPAPI_SESSION, "get") as mock_get:
+            mock_get.return_value.text = '{"organic_results": []}'
+            result = serp_audit.GoogleSearch({"engine": "google", "q": "test", "api_key": "k"}).get_dict()
+        self.assertEqual(result, {"organic_results": []})
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], 12.5)
+        self.assertEqual(mock_get.call_args.kwargs["params"]["q"], "test")
+
+    def test_lazy_log_arguments_format_only_when_emitted(self):
+        with patch.object(serp_audit, "_dumps_json", wraps=serp_audit._dumps_json) as dumps:
+            with self.assertLogs(level="INFO") as logs:
+                logging.debug("hidden: %s", serp_audit._LazyJSON({"a": 1}))
+                dumps.assert_not_called()
+                logging.info("shown: %s keys=%s", serp_audit._LazyJSON({"a": 1}),
+                             serp_audit._SortedKeys({"b": 1, "a": 2}))
+        dumps.assert_called_once()
+        self.assertEqual(logs.records[0].getMessage(), 'shown: {\n  "a": 1\n} keys=[\'a\', \'b\']')
+
+    def test_response_cache_round_trips_through_json_bytes(self):
+        import tempfile
+        results = {"organic_results": [{"title": "Café — counselling", "position": 1}], "ratio": 0.5}
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(serp_audit, "RESPONSE_CACHE_TTL_SECONDS", 3600):
+            path = os.path.join(tmpdir, "sub", "entry.json")
+            serp_audit._store_cached_response(path, results)
+            self.assertEqual(serp_audit._load_cached_response(path), results)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"score": NaN}')  # entries written by older versions via json.dump
+            score = serp_audit._load_cached_response(path)["score"]
+            self.assertNotEqual(score, score)  # NaN
+
+    def test_response_cache_key_ignores_query_case_and_spacing(self):
+        base = {"engine": "google", "q": "couples counselling vancouver", "gl": "ca", "api_key": "k1"}
+        key = serp_audit._response_cache_path(base)
+        self.assertEqual(key, serp_audit._response_cache_path(
+            dict(base, q="  Couples  Counselling Vancouver ", api_key="k2")))
+        self.assertNotEqual(key, serp_audit._response_cache_path(dict(base, q="couples counseling vancouver")))
+        self.assertNotEqual(key, serp_audit._response_cache_path(dict(base, gl="us")))
+
+    @patch('serp_audit.FORCE_LOCAL_INTENT', True)
+    @patch('serp_audit.save_raw_json')
+    @patch.object(serp_audit, "RESPONSE_CACHE_TTL_SECONDS", 3600)
+    def test_fetch_serp_data_flags_responses_served_from_cache(self, mock_save):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(serp_audit, "RESPONSE_CACHE_DIR", tmpdir), \
+                patch.object(serp_audit, "SERPAPI_AVAILABLE", True), \
+                patch.object(serp_audit, "NO_CACHE_ENABLED", False), \
+                patch.object(serp_audit, "AI_FALLBACK_WITHOUT_LOCATION", False), \
+                patch.object(serp_audit, "GoogleSearch") as mock_search_cls:
+            mock_search_cls.return_value.get_dict.side_effect = lambda: {"organic_results": []}
+            _, first_log, _ = serp_audit.fetch_serp_data("therapy", "run1")
+            _, second_log, _ = serp_audit.fetch_serp_data("therapy", "run2")
+
+        self.assertFalse(first_log["cached"])
+        self.assertEqual(first_log["cached_calls"], 0)
+        self.assertTrue(second_log["cached"])
+        self.assertEqual(second_log["cached_calls"], 2)  # primary SERP + Maps
+        self.assertEqual(mock_search_cls.call_count, 2)
+
     @patch("os.path.exists", return_value=False)
     @patch("pandas.read_csv")
     def test_load_keywords_uses_single_keyword_override(self, mock_read_csv, mock_exists):
@@ -626,17 +1167,82 @@ class TestSerpAudit(unittest.TestCase):
 
         mock_makedirs.assert_called_with(f"raw/{run_id}", exist_ok=True)
         mock_file.assert_called_with(
-            f"raw/{run_id}/{engine}_response.json", 'w')
+            f"raw/{run_id}/{engine}_response.json", 'wb')
 
         # To check the content of the file, we need to get the mock file handle
         handle = mock_file()
-
-        # json.dump may call write multiple times, so we can't use assert_called_once_with
-        # Instead, we can get all the calls to write and join them to get the full string
-        written_data = "".join(call[0][0]
-                               for call in handle.write.call_args_list)
-
-        self.assertEqual(written_data, json.dumps(data, indent=2))
+        written_data = b"".join(call[0][0]
+                                for call in handle.write.call_args_list)
+
+        self.assertEqual(json.loads(written_data), data)
+        self.assertEqual(written_data, b'{"key":"value"}')
+
+    def test_dumps_json_falls_back_for_non_string_keys(self):
+        """Values orjson cannot encode should still serialize via the stdlib."""
+        data = {1: "one", "nested": {"text": "café"}}
+        self.assertEqual(json.loads(serp_audit._dumps_json(data)),
+                         {"1": "one", "nested": {"text": "café"}})
+        with patch.object(serp_audit, "ORJSON_AVAILABLE", False):
+            self.assertEqual(serp_audit._dumps_json({"a": 1}, indent=True), b'{\n  "a": 1\n}')
+
+    def test_fetch_all_serp_data_preserves_order_and_bounds_concurrency(self):
+        """Concurrent fetches should return in keyword order without exceeding the limit."""
+        import threading
+        import time as time_mod
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_fetch(keyword, run_id):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time_mod.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return {"google": {"q": keyword}}, {"Keyword": keyword}, {"run_id": run_id}
+
+        keywords = [f"kw{i}" for i in range(8)]
+        with patch.object(serp_audit, "fetch_serp_data", side_effect=fake_fetch):
+            results = serp_audit.fetch_all_serp_data(keywords, "run123", max_concurrency=3)
+
+        self.assertEqual([r[1]["Keyword"] for r in results], keywords)
+        self.assertLessEqual(state["peak"], 3)
+        self.assertGreater(state["peak"], 1)
+
+    def test_token_bucket_paces_calls_after_burst(self):
+        """The limiter lets a burst of `capacity` calls through, then waits for refills."""
+        bucket = serp_audit._TokenBucket(rate=2, capacity=2)
+        clock = {"now": 100.0}
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        with patch.object(serp_audit.time, "monotonic", side_effect=lambda: clock["now"]), \
+                patch.object(serp_audit.time, "sleep", side_effect=fake_sleep):
+            bucket._updated = clock["now"]
+            for _ in range(4):
+                bucket.acquire()
+
+        self.assertEqual(len(sleeps), 2)
+        self.assertAlmostEqual(sum(sleeps), 1.0)
+
+    def test_token_bucket_disabled_when_rate_is_zero(self):
+        bucket = serp_audit._TokenBucket(rate=0)
+        with patch.object(serp_audit.time, "sleep") as mock_sleep:
+            for _ in range(10):
+                bucket.acquire()
+        mock_sleep.assert_not_called()
+
+    def test_fetch_all_autocomplete_preserves_order(self):
+        """Autocomplete fetches run in a thread pool but come back in keyword order."""
+        keywords = [f"kw{i}" for i in range(6)]
+        with patch.object(serp_audit, "fetch_autocomplete",
+                          side_effect=lambda kw: {"suggestions": [kw]}):
+            results = serp_audit.fetch_all_autocomplete(keywords, max_concurrency=3)
+        self.assertEqual([r["suggestions"][0] for r in results], keywords)
+        self.assertEqual(serp_audit.fetch_all_autocomplete([]), [])
 
     @patch('serp_audit._fetch_serp_api')
     @patch('builtins.print')
@@ -1,5 +1,8 @@
+import asyncio
 import importlib.util
 import os
+import queue
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -121,5 +124,192 @@ class TestSerpLauncherResolution(unittest.TestCase):
                 os.chdir(cwd)
 
 
+@unittest.skipUnless(TKINTER_AVAILABLE, "tkinter not available in this environment")
+class TestSerpLauncherScripts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mod = load_serp_me()
+
+    def test_every_entry_runs_a_script_or_an_action(self):
+        repo_dir = os.path.dirname(MODULE_PATH)
+        for script in self.mod.SCRIPTS:
+            with self.subTest(label=script.label):
+                if script.action:
+                    self.assertIsNone(script.file)
+                else:
+                    self.assertTrue(os.path.exists(os.path.join(repo_dir, script.file)))
+                    self.assertEqual(script.cmd, (sys.executable, script.file, *script.args))
+                    self.assertEqual(script.display, " ".join(script.cmd))
+                self.assertIsInstance(script.args, tuple)
+
+    def make_state_app(self):
+        app = object.__new__(self.mod.SerpLauncherApp)
+        app._last_sel = -1
+        app._state = app.STATE_IDLE
+        app._run_btn_state = "disabled"
+        selection = [(0,)]
+        button_states = []
+        app.script_listbox = type("Listbox", (), {"curselection": lambda _self: selection[0]})()
+        app.run_btn = type("Button", (), {"config": lambda _self, state: button_states.append(state)})()
+        app.update_desc = lambda text: None
+        return app, selection, button_states
+
+    def test_run_button_only_reconfigured_on_real_state_changes(self):
+        app, selection, button_states = self.make_state_app()
+        app.on_select(None)
+        app._set_state(app.STATE_RUNNING)
+        selection[0] = (1,)
+        app.on_select(None)
+        app._set_state(app.STATE_RUNNING)
+        app._reenable_run_btn()
+        app._reenable_run_btn()
+
+        self.assertEqual(button_states, ["normal", "disabled", "normal"])
+
+    def test_run_script_ignored_while_running(self):
+        app, _selection, _button_states = self.make_state_app()
+        app._state = app.STATE_RUNNING
+        app.script_listbox = None  # would raise if run_script got past the state check
+        self.assertIsNone(app.run_script())
+
+    def test_on_select_skips_unchanged_selection(self):
+        app, selection, _button_states = self.make_state_app()
+        descs = []
+        app.update_desc = descs.append
+
+        app.on_select(None)
+        app.on_select(None)
+        selection[0] = (2,)
+        app.on_select(None)
+
+        self.assertEqual(descs, [self.mod.SCRIPTS[0].desc, self.mod.SCRIPTS[2].desc])
+
+
+class FakeText:
+    """Minimal stand-in for tk.Text: appends only, line-based index/delete."""
+
+    def __init__(self):
+        self.inserts = []
+        self.content = ""
+        self.view = (0.0, 1.0)
+        self.see_calls = 0
+
+    def config(self, **kwargs):
+        pass
+
+    def insert(self, index, text):
+        self.inserts.append(text)
+        self.content += text
+
+    def index(self, index):
+        lines = self.content.split("\n")
+        return f"{len(lines)}.{len(lines[-1])}"
+
+    def delete(self, start, end):
+        end_line = int(end.split(".")[0])
+        self.content = "\n".join(self.content.split("\n")[end_line - 1:])
+
+    def see(self, index):
+        self.see_calls += 1
+
+    def yview(self):
+        return self.view
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func, *args):
+        self.scheduled.append((ms, func))
+
+
+@unittest.skipUnless(TKINTER_AVAILABLE, "tkinter not available in this environment")
+class TestSerpLauncherLog(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mod = load_serp_me()
+
+    def make_app(self):
+        app = object.__new__(self.mod.SerpLauncherApp)
+        app._log_queue = queue.Queue()
+        app.log_text = FakeText()
+        app.root = FakeRoot()
+        return app
+
+    def test_drain_log_batches_queued_lines_into_one_insert(self):
+        app = self.make_app()
+        for i in range(100):
+            app.log(f"line {i}\n")
+
+        app._drain_log()
+
+        self.assertEqual(len(app.log_text.inserts), 1)
+        self.assertEqual(app.log_text.inserts[0], "".join(f"line {i}\n" for i in range(100)))
+        self.assertEqual(app.root.scheduled, [(app.LOG_DRAIN_MS, app._drain_log)])
+
+    def test_drain_log_trims_to_max_log_lines(self):
+        app = self.make_app()
+        app.MAX_LOG_LINES = 10
+        for i in range(25):
+            app.log(f"line {i}\n")
+
+        app._drain_log()
+
+        lines = app.log_text.content.split("\n")
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(lines[0], "line 16")
+        self.assertEqual(lines[-2], "line 24")
+
+    def test_execute_process_decodes_chunked_output(self):
+        app = self.make_app()
+        script = (
+            "import sys\n"
+            "sys.stdout.buffer.write('caf\\u00e9\\r\\nnext\\rdone\\n'.encode('utf-8'))\n"
+        )
+        asyncio.run(app.execute_process([sys.executable, "-c", script], os.environ.copy(), os.getcwd()))
+
+        output = []
+        while not app._log_queue.empty():
+            output.append(app._log_queue.get_nowait())
+        self.assertTrue("".join(output).startswith("caf\u00e9\nnext\ndone\n"))
+
+    def test_execute_process_reports_exit_status(self):
+        app = self.make_app()
+        script = "import sys\nfor i in range(5000): print(i)\nsys.exit(3)\n"
+        asyncio.run(app.execute_process([sys.executable, "-c", script], os.environ.copy(), os.getcwd()))
+
+        output = []
+        while not app._log_queue.empty():
+            output.append(app._log_queue.get_nowait())
+        text = "".join(output)
+        self.assertTrue(text.startswith("".join(f"{i}\n" for i in range(5000))))
+        self.assertIn("Process finished with status FAILED_3", text)
+
+    def test_output_decoder_handles_split_multibyte_and_crlf(self):
+        decoder = self.mod.make_output_decoder()
+        data = "caf\u00e9\r\n".encode("utf-8")
+        pieces = [decoder.decode(data[i:i + 1]) for i in range(len(data))]
+        pieces.append(decoder.decode(b"", final=True))
+        self.assertEqual("".join(pieces), "caf\u00e9\n")
+
+    def test_drain_log_autoscrolls_only_when_at_bottom(self):
+        app = self.make_app()
+        app.log("first\n")
+        app._drain_log()
+        self.assertEqual(app.log_text.see_calls, 1)
+
+        app.log_text.view = (0.2, 0.6)
+        app.log("second\n")
+        app._drain_log()
+        self.assertEqual(app.log_text.see_calls, 1)
+
+    def test_drain_log_skips_widget_when_queue_empty(self):
+        app = self.make_app()
+        app._drain_log()
+        self.assertEqual(app.log_text.inserts, [])
+        self.assertEqual(len(app.root.scheduled), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
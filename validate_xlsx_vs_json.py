@@ -13,7 +13,9 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
+import math
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -168,6 +170,26 @@ def df_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
     return df.where(pd.notnull(df), None).to_dict(orient="records")
 
 
+def _nan_to_none(x: Any) -> Any:
+    return None if isinstance(x, float) and math.isnan(x) else x
+
+
+def sidecar_records(sdf: pd.DataFrame, xlsx_dir: Path) -> List[Dict[str, Any]] | None:
+    """Rows from the JSON Lines sidecar a pointer sheet refers to, else None.
+
+    serp_audit moves very large sheets out of the workbook and leaves a single
+    Sidecar_File/Row_Count row in their place.
+    """
+    if "Sidecar_File" not in sdf.columns or len(sdf) != 1:
+        return None
+    with gzip.open(xlsx_dir / str(sdf["Sidecar_File"].iloc[0]), "rt", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    # Same shape df_to_records gives a sheet (every column on every row, NaN
+    # as None) without routing the rows through a DataFrame.
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    return [{col: _nan_to_none(row.get(col)) for col in columns} for row in rows]
+
+
 def index_records(records: List[Dict[str, Any]], key_cols: Tuple[str, ...], text_cols: Tuple[str, ...]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
     idx: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
     for r in records:
@@ -202,16 +224,14 @@ def index_records(records: List[Dict[str, Any]], key_cols: Tuple[str, ...], text
 # ----------------------------
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--xlsx", required=True)
-    ap.add_argument("--json", required=True)
-    ap.add_argument("--out", required=True)
-    args = ap.parse_args()
+def run(xlsx_path: str, json_path: str, out_path: str) -> int:
+    """Compare *xlsx_path* against *json_path* and write the diff report to *out_path*.
 
-    xlsx_path = Path(args.xlsx)
-    json_path = Path(args.json)
-    out_path = Path(args.out)
+    Returns 0 when they match, 1 on differences, 2 on errors.
+    """
+    xlsx_path = Path(xlsx_path)
+    json_path = Path(json_path)
+    out_path = Path(out_path)
 
     try:
         # Load JSON (Expects a flat dict of lists)
@@ -233,7 +253,9 @@ def main() -> int:
 
             # 2. Load Data
             sdf = xl.parse(spec.sheet_name)
-            xlsx_recs = df_to_records(sdf)
+            xlsx_recs = sidecar_records(sdf, xlsx_path.parent)
+            if xlsx_recs is None:
+                xlsx_recs = df_to_records(sdf)
             json_recs = json_data.get(spec.json_key, [])
 
             # 3. Compare Counts
@@ -279,5 +301,14 @@ def main() -> int:
         return 2
 
 
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--xlsx", required=True)
+    ap.add_argument("--json", required=True)
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args()
+    return run(args.xlsx, args.json, args.out)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
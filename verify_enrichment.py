@@ -47,5 +47,10 @@ def verify_db():
     print(f"Classified Domains found: {c.fetchone()[0]}")
 
 
+def run() -> int:
+    verify_db()
+    return 0
+
+
 if __name__ == "__main__":
     verify_db()